@@ -0,0 +1,320 @@
+# BatchAPI.py
+"""
+OpenAI‑Batch‑API für den **LLMHandler** (50 % günstiger, Ergebnis binnen 24 h).
+
+Die Pipeline hält nie alle Prompts oder Antworten im Speicher:
+
+1. Prompts werden zeilenweise in JSONL‑Dateien geschrieben (je Datei höchstens
+   50 000 Anfragen bzw. ~190 MB – die Grenzen der API; größere Mengen werden
+   auf mehrere Batches verteilt).
+2. Jede Datei wird hochgeladen – große über `uploads.upload_file_chunked` in
+   Teilen – und als Batch gestartet.
+3. `BatchJob.wait` fragt den Status mit wachsendem Abstand ab.
+4. `BatchJob.results` lädt die Ergebnis‑Dateien gestreamt auf die Platte,
+   merkt sich nur den Byte‑Offset je Anfrage und liefert die Antworten als
+   `BatchItem` in Eingabe‑Reihenfolge.
+
+Beispiel::
+
+    handler = LLMHandler("openai", model="gpt-4o-mini")
+    with handler.submit_batch(open("prompts.txt", encoding="utf-8")) as job:
+        for item in job.results():
+            print(item.index, item.answer if item.ok else item.error)
+"""
+
+# --------------------------------------------------------------------------- #
+# IMPORTS
+# --------------------------------------------------------------------------- #
+import json
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from LLMHandler import BatchItem
+
+if TYPE_CHECKING:
+    from LLMHandler import LLMHandler
+
+# Grenzen der Batch‑API (pro Eingabe‑Datei)
+MAX_REQUESTS_PER_BATCH = 50_000
+MAX_BATCH_FILE_BYTES = 190 * 1024 * 1024   # API‑Limit 200 MB, mit Reserve
+
+# Ab dieser Größe wird in Teilen hochgeladen
+CHUNKED_UPLOAD_BYTES = 32 * 1024 * 1024
+
+_ENDPOINT = "/v1/chat/completions"
+_CUSTOM_ID = re.compile(rb'"custom_id"\s*:\s*"(\d+)"')
+_TERMINAL = {"completed", "failed", "expired", "cancelled"}
+
+class BatchRequestError(RuntimeError):
+    """Eine einzelne Anfrage eines Batches ist fehlgeschlagen."""
+
+    def __init__(self, message: str, *, code: Optional[str] = None, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+        self.status_code = status_code
+
+# --------------------------------------------------------------------------- #
+# Eingabe schreiben & hochladen
+# --------------------------------------------------------------------------- #
+def write_requests(
+    prompts: Iterable[str],
+    directory: Path,
+    *,
+    model: str,
+    max_tokens: Optional[int] = None,
+    shard_size: int = MAX_REQUESTS_PER_BATCH,
+    shard_bytes: int = MAX_BATCH_FILE_BYTES,
+) -> Iterator[Path]:
+    """
+    Schreibt die Prompts als Batch‑Anfragen in JSONL‑Dateien und liefert
+    jede Datei, sobald sie voll ist (die `custom_id` ist der Eingabe‑Index).
+    """
+    body: Dict[str, Any] = {"model": model, "messages": [{"role": "user", "content": ""}]}
+    if max_tokens is not None:
+        body["max_tokens"] = max_tokens
+    message = body["messages"][0]
+    line = {"custom_id": "", "method": "POST", "url": _ENDPOINT, "body": body}
+
+    out = None
+    count = written = 0
+    shard = 0
+    try:
+        for index, prompt in enumerate(prompts):
+            message["content"] = prompt.rstrip("\n")
+            line["custom_id"] = str(index)
+            data = json.dumps(line, ensure_ascii=False).encode("utf-8") + b"\n"
+            if out is not None and (count >= shard_size or written + len(data) > shard_bytes):
+                out.close()
+                yield Path(out.name)
+                out = None
+            if out is None:
+                out = open(directory / f"input-{shard:04d}.jsonl", "wb")
+                shard += 1
+                count = written = 0
+            out.write(data)
+            count += 1
+            written += len(data)
+        if out is not None:
+            out.close()
+            yield Path(out.name)
+            out = None
+    finally:
+        if out is not None:
+            out.close()
+
+
+def upload_requests(client: Any, path: Path, *, chunked_bytes: int = CHUNKED_UPLOAD_BYTES) -> str:
+    """Lädt eine Eingabe‑Datei hoch (große in Teilen) und liefert deren File‑ID."""
+    if path.stat().st_size > chunked_bytes:
+        upload = client.uploads.upload_file_chunked(
+            file=path, mime_type="application/jsonl", purpose="batch"
+        )
+        return upload.file.id
+    with open(path, "rb") as fh:
+        return client.files.create(file=fh, purpose="batch").id
+
+# --------------------------------------------------------------------------- #
+# Auftrag
+# --------------------------------------------------------------------------- #
+class BatchJob:
+    """
+    Ein oder mehrere gestartete Batches samt lokaler Eingabe‑Dateien.
+
+    Parameters
+    ----------
+    client : openai.OpenAI
+        Client, über den abgefragt und heruntergeladen wird.
+    batch_ids : list of str
+        IDs der Batches, in Eingabe‑Reihenfolge.
+    inputs : list of Path
+        Die zugehörigen JSONL‑Eingaben (liefern Prompts und Anzahl).
+    workdir : Path | None
+        Arbeitsverzeichnis, das `close()` löscht (`None` = nichts löschen).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        batch_ids: List[str],
+        inputs: List[Path],
+        *,
+        workdir: Optional[Path] = None,
+    ):
+        self.client = client
+        self.batch_ids = batch_ids
+        self.inputs = inputs
+        self.workdir = workdir
+        self._batches: Dict[str, Any] = {}
+
+    def __enter__(self) -> "BatchJob":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # --------------------------------------------------------------------------- #
+    # Status
+    # --------------------------------------------------------------------------- #
+    def refresh(self, batch_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Fragt den Status der (noch offenen) Batches ab."""
+        for batch_id in batch_ids or self.batch_ids:
+            batch = self._batches.get(batch_id)
+            if batch is None or batch.status not in _TERMINAL:
+                self._batches[batch_id] = self.client.batches.retrieve(batch_id)
+        return dict(self._batches)
+
+    @property
+    def done(self) -> bool:
+        return all(
+            batch_id in self._batches and self._batches[batch_id].status in _TERMINAL
+            for batch_id in self.batch_ids
+        )
+
+    def wait(
+        self,
+        batch_ids: Optional[List[str]] = None,
+        *,
+        poll_interval: float = 10.0,
+        max_interval: float = 300.0,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Wartet, bis die Batches fertig sind. Der Abfrage‑Abstand wächst von
+        `poll_interval` bis `max_interval`, damit lange Läufe kaum Anfragen kosten.
+        """
+        batch_ids = batch_ids or self.batch_ids
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = poll_interval
+        while True:
+            batches = self.refresh(batch_ids)
+            if all(batches[batch_id].status in _TERMINAL for batch_id in batch_ids):
+                return
+            if deadline is not None and time.monotonic() + interval > deadline:
+                raise TimeoutError(f"Batches nach {timeout} s noch nicht fertig.")
+            time.sleep(interval)
+            interval = min(interval * 1.5, max_interval)
+
+    def cancel(self) -> None:
+        """Bricht alle noch laufenden Batches ab."""
+        for batch_id, batch in self.refresh().items():
+            if batch.status not in _TERMINAL:
+                self._batches[batch_id] = self.client.batches.cancel(batch_id)
+
+    # --------------------------------------------------------------------------- #
+    # Ergebnisse
+    # --------------------------------------------------------------------------- #
+    def results(self, *, poll_interval: float = 10.0, max_interval: float = 300.0) -> Iterator[BatchItem]:
+        """
+        Liefert die Antworten in Eingabe‑Reihenfolge; wartet Batch für Batch,
+        sodass die ersten Ergebnisse kommen, bevor alle fertig sind.
+        """
+        for batch_id, path in zip(self.batch_ids, self.inputs):
+            self.wait([batch_id], poll_interval=poll_interval, max_interval=max_interval)
+            yield from self._shard_results(self._batches[batch_id], path)
+
+    def _shard_results(self, batch: Any, path: Path) -> Iterator[BatchItem]:
+        with tempfile.TemporaryFile() as store, open(path, "rb") as requests:
+            offsets = self._download(batch, store)
+            for line in requests:
+                request = json.loads(line)
+                index = int(request["custom_id"])
+                item = BatchItem(index=index, prompt=request["body"]["messages"][0]["content"])
+                offset = offsets.get(index)
+                if offset is None:
+                    item.error = BatchRequestError(
+                        f"Keine Antwort für Anfrage {index} (Batch‑Status '{batch.status}')."
+                    )
+                else:
+                    store.seek(offset)
+                    _fill(item, json.loads(store.readline()))
+                yield item
+
+    def _download(self, batch: Any, store: Any) -> Dict[int, int]:
+        """Streamt Ergebnis‑ und Fehler‑Datei nach `store`; liefert Index → Offset."""
+        offsets: Dict[int, int] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            with self.client.files.with_streaming_response.content(file_id) as response:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = line.encode("utf-8")
+                    # nur die custom_id suchen – geparst wird erst beim Ausliefern
+                    match = _CUSTOM_ID.search(data)
+                    if match is None:
+                        continue
+                    offsets[int(match.group(1))] = store.tell()
+                    store.write(data + b"\n")
+        return offsets
+
+    def close(self) -> None:
+        """Löscht das lokale Arbeitsverzeichnis (die Batches bleiben bestehen)."""
+        if self.workdir is not None:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            self.workdir = None
+
+
+def _fill(item: BatchItem, result: Dict[str, Any]) -> None:
+    error = result.get("error")
+    response = result.get("response") or {}
+    status = response.get("status_code")
+    body = response.get("body") or {}
+    if error or status != 200:
+        error = error or body.get("error") or {}
+        item.error = BatchRequestError(
+            error.get("message") or f"HTTP {status}",
+            code=error.get("code"),
+            status_code=status,
+        )
+        return
+    item.answer = body["choices"][0]["message"]["content"]
+
+
+def submit(
+    handler: "LLMHandler",
+    prompts: Iterable[str],
+    *,
+    length: Optional[int] = None,
+    metadata: Optional[Dict[str, str]] = None,
+    workdir: Optional[Union[str, Path]] = None,
+    shard_size: int = MAX_REQUESTS_PER_BATCH,
+) -> BatchJob:
+    """Implementierung von `LLMHandler.submit_batch`."""
+    if handler.llm_type != "openai":
+        raise ValueError("Die Batch‑API gibt es nur für llm_type='openai'.")
+    if not 1 <= shard_size <= MAX_REQUESTS_PER_BATCH:
+        raise ValueError(f"shard_size muss zwischen 1 und {MAX_REQUESTS_PER_BATCH} liegen.")
+    owned = workdir is None
+    directory = Path(tempfile.mkdtemp(prefix="llm-batch-")) if owned else Path(workdir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    # Die Batch‑API hat eigene Limits; der Rate‑Limiter des Handlers (und
+    # dessen `max_retries=0`) gilt hier nicht.
+    client = handler.client.with_options(max_retries=handler._import_backend().DEFAULT_MAX_RETRIES)
+    batch_ids: List[str] = []
+    inputs: List[Path] = []
+    try:
+        # Jede Datei wird hochgeladen, sobald sie voll ist – während die
+        # nächste noch geschrieben wird, läuft der vorige Batch schon.
+        for path in write_requests(
+            prompts, directory, model=handler.model, max_tokens=length, shard_size=shard_size
+        ):
+            file_id = upload_requests(client, path)
+            batch = client.batches.create(
+                completion_window="24h",
+                endpoint=_ENDPOINT,
+                input_file_id=file_id,
+                metadata=metadata if metadata is not None else handler._import_backend().NOT_GIVEN,
+            )
+            batch_ids.append(batch.id)
+            inputs.append(path)
+    except BaseException:
+        if owned:
+            shutil.rmtree(directory, ignore_errors=True)
+        raise
+    return BatchJob(client, batch_ids, inputs, workdir=directory if owned else None)
@@ -0,0 +1,352 @@
+# Conversation.py
+"""
+Mehrrunden‑Gespräche auf Basis des **LLMHandler**.
+
+Ein `Conversation`‑Objekt hält den Verlauf einer Sitzung und schickt bei
+jeder Runde nur so viel mit, wie nötig ist:
+
+* Ollama: `generate` mit dem zuletzt gelieferten `context` und `keep_alive`
+  – der Server setzt aus seinem KV‑Cache fort, übertragen und neu berechnet
+  wird nur die neue Nachricht.
+* OpenAI / Gemini: Chat‑Nachrichten mit dem (gekürzten) Verlauf.
+
+Ein Präfix des Handlers (`set_prefix`) geht jeder Runde voran – bei Ollama
+als einmal tokenisierter Präfix‑Kontext – und zählt zum Token‑Budget.
+
+Wächst der Verlauf über das Token‑Budget, fallen die ältesten Runden heraus;
+mit `summarize=True` werden sie vorher zu einer kurzen Zusammenfassung
+verdichtet, die als System‑Nachricht erhalten bleibt.
+
+Beispiel::
+
+    handler = LLMHandler("ollama")
+    chat = handler.conversation(system="Antworte knapp.")
+    chat.ask("Wer schrieb den Faust?")
+    chat.ask("Und wann?")          # kennt die vorige Runde
+"""
+
+# --------------------------------------------------------------------------- #
+# IMPORTS
+# --------------------------------------------------------------------------- #
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    from FileIngestor import Attachment
+    from LLMHandler import AnswerStream, AsyncAnswerStream, LLMHandler, StreamMetrics
+
+# Rollen‑/Format‑Overhead je Nachricht (Tokens)
+_MESSAGE_OVERHEAD = 4
+
+_SUMMARY_INSTRUCTION = (
+    "Fasse den folgenden Gesprächsverlauf knapp zusammen. Behalte Fakten, "
+    "Entscheidungen und offene Fragen, lass Höflichkeiten weg."
+)
+
+# --------------------------------------------------------------------------- #
+# Gespräch
+# --------------------------------------------------------------------------- #
+class Conversation:
+    """
+    Verlauf einer Sitzung (nicht thread‑sicher – eine Instanz pro Sitzung).
+
+    Parameters
+    ----------
+    handler : LLMHandler
+        Handler, über den alle Runden laufen.
+    system : str | None
+        System‑Anweisung für die gesamte Sitzung.
+    max_history_tokens : int | None
+        Token‑Budget für System + Verlauf + neue Nachricht. Standard: drei
+        Viertel des Kontext‑Fensters (der Rest bleibt für die Antwort).
+    summarize : bool
+        Herausfallende Runden zusammenfassen statt sie nur zu verwerfen.
+    keep_alive : str | float | None
+        Wie lange Ollama das Modell (und damit den KV‑Cache) geladen hält.
+    """
+
+    def __init__(
+        self,
+        handler: "LLMHandler",
+        *,
+        system: Optional[str] = None,
+        max_history_tokens: Optional[int] = None,
+        summarize: bool = False,
+        keep_alive: Optional[Union[str, float]] = "30m",
+    ):
+        self.handler = handler
+        self.system = system
+        self.max_history_tokens = max_history_tokens
+        self.summarize = summarize
+        self.keep_alive = keep_alive
+        self.summary: Optional[str] = None
+        self._history: List[Dict[str, str]] = []
+        self._context: Optional[List[int]] = None   # Ollama‑KV‑Kontext
+
+    # --------------------------------------------------------------------------- #
+    # Interface
+    # --------------------------------------------------------------------------- #
+    @property
+    def messages(self) -> List[Dict[str, str]]:
+        """Der aktuell gehaltene Verlauf (ohne System‑Nachricht), als Kopie."""
+        return [dict(message) for message in self._history]
+
+    @property
+    def budget(self) -> int:
+        if self.max_history_tokens is not None:
+            return self.max_history_tokens
+        return self.handler.tokens.context_limit * 3 // 4
+
+    def reset(self) -> None:
+        """Vergisst Verlauf, Zusammenfassung und Server‑Kontext."""
+        self._history.clear()
+        self.summary = None
+        self._context = None
+
+    def ask(
+        self,
+        prompt: str,
+        *,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        temperature: Optional[float] = None,
+        length: Optional[int] = None,
+    ) -> str:
+        """
+        Stellt die nächste Frage der Sitzung.
+
+        Text‑Dateien werden Teil der Nachricht (und damit des Verlaufs);
+        Bilder gehen nur in dieser Runde mit.
+        """
+        images, texts = self.handler._ingest(files)
+        content = self._user_content(prompt, texts)
+        dropped = self._fit(content)
+        if dropped and self.summarize:
+            self._summarize(dropped)
+        messages = self._request_messages(content)
+        answer, context = self.handler._turn(
+            messages,
+            images=images,
+            temperature=temperature,
+            max_tokens=self._plan_length(messages, images, length),
+            context=self._context,
+            keep_alive=self.keep_alive,
+        )
+        self._remember(content, answer, context)
+        return answer
+
+    async def aask(
+        self,
+        prompt: str,
+        *,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        temperature: Optional[float] = None,
+        length: Optional[int] = None,
+    ) -> str:
+        """Asynchrone Variante von `ask` (gleiche Parameter)."""
+        images, texts = await self.handler._aingest(files)
+        content = self._user_content(prompt, texts)
+        dropped = self._fit(content)
+        if dropped and self.summarize:
+            await self._asummarize(dropped)
+        messages = self._request_messages(content)
+        answer, context = await self.handler._turn_async(
+            messages,
+            images=images,
+            temperature=temperature,
+            max_tokens=self._plan_length(messages, images, length),
+            context=self._context,
+            keep_alive=self.keep_alive,
+        )
+        self._remember(content, answer, context)
+        return answer
+
+    def stream(
+        self,
+        prompt: str,
+        *,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        temperature: Optional[float] = None,
+        length: Optional[int] = None,
+        output_path: Optional[Union[str, Path]] = None,
+    ) -> "AnswerStream":
+        """
+        Wie `ask`, liefert die Antwort aber inkrementell (siehe
+        `LLMHandler.stream_answer`). Die Runde landet erst im Verlauf, wenn
+        der Stream vollständig gelesen wurde; ein abgebrochener Stream zählt nicht.
+        """
+        from LLMHandler import AnswerStream, StreamMetrics
+
+        metrics = StreamMetrics()
+        deltas = self._stream_deltas(prompt, files, temperature, length, metrics)
+        return AnswerStream(deltas, metrics, output_path)
+
+    def astream(
+        self,
+        prompt: str,
+        *,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        temperature: Optional[float] = None,
+        length: Optional[int] = None,
+        output_path: Optional[Union[str, Path]] = None,
+    ) -> "AsyncAnswerStream":
+        """Asynchrone Variante von `stream` (`async for delta in chat.astream(...)`)."""
+        from LLMHandler import AsyncAnswerStream, StreamMetrics
+
+        metrics = StreamMetrics()
+        deltas = self._astream_deltas(prompt, files, temperature, length, metrics)
+        return AsyncAnswerStream(deltas, metrics, output_path)
+
+    # --------------------------------------------------------------------------- #
+    # Interna
+    # --------------------------------------------------------------------------- #
+    def _stream_deltas(
+        self,
+        prompt: str,
+        files: Optional[Sequence[Union[str, Path]]],
+        temperature: Optional[float],
+        length: Optional[int],
+        metrics: "StreamMetrics",
+    ) -> Iterator[str]:
+        images, texts = self.handler._ingest(files)
+        content = self._user_content(prompt, texts)
+        dropped = self._fit(content)
+        if dropped and self.summarize:
+            self._summarize(dropped)
+        messages = self._request_messages(content)
+        turn: Dict[str, Any] = {}
+        parts: List[str] = []
+        for delta in self.handler._turn_stream(
+            messages,
+            images=images,
+            temperature=temperature,
+            max_tokens=self._plan_length(messages, images, length),
+            metrics=metrics,
+            turn=turn,
+            context=self._context,
+            keep_alive=self.keep_alive,
+        ):
+            parts.append(delta)
+            yield delta
+        self._remember(content, "".join(parts), turn.get("context"))
+
+    async def _astream_deltas(
+        self,
+        prompt: str,
+        files: Optional[Sequence[Union[str, Path]]],
+        temperature: Optional[float],
+        length: Optional[int],
+        metrics: "StreamMetrics",
+    ) -> AsyncIterator[str]:
+        images, texts = await self.handler._aingest(files)
+        content = self._user_content(prompt, texts)
+        dropped = self._fit(content)
+        if dropped and self.summarize:
+            await self._asummarize(dropped)
+        messages = self._request_messages(content)
+        turn: Dict[str, Any] = {}
+        parts: List[str] = []
+        async for delta in self.handler._turn_stream_async(
+            messages,
+            images=images,
+            temperature=temperature,
+            max_tokens=self._plan_length(messages, images, length),
+            metrics=metrics,
+            turn=turn,
+            context=self._context,
+            keep_alive=self.keep_alive,
+        ):
+            parts.append(delta)
+            yield delta
+        self._remember(content, "".join(parts), turn.get("context"))
+
+    @staticmethod
+    def _user_content(prompt: str, texts: List[str]) -> str:
+        return "\n\n".join([*texts, prompt])
+
+    def _system_text(self) -> Optional[str]:
+        parts = [self.system] if self.system else []
+        if self.summary:
+            parts.append(f"Bisheriger Gesprächsverlauf (zusammengefasst):\n{self.summary}")
+        return "\n\n".join(parts) or None
+
+    def _request_messages(self, content: str) -> List[Dict[str, str]]:
+        messages: List[Dict[str, str]] = []
+        system = self._system_text()
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.extend(self._history)
+        messages.append({"role": "user", "content": content})
+        return messages
+
+    def _tokens(self, text: str) -> int:
+        return self.handler.tokens.count(text) + _MESSAGE_OVERHEAD
+
+    def _used(self, content: str) -> int:
+        """Belegte Tokens von Präfix + System + Verlauf + neuer Nachricht."""
+        if self._context:
+            # Ollama zählt den bisherigen Kontext (samt Präfix) exakt mit
+            return len(self._context) + self._tokens(content)
+        system = self._system_text()
+        used = sum(self._tokens(text) for text in self.handler._prefix_texts())
+        used += self._tokens(system) if system else 0
+        used += sum(self._tokens(message["content"]) for message in self._history)
+        return used + self._tokens(content)
+
+    def _fit(self, content: str) -> List[Dict[str, str]]:
+        """
+        Kürzt den Verlauf rundenweise (älteste zuerst), bis er ins Budget
+        passt, und liefert die verworfenen Nachrichten.
+        """
+        dropped: List[Dict[str, str]] = []
+        while self._history and self._used(content) > self.budget:
+            # eine Runde = Nutzer‑Nachricht + Antwort
+            dropped.extend(self._history[:2])
+            del self._history[:2]
+            # der Server‑Kontext enthält die verworfenen Runden noch
+            self._context = None
+        return dropped
+
+    def _summary_messages(self, dropped: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        speaker = {"user": "Nutzer", "assistant": "Assistent"}
+        lines = [f"{speaker[m['role']]}: {m['content']}" for m in dropped]
+        if self.summary:
+            lines.insert(0, f"Frühere Zusammenfassung: {self.summary}")
+        return [{"role": "user", "content": _SUMMARY_INSTRUCTION + "\n\n" + "\n\n".join(lines)}]
+
+    def _summarize(self, dropped: List[Dict[str, str]]) -> None:
+        """
+        Verdichtet die verworfenen Runden. Die Anfrage läuft wie jede Runde
+        über `_turn` (gleiches Budget, gleiche Drosselung, kein Antwort‑Cache),
+        nur ohne Verlauf und Server‑Kontext.
+        """
+        messages = self._summary_messages(dropped)
+        self.summary, _ = self.handler._turn(
+            messages,
+            images=[],
+            temperature=0,
+            max_tokens=self._plan_length(messages, [], None),
+            keep_alive=self.keep_alive,
+        )
+
+    async def _asummarize(self, dropped: List[Dict[str, str]]) -> None:
+        messages = self._summary_messages(dropped)
+        self.summary, _ = await self.handler._turn_async(
+            messages,
+            images=[],
+            temperature=0,
+            max_tokens=self._plan_length(messages, [], None),
+            keep_alive=self.keep_alive,
+        )
+
+    def _plan_length(
+        self, messages: List[Dict[str, str]], images: List["Attachment"], length: Optional[int]
+    ) -> Optional[int]:
+        *earlier, last = messages
+        return self.handler._plan_length(
+            last["content"], images, [m["content"] for m in earlier], length
+        )
+
+    def _remember(self, content: str, answer: str, context: Optional[List[int]]) -> None:
+        self._history.append({"role": "user", "content": content})
+        self._history.append({"role": "assistant", "content": answer})
+        self._context = context
@@ -0,0 +1,437 @@
+# FileIngestor.py
+"""
+Speicher‑schonendes Einlesen von Datei‑Anhängen für den **LLMHandler**.
+
+Text‑Dateien werden per `mmap` eingeblendet und direkt aus dem Mapping
+dekodiert, statt sie erst komplett als `bytes` zu kopieren. Pro Anfrage gilt
+ein Byte‑Budget; zu große Eingaben werden je nach Einstellung abgelehnt oder
+abgeschnitten. Mit `iter_text_chunks` lassen sich große Dateien außerdem in
+Stücken fester Größe verarbeiten, ohne sie je vollständig zu materialisieren.
+
+Mehrere Anhänge werden parallel in einem Thread‑Pool vorbereitet. Die
+fertigen Payloads (Text bzw. Bild‑Bytes) landen in einem Digest‑Cache, der
+über Pfad + mtime + Größe adressiert wird – wer dieselben Referenz‑Dokumente
+mit tausenden Prompts verschickt, liest und dekodiert sie nur einmal.
+
+Bilder bleiben `bytes` samt echtem MIME‑Typ; Base64 und Inhalts‑Hash werden
+höchstens einmal pro Anhang berechnet. Mit `max_image_side` bzw.
+`recompress_image_bytes` werden große Bilder vorab verkleinert oder neu
+komprimiert (benötigt `Pillow`).
+
+Beispiel::
+
+    ingestor = FileIngestor(max_bytes=8 * 1024 * 1024, overflow="truncate")
+    handler = LLMHandler("openai", ingestor=ingestor)
+"""
+
+# --------------------------------------------------------------------------- #
+# IMPORTS
+# --------------------------------------------------------------------------- #
+import base64
+import codecs
+import hashlib
+import mimetypes
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CHUNK_BYTES = 1 << 20   # 1 MiB
+DEFAULT_CACHE_BYTES = 256 << 20  # 256 MiB
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# --------------------------------------------------------------------------- #
+# Helper
+# --------------------------------------------------------------------------- #
+class InputBudgetExceeded(ValueError):
+    """Die Anhänge einer Anfrage überschreiten das Byte‑Budget."""
+
+def is_image(path: Union[str, Path]) -> bool:
+    """Bestimmt, ob die Datei ein Bild ist (nach MIME‑Typ)."""
+    mime, _ = mimetypes.guess_type(path)
+    return mime is not None and mime.startswith("image/")
+
+def read_bytes(path: Union[str, Path]) -> bytes:
+    """Liest den Inhalt einer Datei (Binary)."""
+    with open(path, "rb") as f:
+        return f.read()
+
+def sniff_encoding(head: bytes) -> Optional[str]:
+    """Erkennt eine Kodierung am Byte‑Order‑Mark (sonst `None`)."""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    return None
+
+@contextmanager
+def _mapped(path: Union[str, Path]) -> Iterator[memoryview]:
+    """Blendet die Datei schreibgeschützt ein (leere Dateien → leere View)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                yield view
+            finally:
+                view.release()
+
+def chunk_text(pieces: Iterable[str], *, chunk_chars: int, overlap_chars: int = 0) -> Iterator[str]:
+    """
+    Fügt Text‑Stücke (z. B. aus `iter_text_chunks`) zu Chunks von höchstens
+    `chunk_chars` Zeichen zusammen, die sich um `overlap_chars` überlappen.
+
+    Geschnitten wird bevorzugt an Absätzen, dann an Zeilen‑ und Wortgrenzen,
+    sofern diese in der hinteren Hälfte des Fensters liegen.
+    """
+    if chunk_chars <= 0:
+        raise ValueError("chunk_chars muss größer als 0 sein.")
+    if not 0 <= overlap_chars < chunk_chars:
+        raise ValueError("overlap_chars muss zwischen 0 und chunk_chars liegen.")
+
+    buf = ""
+    for piece in pieces:
+        buf += piece
+        start = 0
+        while len(buf) - start > chunk_chars:
+            end = start + chunk_chars
+            cut = end
+            for sep in ("\n\n", "\n", " "):
+                pos = buf.rfind(sep, start + chunk_chars // 2, end)
+                if pos != -1:
+                    cut = pos + len(sep)
+                    break
+            yield buf[start:cut]
+            start = max(cut - overlap_chars, start + 1)
+        buf = buf[start:]
+    if buf.strip():
+        yield buf
+
+def _utf8_boundary(view: memoryview, limit: int) -> int:
+    """Verschiebt `limit` nach vorn auf den Anfang eines UTF‑8‑Zeichens."""
+    while 0 < limit < len(view) and (view[limit] & 0xC0) == 0x80:
+        limit -= 1
+    return limit
+
+# --------------------------------------------------------------------------- #
+# Vorbereiteter Anhang
+# --------------------------------------------------------------------------- #
+class Attachment:
+    """Ein vorbereiteter Anhang: dekodierter Text *oder* Bild‑Bytes."""
+
+    __slots__ = ("path", "mime", "data", "text", "_b64", "_digest")
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        mime: Optional[str],
+        *,
+        data: Optional[bytes] = None,
+        text: Optional[str] = None,
+    ):
+        self.path = path
+        self.mime = mime
+        self.data = data
+        self.text = text
+        self._b64: Optional[str] = None
+        self._digest: Optional[str] = None
+
+    @property
+    def is_image(self) -> bool:
+        return self.data is not None
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Ungefährer Speicherbedarf (für das Cache‑Limit). Bei Bildern zählt das
+        Base64 gleich mit, auch wenn es erst beim ersten Zugriff entsteht.
+        """
+        if self.data is not None:
+            return len(self.data) + (len(self.data) + 2) // 3 * 4
+        return len(self.text or "")
+
+    @property
+    def b64(self) -> str:
+        """Base64 der Bild‑Bytes – wird nur einmal pro Anhang berechnet."""
+        if self._b64 is None:
+            self._b64 = base64.b64encode(self.data or b"").decode("ascii")
+        return self._b64
+
+    @property
+    def data_url(self) -> str:
+        """`data:`‑URL des Bildes (z. B. für OpenAI‑`image_url`)."""
+        return f"data:{self.mime or 'application/octet-stream'};base64,{self.b64}"
+
+    @property
+    def digest(self) -> str:
+        """SHA‑256 des Inhalts (für Cache‑Schlüssel) – ebenfalls nur einmal berechnet."""
+        if self._digest is None:
+            payload = self.data if self.data is not None else (self.text or "").encode("utf-8")
+            self._digest = hashlib.sha256(payload).hexdigest()
+        return self._digest
+
+# --------------------------------------------------------------------------- #
+# Ingestor
+# --------------------------------------------------------------------------- #
+class FileIngestor:
+    """
+    Liest die Anhänge einer Anfrage innerhalb eines Byte‑Budgets ein.
+
+    Parameters
+    ----------
+    max_bytes : int | None
+        Budget für die Summe aller Anhänge einer Anfrage (`None` = unbegrenzt).
+    overflow : str
+        'error'    – bei Überschreitung `InputBudgetExceeded` auslösen,
+        'truncate' – Text‑Dateien am Budget abschneiden.
+        Bilder lassen sich nicht sinnvoll kürzen und lösen immer einen Fehler aus.
+    chunk_bytes : int
+        Stückgröße für `iter_text_chunks`.
+    max_workers : int
+        Threads für die parallele Vorbereitung mehrerer Anhänge.
+    cache_bytes : int
+        Größe des Digest‑Caches für vorbereitete Anhänge (0 = aus).
+    max_image_side : int | None
+        Bilder mit längerer Kante werden auf diese Pixelzahl verkleinert.
+    recompress_image_bytes : int | None
+        Bilder über dieser Dateigröße werden neu komprimiert (JPEG bzw. PNG
+        bei Transparenz) – nur übernommen, wenn das Ergebnis kleiner ist.
+    image_quality : int
+        JPEG‑Qualität beim Neu‑Komprimieren.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: Optional[int] = None,
+        overflow: str = "error",
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+        max_workers: int = 4,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+        max_image_side: Optional[int] = None,
+        recompress_image_bytes: Optional[int] = None,
+        image_quality: int = 85,
+    ):
+        if overflow not in ("error", "truncate"):
+            raise ValueError(f"Unbekannte overflow‑Strategie '{overflow}'. Verwende 'error' oder 'truncate'.")
+        self.max_bytes = max_bytes
+        self.overflow = overflow
+        self.chunk_bytes = chunk_bytes
+        self.max_workers = max_workers
+        self.cache_bytes = cache_bytes
+        self.max_image_side = max_image_side
+        self.recompress_image_bytes = recompress_image_bytes
+        self.image_quality = image_quality
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Schlüssel → (Anhang, beim Einfügen angerechnete Bytes)
+        self._cache: "OrderedDict[Tuple[str, int, int], Tuple[Attachment, int]]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+        self._pool: Optional["ThreadPoolExecutor"] = None
+
+    # --------------------------------------------------------------------------- #
+    # Interface
+    # --------------------------------------------------------------------------- #
+    def ingest(self, files: Optional[Sequence[Union[str, Path]]]) -> Tuple[List[bytes], List[str]]:
+        """Teilt die Dateien in Bild‑Bytes und dekodierte Texte auf."""
+        images, texts = self.split(files)
+        return [att.data for att in images], texts
+
+    def split(self, files: Optional[Sequence[Union[str, Path]]]) -> Tuple[List[Attachment], List[str]]:
+        """Wie `ingest`, liefert Bilder aber als `Attachment` (MIME‑Typ, Base64, Hash)."""
+        images: List[Attachment] = []
+        texts: List[str] = []
+        for att in self.prepare_all(files):
+            if att.is_image:
+                images.append(att)
+            else:
+                texts.append(att.text)
+        return images, texts
+
+    def prepare_all(self, files: Optional[Sequence[Union[str, Path]]]) -> List[Attachment]:
+        """
+        Bereitet alle Anhänge einer Anfrage vor (Reihenfolge bleibt erhalten).
+
+        Das Budget wird vorab anhand der Dateigrößen verteilt; danach laufen
+        Lesen und Dekodieren parallel im Thread‑Pool.
+        """
+        paths = list(files or ())
+        if not paths:
+            return []
+
+        stats = [os.stat(fp) for fp in paths]
+        limits: List[Optional[int]] = []
+        remaining = self.max_bytes
+        for fp, st in zip(paths, stats):
+            if remaining is None or st.st_size <= remaining:
+                limits.append(None)
+            elif self.overflow == "error" or is_image(fp):
+                raise InputBudgetExceeded(
+                    f"{fp!s} ({st.st_size} Bytes) überschreitet das verbleibende Budget von {remaining} Bytes."
+                )
+            else:
+                limits.append(remaining)
+            if remaining is not None:
+                remaining = max(remaining - st.st_size, 0)
+
+        if len(paths) == 1:
+            return [self._prepare(paths[0], stats[0], limits[0])]
+        return list(self._get_pool().map(self._prepare, paths, stats, limits))
+
+    def close(self) -> None:
+        """Beendet den Thread‑Pool und leert den Digest‑Cache."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._cache.clear()
+            self._cached_bytes = 0
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def read_text(self, path: Union[str, Path], *, max_bytes: Optional[int] = None) -> Tuple[str, int]:
+        """
+        Dekodiert eine Text‑Datei direkt aus dem Mapping.
+
+        Kodierung: BOM (UTF‑8/UTF‑16), sonst UTF‑8, bei Fehlern latin1.
+        Returns
+        -------
+        (str, int)
+            Der Text und die Anzahl der verbrauchten Bytes.
+        """
+        with _mapped(path) as view:
+            limit = len(view) if max_bytes is None else min(len(view), max_bytes)
+            encoding = sniff_encoding(bytes(view[:4]))
+            if encoding is not None:
+                return str(view[:limit], encoding, errors="ignore"), limit
+            limit = _utf8_boundary(view, limit)
+            try:
+                return str(view[:limit], "utf-8"), limit
+            except UnicodeDecodeError:
+                return str(view[:limit], "latin1"), limit
+
+    # --------------------------------------------------------------------------- #
+    # Interna
+    # --------------------------------------------------------------------------- #
+    def _get_pool(self) -> "ThreadPoolExecutor":
+        with self._lock:
+            if self._pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ingest")
+            return self._pool
+
+    def _prepare(self, path: Union[str, Path], st: os.stat_result, limit: Optional[int]) -> Attachment:
+        """Liest und dekodiert einen Anhang – oder nimmt ihn aus dem Digest‑Cache."""
+        key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        if limit is None:
+            with self._lock:
+                entry = self._cache.get(key)
+                if entry is not None:
+                    self._cache.move_to_end(key)
+                    self.cache_hits += 1
+                    return entry[0]
+                self.cache_misses += 1
+
+        mime, _ = mimetypes.guess_type(path)
+        if mime is not None and mime.startswith("image/"):
+            data = read_bytes(path)
+            if self._should_shrink(len(data)):
+                data, mime = self._shrink_image(data, mime)
+            att = Attachment(path, mime, data=data)
+        else:
+            text, _ = self.read_text(path, max_bytes=limit)
+            att = Attachment(path, mime, text=text)
+
+        # Gekürzte Inhalte werden nicht gecacht – sie hängen vom Budget ab.
+        size = att.nbytes
+        if limit is None and 0 < size <= self.cache_bytes:
+            with self._lock:
+                if key not in self._cache:
+                    self._cache[key] = (att, size)
+                    self._cached_bytes += size
+                    while self._cached_bytes > self.cache_bytes:
+                        _, (_, old_size) = self._cache.popitem(last=False)
+                        self._cached_bytes -= old_size
+        return att
+
+    def _should_shrink(self, size: int) -> bool:
+        if self.max_image_side is not None:
+            return True
+        return self.recompress_image_bytes is not None and size > self.recompress_image_bytes
+
+    def _shrink_image(self, data: bytes, mime: str) -> Tuple[bytes, str]:
+        """
+        Verkleinert bzw. komprimiert ein Bild neu (Pillow). Formate, die
+        Pillow nicht lesen kann, bleiben unverändert.
+        """
+        import io
+
+        from PIL import Image, UnidentifiedImageError
+
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.load()
+        except (UnidentifiedImageError, OSError):
+            return data, mime
+        resized = False
+        if self.max_image_side is not None and max(image.size) > self.max_image_side:
+            image.thumbnail((self.max_image_side, self.max_image_side))
+            resized = True
+        too_big = self.recompress_image_bytes is not None and len(data) > self.recompress_image_bytes
+        if not resized and not too_big:
+            return data, mime
+
+        out = io.BytesIO()
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        if has_alpha:
+            image.save(out, format="PNG", optimize=True)
+            new_mime = "image/png"
+        else:
+            image.convert("RGB").save(out, format="JPEG", quality=self.image_quality, optimize=True)
+            new_mime = "image/jpeg"
+        if not resized and out.tell() >= len(data):
+            return data, mime
+        return out.getvalue(), new_mime
+
+    def iter_text_chunks(
+        self,
+        path: Union[str, Path],
+        *,
+        chunk_bytes: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Liefert eine Text‑Datei stückweise (je ca. `chunk_bytes` Bytes).
+
+        Die Kodierung wird inkrementell bestimmt: es wird als UTF‑8 dekodiert,
+        bis ein ungültiges Stück auftaucht; ab dort wird auf latin1 gewechselt.
+        """
+        chunk_bytes = chunk_bytes or self.chunk_bytes
+        with _mapped(path) as view:
+            limit = len(view) if max_bytes is None else min(len(view), max_bytes)
+            encoding = sniff_encoding(bytes(view[:4])) or "utf-8"
+            decoder = codecs.getincrementaldecoder(encoding)()
+            for start in range(0, limit, chunk_bytes):
+                final = start + chunk_bytes >= limit
+                with view[start:min(start + chunk_bytes, limit)] as chunk:
+                    try:
+                        text = decoder.decode(chunk, final=final)
+                    except UnicodeDecodeError:
+                        pending, _ = decoder.getstate()
+                        decoder = codecs.getincrementaldecoder("latin1")()
+                        text = decoder.decode(pending + bytes(chunk), final=final)
+                if text:
+                    yield text
@@ -0,0 +1,339 @@
+# Instrumentation.py
+"""
+Zeit‑ und Token‑Messung pro Anfrage für den **LLMHandler**.
+
+Jede Anfrage erzeugt einen `RequestTrace` mit ihren Phasen
+
+* ``read_files``  – Anhänge einlesen
+* ``build``       – Token‑Budget, Cache‑Lookup
+* ``rate_limit``  – Warten auf den `RateLimiter` (falls gesetzt)
+* ``call``        – Netzwerk + Generierung (nicht gestreamt)
+* ``ttfb``        – bis zum ersten Token (gestreamt)
+* ``generation``  – erstes bis letztes Token (gestreamt)
+* ``write``       – Antwort nach `output_path` schreiben
+
+sowie den vom Backend gemeldeten Token‑Zahlen und – bei Ollama – den
+serverseitigen Zeiten (``server.total``, ``server.load``, ``server.prompt_eval``,
+``server.eval``).
+Am Ende geht der Trace an alle Hooks (`Instrumentation`). Mitgeliefert:
+
+* `CallbackHooks`      – eigene Funktion je fertigem Trace,
+* `HistogramExporter`  – billige In‑Process‑Histogramme (p50/p90/p99),
+* `OpenTelemetryHooks` – Spans über `opentelemetry` (falls installiert).
+
+Beispiel::
+
+    histograms = HistogramExporter()
+    handler = LLMHandler("ollama", instrumentation=histograms)
+    handler.get_answers(prompts)
+    print(histograms.report())
+"""
+
+# --------------------------------------------------------------------------- #
+# IMPORTS
+# --------------------------------------------------------------------------- #
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# --------------------------------------------------------------------------- #
+# Trace
+# --------------------------------------------------------------------------- #
+@dataclass
+class RequestTrace:
+    """
+    Messdaten einer Anfrage. Zeiten in Sekunden; `spans` hält
+    (Name, Start, Ende) auf der `time.perf_counter`‑Uhr.
+    """
+    operation: str
+    llm_type: str
+    model: str
+    started_at: float = field(default_factory=time.time)
+    started: float = field(default_factory=time.perf_counter)
+    finished: Optional[float] = None
+    spans: List[Tuple[str, float, float]] = field(default_factory=list)
+    server: Dict[str, float] = field(default_factory=dict)
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    cached_tokens: Optional[int] = None
+    cache_hit: bool = False
+    finish_reason: Optional[str] = None
+    response_model: Optional[str] = None   # vom Backend gemeldetes Modell
+    error: Optional[BaseException] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, start, time.perf_counter()))
+
+    def add_span(self, name: str, start: Optional[float], end: Optional[float]) -> None:
+        if start is not None and end is not None:
+            self.spans.append((name, start, end))
+
+    def add_usage(
+        self,
+        prompt_tokens: Optional[int],
+        completion_tokens: Optional[int],
+        cached_tokens: Optional[int] = None,
+    ) -> None:
+        """Summiert Token‑Zahlen (mehrere Backend‑Aufrufe pro Anfrage möglich)."""
+        if prompt_tokens is not None:
+            self.prompt_tokens = (self.prompt_tokens or 0) + prompt_tokens
+        if completion_tokens is not None:
+            self.completion_tokens = (self.completion_tokens or 0) + completion_tokens
+        if cached_tokens is not None:
+            self.cached_tokens = (self.cached_tokens or 0) + cached_tokens
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.finished is None else self.finished - self.started
+
+    @property
+    def phases(self) -> Dict[str, float]:
+        """Summierte Dauer je Phase."""
+        totals: Dict[str, float] = {}
+        for name, start, end in self.spans:
+            totals[name] = totals.get(name, 0.0) + (end - start)
+        return totals
+
+# Der Trace der gerade laufenden Anfrage (pro Thread bzw. asyncio‑Task)
+current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("llm_request_trace", default=None)
+
+class _NullTrace:
+    """Platzhalter ohne Instrumentierung – alle Aufrufe kosten praktisch nichts."""
+
+    cache_hit = False
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        yield
+
+    def add_span(self, *args: Any) -> None:
+        pass
+
+    def add_usage(self, *args: Any) -> None:
+        pass
+
+NULL_TRACE = _NullTrace()
+
+# --------------------------------------------------------------------------- #
+# Hooks
+# --------------------------------------------------------------------------- #
+class Instrumentation:
+    """Basisklasse für Hooks; beide Methoden sind optional zu überschreiben."""
+
+    def on_start(self, trace: RequestTrace) -> None:
+        pass
+
+    def on_end(self, trace: RequestTrace) -> None:
+        pass
+
+class CallbackHooks(Instrumentation):
+    """Ruft `callback(trace)` für jede fertige Anfrage auf."""
+
+    def __init__(self, callback: Callable[[RequestTrace], None]):
+        self.callback = callback
+
+    def on_end(self, trace: RequestTrace) -> None:
+        self.callback(trace)
+
+class MultiHooks(Instrumentation):
+    """Verteilt auf mehrere Hooks."""
+
+    def __init__(self, hooks: Sequence[Instrumentation]):
+        self.hooks = list(hooks)
+
+    def on_start(self, trace: RequestTrace) -> None:
+        for hook in self.hooks:
+            hook.on_start(trace)
+
+    def on_end(self, trace: RequestTrace) -> None:
+        for hook in self.hooks:
+            hook.on_end(trace)
+
+# --------------------------------------------------------------------------- #
+# Histogramme
+# --------------------------------------------------------------------------- #
+class Histogram:
+    """
+    Log‑skaliertes Histogramm (4 Buckets pro Verdopplung, ~19 % Auflösung)
+    für Werte von 1e‑4 bis ~1e7 – konstanter Speicher, O(1) pro Messwert.
+    """
+
+    _MIN = 1e-4
+    _PER_DOUBLING = 4
+    _BUCKETS = 150
+
+    def __init__(self) -> None:
+        self.counts = [0] * (self._BUCKETS + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _bucket(self, value: float) -> int:
+        if value <= self._MIN:
+            return 0
+        index = int(math.log2(value / self._MIN) * self._PER_DOUBLING) + 1
+        return min(index, self._BUCKETS)
+
+    def _upper(self, index: int) -> float:
+        return self._MIN * 2 ** (index / self._PER_DOUBLING)
+
+    def add(self, value: float) -> None:
+        self.counts[self._bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(max(self._upper(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+@dataclass
+class HistogramSummary:
+    """Kennzahlen eines Histogramms."""
+    count: int
+    mean: Optional[float]
+    p50: Optional[float]
+    p90: Optional[float]
+    p99: Optional[float]
+    max: Optional[float]
+
+class HistogramExporter(Instrumentation):
+    """
+    Sammelt Phasen‑Dauern, Server‑Zeiten und Token‑Zahlen je Backend in
+    Histogrammen (thread‑sicher). Schlüssel: ``"<llm_type>/<metrik>"``.
+    """
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, Histogram] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def on_end(self, trace: RequestTrace) -> None:
+        values: List[Tuple[str, float]] = [("total", trace.duration or 0.0)]
+        values.extend(trace.phases.items())
+        values.extend(trace.server.items())
+        for name, tokens in (
+            ("tokens.prompt", trace.prompt_tokens),
+            ("tokens.completion", trace.completion_tokens),
+            ("tokens.cached", trace.cached_tokens),
+        ):
+            if tokens is not None:
+                values.append((name, float(tokens)))
+        with self._lock:
+            for name, value in values:
+                key = f"{trace.llm_type}/{name}"
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram()
+                histogram.add(value)
+            if trace.error is not None:
+                self._errors[trace.llm_type] = self._errors.get(trace.llm_type, 0) + 1
+
+    def snapshot(self) -> Dict[str, HistogramSummary]:
+        with self._lock:
+            return {
+                key: HistogramSummary(
+                    count=h.count,
+                    mean=h.mean,
+                    p50=h.percentile(50),
+                    p90=h.percentile(90),
+                    p99=h.percentile(99),
+                    max=h.max if h.count else None,
+                )
+                for key, h in sorted(self._histograms.items())
+            }
+
+    @property
+    def errors(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._errors)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._errors.clear()
+
+    def report(self) -> str:
+        """Tabelle aller Metriken (Zeiten in ms, Tokens als Anzahl)."""
+        lines = [f"{'metrik':32} {'n':>7} {'mean':>10} {'p50':>10} {'p90':>10} {'p99':>10} {'max':>10}"]
+        for key, s in self.snapshot().items():
+            scale = 1.0 if "/tokens." in key else 1000.0
+            cells = [s.mean, s.p50, s.p90, s.p99, s.max]
+            lines.append(f"{key:32} {s.count:7d} " + " ".join(
+                f"{v * scale:10.1f}" if v is not None else f"{'–':>10}" for v in cells
+            ))
+        for llm_type, n in self.errors.items():
+            lines.append(f"{llm_type}/errors: {n}")
+        return "\n".join(lines)
+
+# --------------------------------------------------------------------------- #
+# OpenTelemetry (optional)
+# --------------------------------------------------------------------------- #
+class OpenTelemetryHooks(Instrumentation):
+    """
+    Exportiert jeden Trace als Span ``llm.<operation>`` mit Kind‑Spans je
+    Phase (benötigt das Paket `opentelemetry-api`).
+    """
+
+    def __init__(self, tracer: Any = None):
+        if tracer is None:
+            from opentelemetry import trace
+
+            tracer = trace.get_tracer("LLMHandler")
+        self.tracer = tracer
+
+    def on_end(self, trace: RequestTrace) -> None:
+        from opentelemetry import trace as otel
+
+        # perf_counter → Wanduhr in Nanosekunden
+        offset = trace.started_at - trace.started
+
+        def ns(t: float) -> int:
+            return int((t + offset) * 1e9)
+
+        root = self.tracer.start_span(f"llm.{trace.operation}", start_time=ns(trace.started))
+        root.set_attribute("llm.type", trace.llm_type)
+        root.set_attribute("llm.model", trace.model)
+        root.set_attribute("llm.cache_hit", trace.cache_hit)
+        for name, value in (
+            ("llm.tokens.prompt", trace.prompt_tokens),
+            ("llm.tokens.completion", trace.completion_tokens),
+            ("llm.tokens.cached", trace.cached_tokens),
+        ):
+            if value is not None:
+                root.set_attribute(name, value)
+        for name, value in trace.server.items():
+            root.set_attribute(f"llm.{name}", value)
+        if trace.error is not None:
+            root.record_exception(trace.error)
+            root.set_status(otel.Status(otel.StatusCode.ERROR, str(trace.error)))
+        context = otel.set_span_in_context(root)
+        for name, start, end in trace.spans:
+            span = self.tracer.start_span(name, context=context, start_time=ns(start))
+            span.end(end_time=ns(end))
+        root.end(end_time=ns(trace.finished or time.perf_counter()))
@@ -0,0 +1,395 @@
+#!/usr/bin/env python
+# LLMDaemon.py
+"""
+Langlebiger Worker‑Prozess für den **LLMHandler**.
+
+Statt für jede Nachricht einen neuen Python‑Prozess zu starten (Import,
+`.env`, Client, TLS‑Handshake), hält der Daemon die Handler samt
+Verbindungs‑Pools warm und beantwortet beliebig viele Anfragen parallel.
+Gesprochen wird zeilenweises JSON (NDJSON, UTF‑8) über
+
+* stdin/stdout (Standard – ideal als Kind‑Prozess der Java‑GUI),
+* einen Unix‑Socket (`--unix PFAD`) oder
+* TCP auf localhost (`--tcp PORT`, z. B. unter Windows).
+
+Anfrage (eine Zeile)::
+
+    {"id": "42", "op": "stream", "backend": "openai", "model": "gpt-4o-mini",
+     "prompt": "Hallo!", "files": ["notes.txt"], "temperature": 0, "length": 200}
+
+`op` ist `answer` (Standard), `stream`, `cancel`, `reset`, `ping` oder
+`shutdown`; `backend`/`model` sind optional (Standard: `--backend` bzw.
+dessen Modell). Die `id` ist ein String oder eine Zahl, für `answer`/
+`stream` Pflicht und gilt je Verbindung: `cancel` trifft nur Anfragen
+derselben Verbindung, und trennt ein Client (Socket/TCP) die Verbindung,
+werden seine offenen Anfragen abgebrochen. Mit `"session": "<name>"` (und optional `"system"`) wird
+die Anfrage Teil einer `Conversation` mit Verlauf – auch gestreamt; `reset`
+vergisst sie wieder. Antworten tragen immer die `id` der Anfrage und kommen
+ggf. verschachtelt::
+
+    {"id": "42", "delta": "Hal"}                          # nur bei "stream"
+    {"id": "42", "done": true, "answer": "Hallo!", "ttft": 0.21, "tokens_per_second": 48.3}
+    {"id": "42", "error": "…", "type": "ValueError"}
+
+Beispiel::
+
+    python LLMDaemon.py -m openai                 # stdin/stdout
+    python LLMDaemon.py -m ollama --tcp 8765      # localhost:8765
+"""
+
+# --------------------------------------------------------------------------- #
+# IMPORTS
+# --------------------------------------------------------------------------- #
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from Conversation import Conversation
+from LLMHandler import AsyncAnswerStream, LLMHandler
+
+# Zeilen dürfen groß werden (lange Prompts); asyncio erlaubt sonst nur 64 KiB.
+_LINE_LIMIT = 16 << 20
+
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+Tasks = Dict[Any, "asyncio.Task[None]"]   # laufende Anfragen einer Verbindung (id → Task)
+
+# --------------------------------------------------------------------------- #
+# Daemon
+# --------------------------------------------------------------------------- #
+class LLMDaemon:
+    """
+    Verteilt NDJSON‑Anfragen auf warm gehaltene `LLMHandler`.
+
+    Parameters
+    ----------
+    backend : str
+        Standard‑Backend für Anfragen ohne `backend`.
+    max_concurrency : int
+        Obergrenze gleichzeitig laufender Anfragen (über alle Verbindungen).
+    handler_options : dict | None
+        Zusätzliche Schlüsselwort‑Argumente für jeden `LLMHandler`
+        (z. B. `cache`, `check_context`, `max_connections`).
+    """
+
+    def __init__(
+        self,
+        backend: str = "ollama",
+        *,
+        max_concurrency: int = 64,
+        handler_options: Optional[Dict[str, Any]] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency muss mindestens 1 sein.")
+        self.backend = backend.lower()
+        self.max_concurrency = max_concurrency
+        self.handler_options = dict(handler_options or {})
+        self._handlers: Dict[Tuple[str, Optional[str]], LLMHandler] = {}
+        self._sessions: Dict[str, Tuple[Conversation, asyncio.Lock]] = {}
+        self._tasks: Set["asyncio.Task[None]"] = set()   # über alle Verbindungen
+        self._limit: Optional[asyncio.Semaphore] = None
+        self._stopped: Optional[asyncio.Event] = None
+
+    # --------------------------------------------------------------------------- #
+    # Handler‑Verwaltung
+    # --------------------------------------------------------------------------- #
+    def handler(self, backend: Optional[str] = None, model: Optional[str] = None) -> LLMHandler:
+        """Liefert (und merkt sich) den Handler für Backend + Modell."""
+        key = ((backend or self.backend).lower(), model)
+        handler = self._handlers.get(key)
+        if handler is None:
+            handler = LLMHandler(key[0], model=model, **self.handler_options)
+            self._handlers[key] = handler
+        return handler
+
+    def session(self, name: str, request: Dict[str, Any]) -> Tuple[Conversation, asyncio.Lock]:
+        """Liefert (und merkt sich) die Sitzung `name` samt Sperre."""
+        entry = self._sessions.get(name)
+        if entry is None:
+            handler = self.handler(request.get("backend"), request.get("model"))
+            entry = (handler.conversation(system=request.get("system")), asyncio.Lock())
+            self._sessions[name] = entry
+        return entry
+
+    def warm_up(self) -> None:
+        """Baut den Client des Standard‑Backends vorab auf."""
+        self.handler()._get_async_client()
+
+    async def aclose(self) -> None:
+        """Bricht noch laufende Anfragen ab und schließt alle Handler."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        for handler in self._handlers.values():
+            await handler.aclose()
+            handler.close()
+        self._handlers.clear()
+        self._sessions.clear()
+
+    # --------------------------------------------------------------------------- #
+    # Protokoll
+    # --------------------------------------------------------------------------- #
+    async def dispatch(self, line: bytes, send: Send, tasks: Tasks) -> None:
+        """
+        Verarbeitet eine Anfrage‑Zeile; lange Aufrufe laufen als Task und
+        werden unter ihrer `id` in `tasks` (dem Verzeichnis der Verbindung)
+        geführt.
+        """
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Anfrage muss ein JSON‑Objekt sein.")
+        except ValueError as exc:
+            await send({"id": None, "error": f"Ungültige Anfrage: {exc}", "type": "ValueError"})
+            return
+
+        rid = request.get("id")
+        if isinstance(rid, bool) or not isinstance(rid, (str, int, type(None))):
+            await send({"id": None, "error": "Die id muss ein String oder eine Zahl sein.", "type": "ValueError"})
+            return
+        op = request.get("op", "answer")
+        if op == "ping":
+            await send({"id": rid, "pong": True})
+        elif op == "shutdown":
+            await send({"id": rid, "done": True})
+            self._stop()
+        elif op == "cancel":
+            task = tasks.get(rid)
+            if task is not None:
+                task.cancel()
+        elif op == "reset":
+            if request.get("session") is not None:
+                self._sessions.pop(str(request["session"]), None)
+            await send({"id": rid, "done": True})
+        elif op in ("answer", "stream"):
+            if rid is None:
+                # ohne id ließen sich Antworten und `cancel` nicht zuordnen
+                await send({"id": None, "error": "Feld fehlt: 'id'", "type": "KeyError"})
+            elif rid in tasks:
+                await send({"id": rid, "error": "Doppelte Anfrage‑ID.", "type": "ValueError"})
+            else:
+                task = asyncio.ensure_future(self._run(rid, op, request, send))
+                tasks[rid] = task
+                self._tasks.add(task)
+                task.add_done_callback(lambda done, rid=rid: self._forget(tasks, rid, done))
+        else:
+            await send({"id": rid, "error": f"Unbekannte op '{op}'.", "type": "ValueError"})
+
+    def _forget(self, tasks: Tasks, rid: Any, task: "asyncio.Task[None]") -> None:
+        tasks.pop(rid, None)
+        self._tasks.discard(task)
+
+    async def _run(self, rid: Any, op: str, request: Dict[str, Any], send: Send) -> None:
+        assert self._limit is not None
+        async with self._limit:
+            try:
+                handler = self.handler(request.get("backend"), request.get("model"))
+                options = dict(
+                    files=request.get("files"),
+                    temperature=request.get("temperature"),
+                    length=request.get("length"),
+                )
+                if request.get("session") is not None:
+                    # Runden einer Sitzung laufen nacheinander
+                    chat, lock = self.session(str(request["session"]), request)
+                    async with lock:
+                        if op == "answer":
+                            answer = await chat.aask(request["prompt"], **options)
+                            await send({"id": rid, "done": True, "answer": answer})
+                        else:
+                            await self._send_stream(rid, chat.astream(request["prompt"], **options), send)
+                    return
+                if op == "answer":
+                    answer = await handler.aget_answer(request["prompt"], **options)
+                    await send({"id": rid, "done": True, "answer": answer})
+                    return
+                await self._send_stream(rid, handler.astream_answer(request["prompt"], **options), send)
+            except asyncio.CancelledError:
+                await send({"id": rid, "error": "Abgebrochen.", "type": "CancelledError"})
+                raise
+            except KeyError as exc:
+                await send({"id": rid, "error": f"Feld fehlt: {exc}", "type": "KeyError"})
+            except Exception as exc:
+                await send({"id": rid, "error": str(exc), "type": type(exc).__name__})
+
+    @staticmethod
+    async def _send_stream(rid: Any, stream: AsyncAnswerStream, send: Send) -> None:
+        parts = []
+        async for delta in stream:
+            parts.append(delta)
+            await send({"id": rid, "delta": delta})
+        await send({
+            "id": rid,
+            "done": True,
+            "answer": "".join(parts),
+            "ttft": stream.metrics.time_to_first_token,
+            "tokens_per_second": stream.metrics.tokens_per_second,
+        })
+
+    # --------------------------------------------------------------------------- #
+    # Transporte
+    # --------------------------------------------------------------------------- #
+    def _start(self) -> None:
+        self._limit = asyncio.Semaphore(self.max_concurrency)
+        self._stopped = asyncio.Event()
+
+    def _stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def _serve_lines(
+        self, readline: Callable[[], Awaitable[bytes]], send: Send, tasks: Tasks
+    ) -> None:
+        while True:
+            line = await readline()
+            if not line:
+                return
+            if not line.strip():
+                continue
+            try:
+                await self.dispatch(line, send, tasks)
+            except (ConnectionError, asyncio.CancelledError):
+                raise
+            except Exception as exc:
+                # eine fehlerhafte Anfrage darf den Leser (und die Verbindung) nicht beenden
+                await send({"id": None, "error": str(exc), "type": type(exc).__name__})
+
+    async def serve_stdio(self) -> None:
+        """Liest Anfragen von stdin und schreibt Antworten nach stdout."""
+        self._start()
+        out = sys.stdout.buffer
+        lock = asyncio.Lock()
+
+        async def send(message: Dict[str, Any]) -> None:
+            data = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+            async with lock:
+                out.write(data)
+                out.flush()
+
+        # Plattform‑neutral (auch Windows‑Pipes): stdin liest ein Daemon‑Thread.
+        # `os.read` statt `sys.stdin` hält keine Puffer‑Sperre, sodass ein
+        # blockiertes Lesen das Beenden des Interpreters nicht aufhält.
+        loop = asyncio.get_running_loop()
+        lines: "asyncio.Queue[bytes]" = asyncio.Queue()
+
+        def pump() -> None:
+            fd, pending = sys.stdin.fileno(), b""
+            while True:
+                data = os.read(fd, 1 << 16)
+                if not data:
+                    break
+                *complete, pending = (pending + data).split(b"\n")
+                for line in complete:
+                    loop.call_soon_threadsafe(lines.put_nowait, line + b"\n")
+            if pending:
+                loop.call_soon_threadsafe(lines.put_nowait, pending)
+            loop.call_soon_threadsafe(lines.put_nowait, b"")
+
+        threading.Thread(target=pump, name="llm-stdin", daemon=True).start()
+        reader = asyncio.ensure_future(self._serve_lines(lines.get, send, {}))
+        stopped = asyncio.ensure_future(self._stopped.wait())
+        await asyncio.wait({reader, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        stopped.cancel()
+        reader.cancel()
+        await self._drain()
+        await self.aclose()
+
+    async def _drain(self) -> None:
+        # Nach `shutdown` bzw. EOF laufende Anfragen noch zu Ende beantworten
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _client_connected(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        lock = asyncio.Lock()
+        tasks: Tasks = {}
+
+        async def send(message: Dict[str, Any]) -> None:
+            if writer.is_closing():
+                return
+            async with lock:
+                writer.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        try:
+            await self._serve_lines(reader.readline, send, tasks)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            pass   # Daemon wird beendet
+        finally:
+            # niemand liest mehr mit: offene Anfragen dieser Verbindung abbrechen
+            for task in list(tasks.values()):
+                task.cancel()
+            writer.close()
+
+    async def serve_unix(self, path: str) -> None:
+        """Lauscht auf einem Unix‑Socket (eine Verbindung = ein NDJSON‑Strom)."""
+        self._start()
+        server = await asyncio.start_unix_server(self._client_connected, path=path, limit=_LINE_LIMIT)
+        try:
+            await self._serve_until_stopped(server)
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    async def serve_tcp(self, port: int, host: str = "127.0.0.1") -> None:
+        """Lauscht auf TCP (standardmäßig nur localhost)."""
+        self._start()
+        server = await asyncio.start_server(self._client_connected, host, port, limit=_LINE_LIMIT)
+        await self._serve_until_stopped(server)
+
+    async def _serve_until_stopped(self, server: asyncio.AbstractServer) -> None:
+        assert self._stopped is not None
+        async with server:
+            await self._stopped.wait()
+            server.close()
+            await self._drain()
+        await self.aclose()
+
+# --------------------------------------------------------------------------- #
+# CLI
+# --------------------------------------------------------------------------- #
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="LLMDaemon.py",
+        description="Warmer LLM‑Worker (NDJSON über stdin/stdout, Unix‑Socket oder TCP).",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "-m", "--backend", choices=["ollama", "openai", "gemini"], default="ollama",
+        help="Standard‑Backend für Anfragen ohne 'backend'.",
+    )
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument("--unix", metavar="PFAD", help="Unix‑Socket statt stdin/stdout.")
+    transport.add_argument("--tcp", type=int, metavar="PORT", help="TCP‑Port auf localhost.")
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=64,
+        help="Maximal gleichzeitig laufende Anfragen.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    daemon = LLMDaemon(args.backend, max_concurrency=args.concurrency)
+    daemon.warm_up()
+    if args.unix:
+        serve = daemon.serve_unix(args.unix)
+    elif args.tcp:
+        serve = daemon.serve_tcp(args.tcp)
+    else:
+        serve = daemon.serve_stdio()
+    try:
+        asyncio.run(serve)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -10,29 +10,386 @@ API anspricht.
 # IMPORTS
 # --------------------------------------------------------------------------- #
 import os
-import mimetypes
+import time
+import threading
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-from dotenv import load_dotenv
+from FileIngestor import Attachment, FileIngestor, chunk_text, is_image
+from Instrumentation import NULL_TRACE, Instrumentation, MultiHooks, RequestTrace, current_trace
+from TokenCounter import ContextLimitExceeded, RequestEstimate, TokenCounter
+
+if TYPE_CHECKING:
+    from BatchAPI import BatchJob
+    from Conversation import Conversation
+    from RateLimiter import RateLimiter
+    from ResponseCache import ResponseCache
+
+# `asyncio` und `concurrent.futures` werden bewusst erst in den Methoden
+# importiert, die sie brauchen: zusammen kosten sie ~45 ms Startzeit, die
+# kurzlebige CLI‑Aufrufe (dummy.py, Java‑Bridge) sonst bei jedem Start zahlen.
+
+# Ollama‑Antwortfelder (ns) → Namen der Server‑Zeiten im Trace
+_OLLAMA_TIMINGS = (
+    ("total_duration", "server.total"),
+    ("load_duration", "server.load"),
+    ("prompt_eval_duration", "server.prompt_eval"),
+    ("eval_duration", "server.eval"),
+)
+
+# Höchstzahl Versuche einer OpenAI‑Anfrage, die mit 429 abgelehnt wird und
+# über den Rate‑Limiter erneut eingereiht wird
+_RATE_LIMIT_ATTEMPTS = 8
+
+# --------------------------------------------------------------------------- #
+# Umgebungs‑Variablen laden (einmalig, beim ersten Handler)
+# --------------------------------------------------------------------------- #
+_env_loaded = False
+
+def _load_env() -> None:
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv(override=True)
+        _env_loaded = True
+
+# --------------------------------------------------------------------------- #
+# Helper – Ausgabe schreiben
+# --------------------------------------------------------------------------- #
+def _write_output(answer: str, output_path: Optional[Union[str, Path]]) -> None:
+    """Schreibt die Antwort (falls gewünscht) in eine Datei."""
+    if output_path:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(answer, encoding="utf-8")
+
+# --------------------------------------------------------------------------- #
+# Helper – Map‑Reduce
+# --------------------------------------------------------------------------- #
+def _map_prompt(prompt: str, chunk: str, index: int, total: int, name: str) -> str:
+    return f"{prompt}\n\n--- Ausschnitt {index}/{total} aus {name} ---\n{chunk}"
+
+def _reduce_prompt(prompt: str, partials: Sequence[str], instruction: Optional[str]) -> str:
+    parts = [
+        "Die folgende Frage wurde abschnittsweise zu einem langen Dokument beantwortet:\n\n",
+        prompt,
+        "\n\n",
+    ]
+    for idx, partial in enumerate(partials, 1):
+        parts.append(f"--- Teilantwort {idx} ---\n{partial}\n\n")
+    parts.append(instruction or "Fasse die Teilantworten zu einer einzigen, vollständigen Antwort zusammen.")
+    return "".join(parts)
+
+def _group_partials(partials: Sequence[str], budget_chars: int) -> List[List[str]]:
+    """Packt Teilantworten gierig in Gruppen, die ins Budget passen."""
+    groups: List[List[str]] = [[]]
+    size = 0
+    for partial in partials:
+        if groups[-1] and size + len(partial) > budget_chars:
+            groups.append([])
+            size = 0
+        groups[-1].append(partial)
+        size += len(partial)
+    # Kein Fortschritt (jede Teilantwort allein zu groß) → alles in einem Schritt
+    if len(groups) == len(partials) > 1:
+        return [list(partials)]
+    return groups
+
+def _answers_or_raise(items: Sequence["BatchItem"]) -> List[str]:
+    failed = [item for item in items if not item.ok]
+    if failed:
+        raise RuntimeError(
+            f"{len(failed)} von {len(items)} Teilanfragen fehlgeschlagen."
+        ) from failed[0].error
+    return [item.answer or "" for item in items]
 
 # --------------------------------------------------------------------------- #
-# Umgebungs‑Variablen laden
+# Ergebnis‑Typen
 # --------------------------------------------------------------------------- #
-load_dotenv(override=True)
+@dataclass
+class BatchItem:
+    """
+    Ergebnis eines einzelnen Prompts aus `get_answers` / `aget_answers`.
+
+    Fehler werden pro Eintrag in `error` abgelegt, statt den ganzen Batch
+    abzubrechen; `latency` ist die Laufzeit des Aufrufs in Sekunden.
+    """
+    index: int
+    prompt: str
+    answer: Optional[str] = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class AnswerResult:
+    """
+    Antwort samt Verbrauchs‑ und Zeitdaten (`get_answer(..., return_result=True)`).
+
+    Token‑Zahlen und Server‑Zeiten stammen vom Backend und sind `None` bzw.
+    leer, wenn es sie nicht meldet oder die Antwort aus dem Antwort‑Cache
+    kam (`cached`). `server_timings` (Sekunden) liefert nur Ollama:
+    ``total``, ``load``, ``prompt_eval``, ``eval``; `latency` ist die auf
+    dem Client gemessene Gesamtdauer.
+    """
+
+    __slots__ = (
+        "text",
+        "model",
+        "finish_reason",
+        "prompt_tokens",
+        "completion_tokens",
+        "cached_tokens",
+        "server_timings",
+        "cached",
+        "latency",
+    )
+
+    def __init__(
+        self,
+        text: str,
+        *,
+        model: str,
+        finish_reason: Optional[str] = None,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+        cached_tokens: Optional[int] = None,
+        server_timings: Optional[Dict[str, float]] = None,
+        cached: bool = False,
+        latency: float = 0.0,
+    ):
+        self.text = text
+        self.model = model
+        self.finish_reason = finish_reason
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.cached_tokens = cached_tokens
+        self.server_timings = server_timings or {}
+        self.cached = cached
+        self.latency = latency
+
+    @classmethod
+    def _from_trace(cls, text: str, trace: RequestTrace) -> "AnswerResult":
+        return cls(
+            text,
+            model=trace.response_model or trace.model,
+            finish_reason=trace.finish_reason,
+            prompt_tokens=trace.prompt_tokens,
+            completion_tokens=trace.completion_tokens,
+            cached_tokens=trace.cached_tokens,
+            server_timings={name.split(".", 1)[1]: value for name, value in trace.server.items()},
+            cached=trace.cache_hit,
+            latency=trace.duration or 0.0,
+        )
+
+    @property
+    def total_tokens(self) -> Optional[int]:
+        if self.prompt_tokens is None and self.completion_tokens is None:
+            return None
+        return (self.prompt_tokens or 0) + (self.completion_tokens or 0)
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Generierungs‑Rate laut Server (Ollama) bzw. über die Gesamtdauer."""
+        duration = self.server_timings.get("eval") or self.latency
+        if not self.completion_tokens or not duration:
+            return None
+        return self.completion_tokens / duration
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return (
+            f"AnswerResult(model={self.model!r}, finish_reason={self.finish_reason!r}, "
+            f"prompt_tokens={self.prompt_tokens}, completion_tokens={self.completion_tokens}, "
+            f"cached={self.cached}, latency={self.latency:.3f}, text={self.text[:40]!r})"
+        )
+
+@dataclass
+class PromptPrefix:
+    """
+    Gleichbleibender Anfang aller Anfragen eines Handlers (`set_prefix`):
+    System‑Anweisung plus Referenz‑Texte, einmal eingelesen.
+    """
+    system: Optional[str]
+    texts: List[str]
+    keep_alive: Optional[Union[str, float]] = None
+    context: Optional[List[int]] = None   # Ollama: tokenisierter Präfix (KV‑Cache)
+
+    @property
+    def key_parts(self) -> List[str]:
+        return [self.system or "", *self.texts]
+
+@dataclass
+class PromptCacheStats:
+    """
+    Vom Backend gemeldete Prompt‑Tokens und davon aus dessen Prompt‑Cache
+    bediente (`cached_tokens`) – zum Nachweis, dass der Präfix trifft.
+
+    Ollama meldet keine gecachten Tokens, nur die neu ausgewerteten: dort
+    bleibt `cached_tokens` bei 0, ein Treffer zeigt sich an kleinen
+    `prompt_tokens` je Anfrage.
+    """
+    requests: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+@dataclass
+class StreamMetrics:
+    """
+    Laufzeit‑Kennzahlen einer gestreamten Antwort (Zeiten in Sekunden,
+    gemessen mit `time.perf_counter`).
+
+    `completion_tokens` ist die vom Server gemeldete Token‑Anzahl; fehlt sie,
+    wird die Anzahl der empfangenen Deltas als Näherung verwendet.
+    """
+    started: Optional[float] = None
+    first_token_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    chunks: int = 0
+    completion_tokens: Optional[int] = None
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+
+    def record(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.chunks += 1
+
+    def finish(self) -> None:
+        self.finished_at = time.perf_counter()
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        if self.started is None or self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        if self.first_token_at is None or self.finished_at is None:
+            return None
+        duration = self.finished_at - self.first_token_at
+        tokens = self.completion_tokens if self.completion_tokens is not None else self.chunks
+        return tokens / duration if duration > 0 else None
 
 # --------------------------------------------------------------------------- #
-# Helper – Datei‑Inhalte lesen
+# Streaming
 # --------------------------------------------------------------------------- #
-def _read_file_content(path: Union[str, Path]) -> bytes:
-    """Liest den Inhalt einer Datei (Binary)."""
-    with open(path, "rb") as f:
-        return f.read()
+def _open_stream_output(output_path: Optional[Union[str, Path]]) -> Any:
+    """Öffnet die Ausgabe‑Datei für inkrementelles Schreiben (oder None)."""
+    if not output_path:
+        return None
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    return open(output_path, "w", encoding="utf-8")
+
+async def _athreaded(iterable: Iterable[Any]) -> AsyncIterator[Any]:
+    """Liest einen blockierenden Iterator Element für Element in einem Worker‑Thread."""
+    import asyncio
+
+    iterator, done = iter(iterable), object()
+    while True:
+        item = await asyncio.to_thread(next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+class AnswerStream:
+    """
+    Iterator über die Text‑Deltas einer gestreamten Antwort.
+
+    Jedes Delta wird sofort weitergereicht und – falls `output_path` gesetzt
+    ist – direkt an die Ausgabe‑Datei angehängt. `metrics` wird dabei laufend
+    aktualisiert und ist nach dem Durchlauf vollständig.
+    """
+
+    def __init__(
+        self,
+        deltas: Iterator[str],
+        metrics: StreamMetrics,
+        output_path: Optional[Union[str, Path]] = None,
+    ):
+        self.metrics = metrics
+        self._iter = self._run(deltas, output_path)
+
+    def __iter__(self) -> "AnswerStream":
+        return self
 
-def _is_image(path: Union[str, Path]) -> bool:
-    """Bestimmt, ob die Datei ein Bild ist (nach MIME‑Typ)."""
-    mime, _ = mimetypes.guess_type(path)
-    return mime is not None and mime.startswith("image/")
+    def __next__(self) -> str:
+        return next(self._iter)
+
+    def close(self) -> None:
+        """Bricht den Stream ab (schließt Verbindung und Ausgabe‑Datei)."""
+        self._iter.close()
+
+    def _run(self, deltas: Iterator[str], output_path: Optional[Union[str, Path]]) -> Iterator[str]:
+        self.metrics.start()
+        out = _open_stream_output(output_path)
+        try:
+            for delta in deltas:
+                if not delta:
+                    continue
+                self.metrics.record()
+                if out is not None:
+                    out.write(delta)
+                    out.flush()
+                yield delta
+        finally:
+            self.metrics.finish()
+            if out is not None:
+                out.close()
+
+class AsyncAnswerStream:
+    """Asynchrones Gegenstück zu `AnswerStream` (`async for delta in stream`)."""
+
+    def __init__(
+        self,
+        deltas: AsyncIterator[str],
+        metrics: StreamMetrics,
+        output_path: Optional[Union[str, Path]] = None,
+    ):
+        self.metrics = metrics
+        self._iter = self._run(deltas, output_path)
+
+    def __aiter__(self) -> "AsyncAnswerStream":
+        return self
+
+    async def __anext__(self) -> str:
+        return await self._iter.__anext__()
+
+    async def aclose(self) -> None:
+        """Bricht den Stream ab (schließt Verbindung und Ausgabe‑Datei)."""
+        await self._iter.aclose()
+
+    async def _run(
+        self, deltas: AsyncIterator[str], output_path: Optional[Union[str, Path]]
+    ) -> AsyncIterator[str]:
+        self.metrics.start()
+        out = _open_stream_output(output_path)
+        try:
+            async for delta in deltas:
+                if not delta:
+                    continue
+                self.metrics.record()
+                if out is not None:
+                    out.write(delta)
+                    out.flush()
+                yield delta
+        finally:
+            self.metrics.finish()
+            if out is not None:
+                out.close()
 
 # --------------------------------------------------------------------------- #
 # Haupt‑Klasse
@@ -48,32 +405,120 @@ class LLMHandler:
     model   : str | None
         Optionaler Modell‑Name, überschreibt die Umgebungs‑Variable.
     host    : str | None
-        Nur für Ollama: Host‑URL (z. B. http://localhost:11434)
+        Basis‑URL des Servers: Ollama‑Host (z. B. http://localhost:11434),
+        OpenAI‑`base_url` bzw. Gemini‑API‑Endpunkt (dann per REST), etwa für
+        Proxys oder die Test‑Server in `benchmarks/`. Standard: Umgebungs‑
+        Variable `OLLAMA_HOST` / `OPENAI_BASE_URL` / `GEMINI_HOST`. Gemini
+        per REST hat keinen Async‑Transport: die `a…`‑Methoden lagern die
+        Aufrufe dann in Worker‑Threads aus.
+    max_connections : int
+        Größe des Verbindungs‑Pools (HTTP‑Backends Ollama & OpenAI).
+    max_keepalive_connections : int
+        Anzahl offen gehaltener Keep‑Alive‑Verbindungen im Pool.
+    http2 : bool
+        HTTP/2 verwenden (benötigt das Paket `h2`).
+    cache : ResponseCache | None
+        Optionaler Antwort‑Cache (siehe `ResponseCache.py`); wird von
+        `get_answer`/`aget_answer` genutzt.
+    ingestor : FileIngestor | None
+        Liest die Datei‑Anhänge ein (Byte‑Budget, Kürzen); Standard: unbegrenzt.
+    token_counter : TokenCounter | None
+        Lokale Token‑Schätzung; Standard: passend zu Backend und Modell.
+    check_context : bool
+        Bei `True` wird vor jedem Aufruf geprüft, ob Prompt und Anhänge ins
+        Kontext‑Fenster passen (sonst `ContextLimitExceeded`), und `length`
+        wird auf den verbleibenden Platz begrenzt.
+    rate_limiter : RateLimiter | None
+        Reiht Aufrufe vorab nach RPM/TPM ein (siehe `RateLimiter.py`); kann
+        von mehreren Handlern desselben Kontos geteilt werden. Das OpenAI‑SDK
+        wiederholt dann selbst nichts (`max_retries=0`): nach einem 429
+        pausiert der Limiter, und die Anfrage wird erneut eingereiht.
+    instrumentation : Instrumentation | sequence of Instrumentation | None
+        Hooks, die pro Anfrage Phasen‑Zeiten und Token‑Zahlen erhalten
+        (siehe `Instrumentation.py`, z. B. `HistogramExporter`).
+
+    Pro Handler wird genau ein langlebiger Client je Backend gehalten
+    (`ollama.Client`, `openai.OpenAI`, ein gecachtes `GenerativeModel`), damit
+    nicht jede Anfrage erneut TCP‑/TLS‑Handshakes kostet. Mit `close()` bzw.
+    `with LLMHandler(...) as handler:` werden die Verbindungen freigegeben.
+
+    Neben dem blockierenden `get_answer` gibt es die Coroutine `aget_answer`,
+    die die nativen Async‑Clients der Backends nutzt. Für den asynchronen
+    Lebenszyklus kann der Handler als `async with`‑Kontextmanager verwendet werden::
+
+        async with LLMHandler("ollama") as handler:
+            answer = await handler.aget_answer("Hallo!")
     """
 
-    def __init__(self, llm_type: str, *, model: Optional[str] = None, host: Optional[str] = None):
+    def __init__(
+        self,
+        llm_type: str,
+        *,
+        model: Optional[str] = None,
+        host: Optional[str] = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        http2: bool = False,
+        cache: Optional["ResponseCache"] = None,
+        ingestor: Optional[FileIngestor] = None,
+        token_counter: Optional[TokenCounter] = None,
+        check_context: bool = False,
+        rate_limiter: Optional["RateLimiter"] = None,
+        instrumentation: Optional[Union[Instrumentation, Sequence[Instrumentation]]] = None,
+    ):
         self.llm_type = llm_type.lower()
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.http2 = http2
+        self.cache = cache
+        self.ingestor = ingestor or FileIngestor()
+        self.check_context = check_context
+        self.rate_limiter = rate_limiter
+        if instrumentation is not None and not isinstance(instrumentation, Instrumentation):
+            instrumentation = MultiHooks(instrumentation)
+        self.instrumentation = instrumentation
+        self.prefix: Optional[PromptPrefix] = None
+        self._prompt_cache = PromptCacheStats()
+        self._prefix_lock = threading.Lock()
+        self._prefix_alock: Optional[Tuple[Any, Any]] = None   # (Event‑Loop, asyncio.Lock)
+        self._tokens = token_counter
+        self._lib: Any = None
+        self._client: Any = None
+        self._async_client: Any = None
+        self._gemini_rest: Any = None    # eigener REST‑Client (Gemini mit `host`)
+        self._init_lock = threading.Lock()
+        _load_env()
         self._load_backend(model, host)
 
+    def __enter__(self) -> "LLMHandler":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "LLMHandler":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+        self.close()
+
     # --------------------------------------------------------------------------- #
     # Backend‑Initialisierung
     # --------------------------------------------------------------------------- #
     def _load_backend(self, model: Optional[str], host: Optional[str]) -> None:
-        """Lädt die passende Bibliothek und setzt globale Konfigurationen."""
+        """
+        Setzt Modell und Host. Bibliothek und Client werden erst beim ersten
+        Aufruf geladen (`client`), damit der Konstruktor nichts importiert.
+        """
         if self.llm_type == "ollama":
-            import ollama
-            self.client = ollama
             self.host = host or os.getenv("OLLAMA_HOST", "http://127.0.0.1:11434")
             self.model = model or os.getenv("OLLAMA_MODEL", "gpt-oss:20b")
         elif self.llm_type == "openai":
-            import openai
-            self.client = openai
-            openai.api_key = os.getenv("OPENAI_API_KEY")
+            self.host = host or os.getenv("OPENAI_BASE_URL")
             self.model = model or os.getenv("OPENAI_MODEL", "gpt-4")
         elif self.llm_type == "gemini":
-            import google.generativeai as genai
-            self.client = genai
-            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+            self.host = host or os.getenv("GEMINI_HOST")
             self.model = model or os.getenv("GEMINI_MODEL", "gemini-1.5-pro")
         else:
             raise ValueError(
@@ -81,9 +526,188 @@ class LLMHandler:
                 "Verwende 'ollama', 'openai' oder 'gemini'."
             )
 
+    def _import_backend(self) -> Any:
+        """Importiert (einmalig) die Bibliothek des gewählten Backends."""
+        if self._lib is None:
+            if self.llm_type == "ollama":
+                import ollama
+                self._lib = ollama
+            elif self.llm_type == "openai":
+                import openai
+                self._lib = openai
+            elif self.llm_type == "gemini":
+                import google.generativeai as genai
+                if not self.host:
+                    # Mit `host` bekommt der Handler einen eigenen Client (`_create_client`),
+                    # die prozessweite Konfiguration bleibt dann unberührt.
+                    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+                self._lib = genai
+        return self._lib
+
+    @property
+    def client(self) -> Any:
+        """Der langlebige Client des Backends (wird beim ersten Zugriff erzeugt)."""
+        if self._client is None:
+            with self._init_lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> Any:
+        lib = self._import_backend()
+        if self.llm_type == "ollama":
+            return lib.Client(host=self.host, **self._http_options())
+        if self.llm_type == "openai":
+            return lib.OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                base_url=self.host,
+                http_client=lib.DefaultHttpxClient(**self._http_options()),
+                **self._openai_retry_options(),
+            )
+        model = lib.GenerativeModel(self.model)
+        if self.host:
+            # google-generativeai (getestet bis 0.8.x) nimmt keinen Client entgegen;
+            # `_client` ist dort ein Slot, der beim ersten Aufruf mit dem
+            # prozessweiten Default belegt wird. Ändert sich das, lieber laut
+            # scheitern als still am `host` vorbei zu senden.
+            if getattr(model, "_client", False) is not None:
+                raise RuntimeError(
+                    f"google-generativeai {getattr(lib, '__version__', '?')}: "
+                    "eigener Client für 'host' wird nicht unterstützt."
+                )
+            self._gemini_rest = model._client = self._gemini_rest_client()
+        return model
+
+    def _gemini_rest_client(self) -> Any:
+        """REST‑Client nur für diesen Handler (statt `genai.configure`, das prozessweit gilt)."""
+        from google.ai import generativelanguage as glm
+
+        return glm.GenerativeServiceClient(
+            transport="rest",
+            client_options={"api_endpoint": self.host, "api_key": os.getenv("GEMINI_API_KEY")},
+        )
+
+    def _openai_retry_options(self) -> Dict[str, Any]:
+        """
+        Mit Rate‑Limiter keine SDK‑Wiederholungen: das SDK würde nach einem
+        429 am Limiter vorbei erneut senden und dabei den Thread schlafen
+        legen; stattdessen reiht `_openai_create` die Anfrage neu ein.
+        """
+        return {"max_retries": 0} if self.rate_limiter is not None else {}
+
+    def _http_options(self) -> Dict[str, Any]:
+        """Pool‑Einstellungen für die httpx‑basierten Clients (Ollama, OpenAI)."""
+        import httpx
+
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+            ),
+            "http2": self.http2,
+        }
+
+    def _get_async_client(self) -> Any:
+        """Erzeugt (einmalig) den nativen Async‑Client des Backends."""
+        if self._async_client is None:
+            if self.llm_type == "gemini":
+                # GenerativeModel bietet sync & async Methoden auf demselben Objekt
+                self._async_client = self.client
+                return self._async_client
+            with self._init_lock:
+                if self._async_client is None:
+                    lib = self._import_backend()
+                    if self.llm_type == "ollama":
+                        self._async_client = lib.AsyncClient(host=self.host, **self._http_options())
+                    elif self.llm_type == "openai":
+                        self._async_client = lib.AsyncOpenAI(
+                            api_key=os.getenv("OPENAI_API_KEY"),
+                            base_url=self.host,
+                            http_client=lib.DefaultAsyncHttpxClient(**self._http_options()),
+                            **self._openai_retry_options(),
+                        )
+        return self._async_client
+
+    def _ingest(self, files: Optional[Sequence[Union[str, Path]]]) -> Tuple[List[Attachment], List[str]]:
+        """
+        Liest die Anhänge ein. Beim ersten Aufruf wird der Client parallel
+        dazu in einem Hilfs‑Thread aufgebaut (Import + Verbindungs‑Pool).
+        """
+        if not files or self._client is not None:
+            return self.ingestor.split(files)
+        warmup = threading.Thread(target=self._warm_client, name="llm-warmup", daemon=True)
+        warmup.start()
+        try:
+            return self.ingestor.split(files)
+        finally:
+            warmup.join()
+
+    async def _aingest(self, files: Optional[Sequence[Union[str, Path]]]) -> Tuple[List[Attachment], List[str]]:
+        """Async‑Gegenstück zu `_ingest`: Einlesen und Client‑Aufbau laufen in Threads."""
+        if not files:
+            return [], []
+        import asyncio
+
+        jobs = [asyncio.to_thread(self.ingestor.split, files)]
+        if self._async_client is None:
+            jobs.append(asyncio.to_thread(self._warm_client, True))
+        results = await asyncio.gather(*jobs)
+        return results[0]
+
+    def _warm_client(self, use_async: bool = False) -> None:
+        # Fehler tauchen beim eigentlichen Aufruf erneut (und dort sichtbar) auf.
+        try:
+            self._get_async_client() if use_async else self.client
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Schließt den langlebigen Client und gibt dessen Verbindungen frei."""
+        client, self._client = self._client, None
+        rest, self._gemini_rest = self._gemini_rest, None
+        if rest is not None:
+            rest.transport.close()
+        if client is None:
+            return
+        if self.llm_type == "openai":
+            client.close()
+        elif self.llm_type == "ollama":
+            client._client.close()
+
+    async def aclose(self) -> None:
+        """Schließt den Async‑Client (und dessen Verbindungen), falls vorhanden."""
+        client, self._async_client = self._async_client, None
+        if client is None:
+            return
+        if self.llm_type == "openai":
+            await client.close()
+        elif self.llm_type == "ollama":
+            await client._client.aclose()
+
+    @property
+    def tokens(self) -> TokenCounter:
+        """Token‑Schätzer für Backend und Modell (wird beim ersten Zugriff erzeugt)."""
+        if self._tokens is None:
+            self._tokens = TokenCounter(self.llm_type, self.model)
+        return self._tokens
+
     # --------------------------------------------------------------------------- #
     # Interface
     # --------------------------------------------------------------------------- #
+    def estimate_request(
+        self,
+        prompt: str,
+        *,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        length: Optional[int] = None,
+    ) -> RequestEstimate:
+        """
+        Schätzt Tokens, Ausgabe‑Länge und Kosten einer Anfrage – lokal, ohne
+        Netzwerk‑Roundtrip.
+        """
+        images, file_texts = self.ingestor.split(files)
+        return self.tokens.estimate(prompt, file_texts, len(images), max_tokens=length)
+
     def get_answer(
         self,
         prompt: str,
@@ -93,7 +717,8 @@ class LLMHandler:
         length: Optional[int] = None,   # neue Option – max_tokens oder None
         stream: bool = False,
         output_path: Optional[Path] = None,   # neue Option – Ausgabe‑Datei
-    ) -> str:
+        return_result: bool = False,
+    ) -> Union[str, AnswerResult]:
         """
         Fragt das hinterlegte LLM mit dem gegebenen Prompt ab.
 
@@ -106,132 +731,1776 @@ class LLMHandler:
         temperature : float | None
             Stimmt die Kreativität des Modells ab (nur bei Ollama & Gemini).
         length : int | None
-            Maximale Token‑Anzahl (None = unbegrenzt).
+            Maximale Token‑Anzahl (None/0 = unbegrenzt); wird auf den im
+            Kontext‑Fenster verbleibenden Platz begrenzt.
         stream : bool
-            Bei `True` wird die Antwort schrittweise zurückgegeben (nur bei Ollama/Gemini).
+            Bei `True` wird die Antwort gestreamt empfangen (nur bei Ollama/Gemini);
+            für inkrementelle Ausgabe siehe `stream_answer`.
         output_path : Path | None
             Pfad, unter dem die Antwort gespeichert werden soll.
+        return_result : bool
+            Statt des Texts ein `AnswerResult` mit Token‑Zahlen, Server‑Zeiten,
+            Modell, `finish_reason` und Cache‑Treffer liefern.
         Returns
         -------
-        str
+        str | AnswerResult
             Die Antwort des Modells (und ggf. in output_path geschrieben).
         """
-        # ----- Vorverarbeitung der Dateien --------------------------------
-        file_bytes: List[bytes] = []
-        file_texts: List[str] = []
-        if files:
-            for fp in files:
-                data = _read_file_content(fp)
-                if _is_image(fp):
-                    file_bytes.append(data)
-                else:
-                    try:
-                        file_texts.append(data.decode("utf-8"))
-                    except Exception:
-                        file_texts.append(data.decode("latin1"))
-
-        # ----- Aufruf je Backend -----------------------------------------
+        trace, token = self._begin_trace("get_answer", force=return_result)
+        try:
+            # ----- Vorverarbeitung der Dateien --------------------------------
+            with trace.phase("read_files"):
+                images, file_texts = self._ingest(files)
+
+            with trace.phase("build"):
+                # ----- Token‑Budget -------------------------------------------
+                length = self._plan_length(prompt, images, file_texts, length)
+
+                # ----- Cache‑Lookup -------------------------------------------
+                cache_key = self._cache_key(prompt, images, file_texts, temperature, length)
+                answer = self.cache.get(cache_key) if cache_key else None
+
+            # ----- Aufruf je Backend -----------------------------------------
+            if answer is None:
+                with trace.phase("call"):
+                    answer = self._answer(
+                        prompt,
+                        images=images,
+                        file_texts=file_texts,
+                        temperature=temperature,
+                        length=length,
+                        stream=stream,
+                    )
+                if cache_key:
+                    self.cache.put(cache_key, answer)
+            else:
+                trace.cache_hit = True
+
+            # ----- Optional: in Datei schreiben ------------------------------
+            if output_path:
+                with trace.phase("write"):
+                    _write_output(answer, output_path)
+        except BaseException as exc:
+            self._end_trace(trace, token, exc)
+            raise
+        self._end_trace(trace, token)
+        if return_result:
+            return AnswerResult._from_trace(answer, trace)
+        return answer
+
+    async def aget_answer(
+        self,
+        prompt: str,
+        *,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        temperature: Optional[float] = None,
+        length: Optional[int] = None,
+        stream: bool = False,
+        output_path: Optional[Path] = None,
+        return_result: bool = False,
+    ) -> Union[str, AnswerResult]:
+        """
+        Asynchrone Variante von `get_answer` (gleiche Parameter).
+
+        Nutzt `ollama.AsyncClient`, `openai.AsyncOpenAI` bzw. Geminis
+        `generate_content_async`, sodass viele Anfragen gleichzeitig auf
+        einem Event‑Loop laufen können, ohne je einen OS‑Thread zu belegen
+        (Ausnahme: Gemini mit `host`, siehe Klassen‑Doku).
+        Datei‑Lesen und ‑Schreiben werden in einen Worker‑Thread ausgelagert.
+        """
+        trace, token = self._begin_trace("aget_answer", force=return_result)
+        try:
+            # ----- Vorverarbeitung der Dateien --------------------------------
+            with trace.phase("read_files"):
+                images, file_texts = await self._aingest(files)
+
+            with trace.phase("build"):
+                # ----- Token‑Budget -------------------------------------------
+                length = self._plan_length(prompt, images, file_texts, length)
+
+                # ----- Cache‑Lookup -------------------------------------------
+                cache_key = self._cache_key(prompt, images, file_texts, temperature, length)
+                answer = self.cache.get(cache_key) if cache_key else None
+
+            # ----- Aufruf je Backend -----------------------------------------
+            if answer is None:
+                with trace.phase("call"):
+                    answer = await self._answer_async(
+                        prompt,
+                        images=images,
+                        file_texts=file_texts,
+                        temperature=temperature,
+                        length=length,
+                        stream=stream,
+                    )
+                if cache_key:
+                    self.cache.put(cache_key, answer)
+            else:
+                trace.cache_hit = True
+
+            # ----- Optional: in Datei schreiben ------------------------------
+            if output_path:
+                import asyncio
+
+                with trace.phase("write"):
+                    await asyncio.to_thread(_write_output, answer, output_path)
+        except BaseException as exc:
+            self._end_trace(trace, token, exc)
+            raise
+        self._end_trace(trace, token)
+        if return_result:
+            return AnswerResult._from_trace(answer, trace)
+        return answer
+
+    def stream_answer(
+        self,
+        prompt: str,
+        *,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        temperature: Optional[float] = None,
+        length: Optional[int] = None,
+        output_path: Optional[Path] = None,
+    ) -> AnswerStream:
+        """
+        Liefert die Antwort inkrementell als Iterator über Text‑Deltas.
+
+        Die Deltas kommen an, sobald das Backend sie sendet (alle drei
+        Backends), und werden ggf. direkt nach `output_path` geschrieben.
+        Zeit bis zum ersten Token und Tokens/s stehen in `stream.metrics`::
+
+            stream = handler.stream_answer("Erzähl mir etwas.")
+            for delta in stream:
+                print(delta, end="", flush=True)
+            print(stream.metrics.time_to_first_token)
+        """
+        metrics = StreamMetrics()
+        deltas = self._stream_deltas(
+            prompt, files=files, temperature=temperature, length=length, metrics=metrics
+        )
+        if self.instrumentation is not None:
+            deltas = self._traced_deltas(deltas, self._new_trace("stream_answer"))
+        return AnswerStream(deltas, metrics, output_path)
+
+    def astream_answer(
+        self,
+        prompt: str,
+        *,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        temperature: Optional[float] = None,
+        length: Optional[int] = None,
+        output_path: Optional[Path] = None,
+    ) -> AsyncAnswerStream:
+        """Asynchrone Variante von `stream_answer` (`async for delta in ...`)."""
+        metrics = StreamMetrics()
+        deltas = self._stream_deltas_async(
+            prompt, files=files, temperature=temperature, length=length, metrics=metrics
+        )
+        if self.instrumentation is not None:
+            deltas = self._atraced_deltas(deltas, self._new_trace("astream_answer"))
+        return AsyncAnswerStream(deltas, metrics, output_path)
+
+    def _stream_deltas(
+        self,
+        prompt: str,
+        *,
+        files: Optional[Sequence[Union[str, Path]]],
+        temperature: Optional[float],
+        length: Optional[int],
+        metrics: StreamMetrics,
+    ) -> Iterator[str]:
+        trace = current_trace.get() or NULL_TRACE
+        with trace.phase("read_files"):
+            images, file_texts = self._ingest(files)
+        with trace.phase("build"):
+            length = self._plan_length(prompt, images, file_texts, length)
+        self._throttle(prompt, images, file_texts, length)
+
         if self.llm_type == "ollama":
-            answer = self._ollama_answer(
+            deltas = self._ollama_stream(
                 prompt,
-                file_bytes=file_bytes,
+                images=images,
+                file_texts=file_texts,
                 temperature=temperature,
                 max_tokens=length,
-                stream=stream,
+                metrics=metrics,
             )
         elif self.llm_type == "openai":
-            combined_prompt = "\n\n".join(file_texts + [prompt]) if file_texts else prompt
-            answer = self._openai_answer(combined_prompt)
+            deltas = self._openai_stream(
+                prompt, images=images, file_texts=file_texts, max_tokens=length, metrics=metrics
+            )
         elif self.llm_type == "gemini":
-            answer = self._gemini_answer(
+            deltas = self._gemini_stream(
                 prompt,
-                file_bytes=file_bytes,
+                images=images,
+                file_texts=file_texts,
                 temperature=temperature,
-                stream=stream,
+                max_tokens=length,
+                metrics=metrics,
             )
         else:  # pragma: no cover
             raise RuntimeError("Unreachable")
 
-        # ----- Optional: in Datei schreiben ------------------------------
-        if output_path:
-            output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(answer, encoding="utf-8")
+        # ttfb = bis zum ersten nicht‑leeren Delta, generation = danach
+        started, first = time.perf_counter(), None
+        try:
+            for delta in deltas:
+                if first is None and delta:
+                    first = time.perf_counter()
+                    trace.add_span("ttfb", started, first)
+                yield delta
+        finally:
+            trace.add_span("generation", first, time.perf_counter())
 
-        return answer
+    async def _stream_deltas_async(
+        self,
+        prompt: str,
+        *,
+        files: Optional[Sequence[Union[str, Path]]],
+        temperature: Optional[float],
+        length: Optional[int],
+        metrics: StreamMetrics,
+    ) -> AsyncIterator[str]:
+        trace = current_trace.get() or NULL_TRACE
+        with trace.phase("read_files"):
+            images, file_texts = await self._aingest(files)
+        with trace.phase("build"):
+            length = self._plan_length(prompt, images, file_texts, length)
+        await self._athrottle(prompt, images, file_texts, length)
+
+        if self.llm_type == "ollama":
+            deltas = self._ollama_stream_async(
+                prompt,
+                images=images,
+                file_texts=file_texts,
+                temperature=temperature,
+                max_tokens=length,
+                metrics=metrics,
+            )
+        elif self.llm_type == "openai":
+            deltas = self._openai_stream_async(
+                prompt, images=images, file_texts=file_texts, max_tokens=length, metrics=metrics
+            )
+        elif self.llm_type == "gemini":
+            deltas = self._gemini_stream_async(
+                prompt,
+                images=images,
+                file_texts=file_texts,
+                temperature=temperature,
+                max_tokens=length,
+                metrics=metrics,
+            )
+        else:  # pragma: no cover
+            raise RuntimeError("Unreachable")
+
+        started, first = time.perf_counter(), None
+        try:
+            async for delta in deltas:
+                if first is None and delta:
+                    first = time.perf_counter()
+                    trace.add_span("ttfb", started, first)
+                yield delta
+        finally:
+            trace.add_span("generation", first, time.perf_counter())
 
     # --------------------------------------------------------------------------- #
-    # Unterfunktionen pro Backend
+    # Instrumentierung
     # --------------------------------------------------------------------------- #
-    def _ollama_answer(
+    def _new_trace(self, operation: str) -> RequestTrace:
+        return RequestTrace(operation=operation, llm_type=self.llm_type, model=self.model)
+
+    def _begin_trace(self, operation: str, *, force: bool = False) -> Tuple[Any, Any]:
+        """
+        Startet den Trace einer Anfrage – ohne Hooks (und ohne `force`, z. B.
+        für `return_result`) ein No‑op‑Platzhalter.
+        """
+        if self.instrumentation is None and not force:
+            return NULL_TRACE, None
+        trace = self._new_trace(operation)
+        if self.instrumentation is not None:
+            self.instrumentation.on_start(trace)
+        return trace, current_trace.set(trace)
+
+    def _end_trace(self, trace: Any, token: Any, error: Optional[BaseException] = None) -> None:
+        if token is None:
+            return
+        current_trace.reset(token)
+        self._finish_trace(trace, error)
+
+    def _finish_trace(self, trace: RequestTrace, error: Optional[BaseException] = None) -> None:
+        trace.finished = time.perf_counter()
+        trace.error = error
+        if self.instrumentation is not None:
+            self.instrumentation.on_end(trace)
+
+    def _traced_deltas(self, deltas: Iterator[str], trace: RequestTrace) -> Iterator[str]:
+        """
+        Führt einen Stream unter `trace` aus. Der Trace wird nur um jeden
+        Schritt herum gesetzt, da der Verbraucher zwischen den Deltas
+        beliebigen anderen Code ausführt.
+        """
+        self.instrumentation.on_start(trace)
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                token = current_trace.set(trace)
+                try:
+                    delta = next(deltas)
+                except StopIteration:
+                    return
+                finally:
+                    current_trace.reset(token)
+                yield delta
+        except GeneratorExit:
+            raise
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            token = current_trace.set(trace)
+            try:
+                deltas.close()
+            finally:
+                current_trace.reset(token)
+            self._finish_trace(trace, error)
+
+    async def _atraced_deltas(self, deltas: AsyncIterator[str], trace: RequestTrace) -> AsyncIterator[str]:
+        """Asynchrone Variante von `_traced_deltas`."""
+        self.instrumentation.on_start(trace)
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                token = current_trace.set(trace)
+                try:
+                    delta = await deltas.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    current_trace.reset(token)
+                yield delta
+        except GeneratorExit:
+            raise
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            token = current_trace.set(trace)
+            try:
+                await deltas.aclose()
+            finally:
+                current_trace.reset(token)
+            self._finish_trace(trace, error)
+
+    def set_prefix(
         self,
-        prompt: str,
         *,
-        file_bytes: List[bytes],
-        temperature: Optional[float],
-        max_tokens: Optional[int],
-        stream: bool,
-    ) -> str:
-        opts: Dict[str, Any] = {}
-        if temperature is not None:
-            opts["temperature"] = temperature
-        if max_tokens is not None:
-            opts["num_predict"] = max_tokens
+        system: Optional[str] = None,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        keep_alive: Optional[Union[str, float]] = "30m",
+    ) -> PromptPrefix:
+        """
+        Legt einen statischen Präfix fest, der jeder Anfrage vorangestellt wird
+        (z. B. Anweisungen + Spezifikation), sodass nur die Frage variiert.
 
-        images = file_bytes if file_bytes else None
+        Die Nachrichten werden so geordnet, dass der Präfix immer identisch am
+        Anfang steht: OpenAI bedient ihn dann aus dem automatischen Prompt‑Cache
+        (ab 1024 Tokens), Ollama setzt aus dem einmal tokenisierten Präfix‑
+        Kontext fort und hält das Modell `keep_alive` lang geladen. Wie viel
+        tatsächlich aus dem Cache kam, zeigt `prompt_cache_stats` (bei Ollama
+        nur indirekt, siehe `PromptCacheStats`).
 
-        if stream:
-            chunks = []
-            for part in self.client.generate(
-                model=self.model,
-                prompt=prompt,
-                options=opts,
-                stream=True,
-                images=images,
-            ):
-                chunks.append(part["response"])
-            return "".join(chunks)
+        Präfix‑Dateien müssen Text sein; die Dateien werden hier einmal gelesen.
+        """
+        images, texts = self.ingestor.ingest(files)
+        if images:
+            raise ValueError("Präfix‑Dateien müssen Text sein (keine Bilder).")
+        self.prefix = PromptPrefix(system=system, texts=texts, keep_alive=keep_alive)
+        return self.prefix
 
-        resp = self.client.generate(
-            model=self.model,
-            prompt=prompt,
-            options=opts,
-            images=images,
-        )
-        return resp["response"]
+    def clear_prefix(self) -> None:
+        """Entfernt den statischen Präfix wieder."""
+        self.prefix = None
 
-    def _openai_answer(self, prompt: str) -> str:
-        resp = self.client.ChatCompletion.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return resp.choices[0].message.content
+    @property
+    def prompt_cache_stats(self) -> PromptCacheStats:
+        """Momentaufnahme der vom Backend gemeldeten (gecachten) Prompt‑Tokens."""
+        with self._init_lock:
+            return replace(self._prompt_cache)
 
-    def _gemini_answer(
+    def conversation(self, **options: Any) -> "Conversation":
+        """
+        Startet eine Mehrrunden‑Sitzung auf diesem Handler (Optionen siehe
+        `Conversation`)::
+
+            chat = handler.conversation(system="Antworte knapp.")
+            chat.ask("Wer schrieb den Faust?")
+            chat.ask("Und wann?")
+        """
+        from Conversation import Conversation
+
+        return Conversation(self, **options)
+
+    # --------------------------------------------------------------------------- #
+    # Batch‑Verarbeitung
+    # --------------------------------------------------------------------------- #
+    def get_answers(
         self,
-        prompt: str,
+        prompts: Iterable[str],
         *,
-        file_bytes: List[bytes],
-        temperature: Optional[float],
-        stream: bool,
-    ) -> str:
-        model = self.client.GenerativeModel(self.model, temperature=temperature)
+        max_concurrency: int = 8,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        temperature: Optional[float] = None,
+        length: Optional[int] = None,
+    ) -> List[BatchItem]:
+        """
+        Beantwortet viele Prompts parallel über einen Thread‑Pool.
 
-        parts: List[Any] = [prompt]
+        Parameters
+        ----------
+        prompts : iterable of str
+            Die zu beantwortenden Prompts.
+        max_concurrency : int
+            Maximale Anzahl gleichzeitig laufender Anfragen.
+        files, temperature, length
+            Wie bei `get_answer`; gelten für jeden Prompt.
+
+        Returns
+        -------
+        list of BatchItem
+            Ein Eintrag pro Prompt, in Eingabe‑Reihenfolge.
+        """
+        prompts = list(prompts)
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency muss mindestens 1 sein.")
 
-        for idx, data in enumerate(file_bytes):
-            mime, _ = mimetypes.guess_type(f"file{idx}")
-            if not mime:
-                mime = "application/octet-stream"
-            parts.append({
-                "image": {
-                    "mime_type": mime,
-                    "data": data.decode("latin1"),
-                }
-            })
+        def run(index: int, prompt: str) -> BatchItem:
+            item = BatchItem(index=index, prompt=prompt)
+            start = time.perf_counter()
+            try:
+                item.answer = self.get_answer(
+                    prompt, files=files, temperature=temperature, length=length
+                )
+            except Exception as exc:
+                item.error = exc
+            item.latency = time.perf_counter() - start
+            return item
 
-        response = model.generate_content(parts, stream=stream)
+        if not prompts:
+            return []
+        from concurrent.futures import ThreadPoolExecutor
 
-        if stream:
-            return "".join(part.text for part in response)
-        return response.text
+        workers = min(max_concurrency, len(prompts))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm") as pool:
+            return list(pool.map(run, range(len(prompts)), prompts))
+
+    async def aget_answers(
+        self,
+        prompts: Iterable[str],
+        *,
+        max_concurrency: int = 64,
+        files: Optional[Sequence[Union[str, Path]]] = None,
+        temperature: Optional[float] = None,
+        length: Optional[int] = None,
+    ) -> List[BatchItem]:
+        """
+        Asynchrone Variante von `get_answers`: ein Task pro Prompt, begrenzt
+        durch ein Semaphor statt durch Threads.
+        """
+        import asyncio
+
+        prompts = list(prompts)
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency muss mindestens 1 sein.")
+        limit = asyncio.Semaphore(max_concurrency)
+
+        async def run(index: int, prompt: str) -> BatchItem:
+            item = BatchItem(index=index, prompt=prompt)
+            async with limit:
+                start = time.perf_counter()
+                try:
+                    item.answer = await self.aget_answer(
+                        prompt, files=files, temperature=temperature, length=length
+                    )
+                except Exception as exc:
+                    item.error = exc
+                item.latency = time.perf_counter() - start
+            return item
+
+        return list(await asyncio.gather(*(run(i, p) for i, p in enumerate(prompts))))
+
+    def submit_batch(
+        self,
+        prompts: Iterable[str],
+        *,
+        length: Optional[int] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        workdir: Optional[Union[str, Path]] = None,
+        shard_size: int = 50_000,
+    ) -> "BatchJob":
+        """
+        Reicht viele Prompts über die OpenAI‑Batch‑API ein (nur `openai`).
+
+        Die Prompts werden gestreamt in JSONL‑Dateien geschrieben (je Batch
+        höchstens `shard_size` Anfragen), hochgeladen und gestartet. Das
+        zurückgegebene `BatchJob` wartet mit `wait()` und liefert mit
+        `results()` die `BatchItem`s in Eingabe‑Reihenfolge (siehe `BatchAPI.py`)::
+
+            with handler.submit_batch(prompts) as job:
+                for item in job.results():
+                    print(item.answer)
+        """
+        from BatchAPI import submit
+
+        return submit(
+            self, prompts, length=length, metadata=metadata, workdir=workdir, shard_size=shard_size
+        )
+
+    # --------------------------------------------------------------------------- #
+    # Map‑Reduce für lange Dokumente
+    # --------------------------------------------------------------------------- #
+    def map_reduce_answer(
+        self,
+        prompt: str,
+        *,
+        files: Sequence[Union[str, Path]],
+        chunk_tokens: int = 4000,
+        chunk_overlap: int = 200,
+        max_concurrency: int = 4,
+        reduce_instruction: Optional[str] = None,
+        temperature: Optional[float] = None,
+        length: Optional[int] = None,
+        output_path: Optional[Path] = None,
+    ) -> str:
+        """
+        Beantwortet einen Prompt zu sehr langen Text‑Dateien per Map‑Reduce.
+
+        Die Text‑Dateien werden in Chunks von ca. `chunk_tokens` Tokens
+        (Überlappung `chunk_overlap`) zerlegt; jeder Chunk wird parallel
+        (höchstens `max_concurrency` gleichzeitig) mit dem Prompt beantwortet.
+        Die Teilantworten werden anschließend – bei Bedarf in mehreren Stufen –
+        zu einer Antwort zusammengeführt. Bild‑Dateien gehen in den finalen
+        Reduce‑Aufruf. Jeder Teilaufruf ist ein normaler `get_answer`‑Aufruf
+        und profitiert damit auch vom Antwort‑Cache.
+
+        Parameters
+        ----------
+        reduce_instruction : str | None
+            Eigene Anweisung für den Reduce‑Schritt.
+        Weitere Parameter wie bei `get_answer` bzw. `get_answers`.
+        """
+        images, map_prompts = self._map_prompts(prompt, files, chunk_tokens, chunk_overlap)
+        if not map_prompts:
+            return self.get_answer(
+                prompt, files=images, temperature=temperature, length=length, output_path=output_path
+            )
+
+        partials = _answers_or_raise(self.get_answers(
+            map_prompts, max_concurrency=max_concurrency, temperature=temperature, length=length
+        ))
+        budget = int(chunk_tokens * self.tokens.chars_per_token)
+        groups = _group_partials(partials, budget)
+        while len(groups) > 1:
+            partials = _answers_or_raise(self.get_answers(
+                [_reduce_prompt(prompt, group, reduce_instruction) for group in groups],
+                max_concurrency=max_concurrency,
+                temperature=temperature,
+                length=length,
+            ))
+            groups = _group_partials(partials, budget)
+
+        return self.get_answer(
+            _reduce_prompt(prompt, groups[0], reduce_instruction),
+            files=images,
+            temperature=temperature,
+            length=length,
+            output_path=output_path,
+        )
+
+    async def amap_reduce_answer(
+        self,
+        prompt: str,
+        *,
+        files: Sequence[Union[str, Path]],
+        chunk_tokens: int = 4000,
+        chunk_overlap: int = 200,
+        max_concurrency: int = 16,
+        reduce_instruction: Optional[str] = None,
+        temperature: Optional[float] = None,
+        length: Optional[int] = None,
+        output_path: Optional[Path] = None,
+    ) -> str:
+        """Asynchrone Variante von `map_reduce_answer` (gleiche Parameter)."""
+        import asyncio
+
+        images, map_prompts = await asyncio.to_thread(
+            self._map_prompts, prompt, files, chunk_tokens, chunk_overlap
+        )
+        if not map_prompts:
+            return await self.aget_answer(
+                prompt, files=images, temperature=temperature, length=length, output_path=output_path
+            )
+
+        partials = _answers_or_raise(await self.aget_answers(
+            map_prompts, max_concurrency=max_concurrency, temperature=temperature, length=length
+        ))
+        budget = int(chunk_tokens * self.tokens.chars_per_token)
+        groups = _group_partials(partials, budget)
+        while len(groups) > 1:
+            partials = _answers_or_raise(await self.aget_answers(
+                [_reduce_prompt(prompt, group, reduce_instruction) for group in groups],
+                max_concurrency=max_concurrency,
+                temperature=temperature,
+                length=length,
+            ))
+            groups = _group_partials(partials, budget)
+
+        return await self.aget_answer(
+            _reduce_prompt(prompt, groups[0], reduce_instruction),
+            files=images,
+            temperature=temperature,
+            length=length,
+            output_path=output_path,
+        )
+
+    def _map_prompts(
+        self,
+        prompt: str,
+        files: Sequence[Union[str, Path]],
+        chunk_tokens: int,
+        chunk_overlap: int,
+    ) -> Tuple[List[Union[str, Path]], List[str]]:
+        """Trennt Bilder ab und erzeugt je Text‑Chunk einen Map‑Prompt."""
+        images: List[Union[str, Path]] = []
+        chunks: List[Tuple[str, str]] = []
+        chars_per_token = self.tokens.chars_per_token
+        for fp in files:
+            if is_image(fp):
+                images.append(fp)
+                continue
+            pieces = self.ingestor.iter_text_chunks(fp)
+            for chunk in chunk_text(
+                pieces,
+                chunk_chars=int(chunk_tokens * chars_per_token),
+                overlap_chars=int(min(chunk_overlap, chunk_tokens // 2) * chars_per_token),
+            ):
+                chunks.append((Path(fp).name, chunk))
+        total = len(chunks)
+        map_prompts = [
+            _map_prompt(prompt, chunk, idx, total, name)
+            for idx, (name, chunk) in enumerate(chunks, 1)
+        ]
+        return images, map_prompts
+
+    # --------------------------------------------------------------------------- #
+    # Verteilung auf die Backends
+    # --------------------------------------------------------------------------- #
+    def _answer(
+        self,
+        prompt: str,
+        *,
+        images: List[Attachment],
+        file_texts: List[str],
+        temperature: Optional[float],
+        length: Optional[int],
+        stream: bool,
+    ) -> str:
+        self._throttle(prompt, images, file_texts, length)
+        if self.llm_type == "ollama":
+            answer = self._ollama_answer(
+                prompt,
+                images=images,
+                file_texts=file_texts,
+                temperature=temperature,
+                max_tokens=length,
+                stream=stream,
+            )
+        elif self.llm_type == "openai":
+            answer = self._openai_answer(prompt, images=images, file_texts=file_texts, max_tokens=length)
+        elif self.llm_type == "gemini":
+            answer = self._gemini_answer(
+                prompt,
+                images=images,
+                file_texts=file_texts,
+                temperature=temperature,
+                max_tokens=length,
+                stream=stream,
+            )
+        else:  # pragma: no cover
+            raise RuntimeError("Unreachable")
+        return answer
+
+    async def _answer_async(
+        self,
+        prompt: str,
+        *,
+        images: List[Attachment],
+        file_texts: List[str],
+        temperature: Optional[float],
+        length: Optional[int],
+        stream: bool,
+    ) -> str:
+        await self._athrottle(prompt, images, file_texts, length)
+        if self.llm_type == "ollama":
+            answer = await self._ollama_answer_async(
+                prompt,
+                images=images,
+                file_texts=file_texts,
+                temperature=temperature,
+                max_tokens=length,
+                stream=stream,
+            )
+        elif self.llm_type == "openai":
+            answer = await self._openai_answer_async(
+                prompt, images=images, file_texts=file_texts, max_tokens=length
+            )
+        elif self.llm_type == "gemini":
+            answer = await self._gemini_answer_async(
+                prompt,
+                images=images,
+                file_texts=file_texts,
+                temperature=temperature,
+                max_tokens=length,
+                stream=stream,
+            )
+        else:  # pragma: no cover
+            raise RuntimeError("Unreachable")
+        return answer
+
+    def _plan_length(
+        self,
+        prompt: str,
+        images: List[Attachment],
+        file_texts: List[str],
+        length: Optional[int],
+    ) -> Optional[int]:
+        """
+        Prüft (optional) das Kontext‑Budget und begrenzt `length` auf den
+        verbleibenden Platz – aber nur mit `check_context` oder einem
+        vorgegebenen Kontext‑Fenster (`TokenCounter(context_limit=...)`);
+        sonst wird `length` unverändert weitergereicht, denn das geschätzte
+        Fenster (bei Ollama z. B. 4096) kann deutlich zu klein sein.
+        """
+        if length is not None and length <= 0:
+            length = None
+        clamp = length is not None and (self.check_context or self.tokens.context_limit_given)
+        if not clamp and not self.check_context:
+            return length
+        estimate = self.tokens.estimate(
+            prompt, [*self._prefix_texts(), *file_texts], len(images), max_tokens=length
+        )
+        if self.check_context and not estimate.fits:
+            raise ContextLimitExceeded(
+                f"Die Anfrage belegt ca. {estimate.prompt_tokens} Tokens, das Kontext‑Fenster "
+                f"von '{self.model}' fasst {estimate.context_limit}."
+            )
+        if not clamp or estimate.max_completion_tokens <= 0:
+            return length
+        return estimate.max_completion_tokens
+
+    def _reserve_tokens(
+        self, prompt: str, images: List[Attachment], file_texts: List[str], length: Optional[int]
+    ) -> int:
+        """Token‑Reservierung für den Rate‑Limiter (Eingabe + maximale Ausgabe)."""
+        if not self.rate_limiter.counts_tokens:
+            return 0
+        texts = [*self._prefix_texts(), *file_texts]
+        return self.tokens.count_request(prompt, texts, len(images)) + (length or 0)
+
+    def _throttle(
+        self, prompt: str, images: List[Attachment], file_texts: List[str], length: Optional[int]
+    ) -> None:
+        """Wartet (falls ein Rate‑Limiter gesetzt ist) auf ein freies Kontingent."""
+        if self.rate_limiter is not None:
+            tokens = self._reserve_tokens(prompt, images, file_texts, length)
+            with (current_trace.get() or NULL_TRACE).phase("rate_limit"):
+                self.rate_limiter.acquire(tokens)
+
+    async def _athrottle(
+        self, prompt: str, images: List[Attachment], file_texts: List[str], length: Optional[int]
+    ) -> None:
+        if self.rate_limiter is not None:
+            tokens = self._reserve_tokens(prompt, images, file_texts, length)
+            with (current_trace.get() or NULL_TRACE).phase("rate_limit"):
+                await self.rate_limiter.aacquire(tokens)
+
+    def _cache_key(
+        self,
+        prompt: str,
+        images: List[Attachment],
+        file_texts: List[str],
+        temperature: Optional[float],
+        length: Optional[int],
+    ) -> Optional[str]:
+        """Schlüssel für den Antwort‑Cache – oder `None`, wenn nicht gecacht wird."""
+        if self.cache is None or not self.cache.should_cache(temperature):
+            return None
+        return self.cache.make_key(
+            self.llm_type,
+            self.model,
+            prompt,
+            attachments=[
+                *(self.prefix.key_parts if self.prefix else ()),
+                *file_texts,
+                *(att.digest for att in images),
+            ],
+            temperature=temperature,
+            length=length,
+        )
+
+    # --------------------------------------------------------------------------- #
+    # Unterfunktionen pro Backend
+    # --------------------------------------------------------------------------- #
+    def _ollama_answer(
+        self,
+        prompt: str,
+        *,
+        images: List[Attachment],
+        file_texts: List[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        stream: bool,
+    ) -> str:
+        if stream:
+            return "".join(self._ollama_stream(
+                prompt,
+                images=images,
+                file_texts=file_texts,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                metrics=StreamMetrics(),
+            ))
+
+        resp = self.client.generate(
+            model=self.model,
+            prompt=self._ollama_prompt(prompt, file_texts),
+            options=self._ollama_options(temperature, max_tokens),
+            images=self._ollama_images(images),
+            **self._ollama_prefix_args(self._ollama_prefix_context()),
+        )
+        self._note_ollama_usage(resp)
+        return resp["response"]
+
+    def _openai_answer(
+        self, prompt: str, *, images: List[Attachment], file_texts: List[str], max_tokens: Optional[int]
+    ) -> str:
+        resp = self._openai_create(
+            self.client,
+            model=self.model,
+            messages=self._openai_messages(prompt, file_texts, images),
+            max_tokens=self._openai_max_tokens(max_tokens),
+        )
+        self._note_openai_usage(resp.usage)
+        self._note_finish(resp.choices[0].finish_reason, resp.model)
+        return resp.choices[0].message.content
+
+    def _gemini_answer(
+        self,
+        prompt: str,
+        *,
+        images: List[Attachment],
+        file_texts: List[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        stream: bool,
+    ) -> str:
+        if stream:
+            return "".join(self._gemini_stream(
+                prompt,
+                images=images,
+                file_texts=file_texts,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                metrics=StreamMetrics(),
+            ))
+
+        parts = self._gemini_request_parts(prompt, images, file_texts)
+        response = self.client.generate_content(parts, generation_config=self._gemini_config(temperature, max_tokens))
+        self._note_gemini_usage(getattr(response, "usage_metadata", None))
+        self._note_gemini_finish(response)
+        return response.text
+
+    # --------------------------------------------------------------------------- #
+    # Streaming‑Unterfunktionen pro Backend
+    # --------------------------------------------------------------------------- #
+    def _ollama_stream(
+        self,
+        prompt: str,
+        *,
+        images: List[Attachment],
+        file_texts: List[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        metrics: StreamMetrics,
+    ) -> Iterator[str]:
+        for part in self.client.generate(
+            model=self.model,
+            prompt=self._ollama_prompt(prompt, file_texts),
+            options=self._ollama_options(temperature, max_tokens),
+            stream=True,
+            images=self._ollama_images(images),
+            **self._ollama_prefix_args(self._ollama_prefix_context()),
+        ):
+            if part.get("done"):
+                metrics.completion_tokens = part.get("eval_count")
+                self._note_ollama_usage(part)
+            yield part["response"]
+
+    def _openai_stream(
+        self,
+        prompt: str,
+        *,
+        images: List[Attachment],
+        file_texts: List[str],
+        max_tokens: Optional[int],
+        metrics: StreamMetrics,
+    ) -> Iterator[str]:
+        for chunk in self._openai_create(
+            self.client,
+            model=self.model,
+            messages=self._openai_messages(prompt, file_texts, images),
+            max_tokens=self._openai_max_tokens(max_tokens),
+            stream=True,
+            stream_options={"include_usage": True},
+        ):
+            if chunk.usage is not None:
+                metrics.completion_tokens = chunk.usage.completion_tokens
+                self._note_openai_usage(chunk.usage)
+            if chunk.choices and chunk.choices[0].finish_reason:
+                self._note_finish(chunk.choices[0].finish_reason, chunk.model)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def _gemini_stream(
+        self,
+        prompt: str,
+        *,
+        images: List[Attachment],
+        file_texts: List[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        metrics: StreamMetrics,
+    ) -> Iterator[str]:
+        parts = self._gemini_request_parts(prompt, images, file_texts)
+        usage = last = None
+        for chunk in self.client.generate_content(
+            parts, generation_config=self._gemini_config(temperature, max_tokens), stream=True
+        ):
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            if usage is not None:
+                metrics.completion_tokens = usage.candidates_token_count
+            last = chunk
+            yield chunk.text
+        self._note_gemini_usage(usage)
+        self._note_gemini_finish(last)
+
+    async def _ollama_stream_async(
+        self,
+        prompt: str,
+        *,
+        images: List[Attachment],
+        file_texts: List[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        metrics: StreamMetrics,
+    ) -> AsyncIterator[str]:
+        client = self._get_async_client()
+        async for part in await client.generate(
+            model=self.model,
+            prompt=self._ollama_prompt(prompt, file_texts),
+            options=self._ollama_options(temperature, max_tokens),
+            stream=True,
+            images=self._ollama_images(images),
+            **self._ollama_prefix_args(await self._ollama_prefix_context_async()),
+        ):
+            if part.get("done"):
+                metrics.completion_tokens = part.get("eval_count")
+                self._note_ollama_usage(part)
+            yield part["response"]
+
+    async def _openai_stream_async(
+        self,
+        prompt: str,
+        *,
+        images: List[Attachment],
+        file_texts: List[str],
+        max_tokens: Optional[int],
+        metrics: StreamMetrics,
+    ) -> AsyncIterator[str]:
+        client = self._get_async_client()
+        async for chunk in await self._aopenai_create(
+            client,
+            model=self.model,
+            messages=self._openai_messages(prompt, file_texts, images),
+            max_tokens=self._openai_max_tokens(max_tokens),
+            stream=True,
+            stream_options={"include_usage": True},
+        ):
+            if chunk.usage is not None:
+                metrics.completion_tokens = chunk.usage.completion_tokens
+                self._note_openai_usage(chunk.usage)
+            if chunk.choices and chunk.choices[0].finish_reason:
+                self._note_finish(chunk.choices[0].finish_reason, chunk.model)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def _gemini_stream_async(
+        self,
+        prompt: str,
+        *,
+        images: List[Attachment],
+        file_texts: List[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        metrics: StreamMetrics,
+    ) -> AsyncIterator[str]:
+        parts = self._gemini_request_parts(prompt, images, file_texts)
+        usage = last = None
+        async for chunk in await self._gemini_generate_async(
+            parts, self._gemini_config(temperature, max_tokens), stream=True
+        ):
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            if usage is not None:
+                metrics.completion_tokens = usage.candidates_token_count
+            last = chunk
+            yield chunk.text
+        self._note_gemini_usage(usage)
+        self._note_gemini_finish(last)
+
+    # --------------------------------------------------------------------------- #
+    # Asynchrone Unterfunktionen pro Backend
+    # --------------------------------------------------------------------------- #
+    async def _ollama_answer_async(
+        self,
+        prompt: str,
+        *,
+        images: List[Attachment],
+        file_texts: List[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        stream: bool,
+    ) -> str:
+        if stream:
+            return "".join([delta async for delta in self._ollama_stream_async(
+                prompt,
+                images=images,
+                file_texts=file_texts,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                metrics=StreamMetrics(),
+            )])
+
+        client = self._get_async_client()
+        resp = await client.generate(
+            model=self.model,
+            prompt=self._ollama_prompt(prompt, file_texts),
+            options=self._ollama_options(temperature, max_tokens),
+            images=self._ollama_images(images),
+            **self._ollama_prefix_args(await self._ollama_prefix_context_async()),
+        )
+        self._note_ollama_usage(resp)
+        return resp["response"]
+
+    async def _openai_answer_async(
+        self, prompt: str, *, images: List[Attachment], file_texts: List[str], max_tokens: Optional[int]
+    ) -> str:
+        client = self._get_async_client()
+        resp = await self._aopenai_create(
+            client,
+            model=self.model,
+            messages=self._openai_messages(prompt, file_texts, images),
+            max_tokens=self._openai_max_tokens(max_tokens),
+        )
+        self._note_openai_usage(resp.usage)
+        self._note_finish(resp.choices[0].finish_reason, resp.model)
+        return resp.choices[0].message.content
+
+    async def _gemini_answer_async(
+        self,
+        prompt: str,
+        *,
+        images: List[Attachment],
+        file_texts: List[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        stream: bool,
+    ) -> str:
+        if stream:
+            return "".join([delta async for delta in self._gemini_stream_async(
+                prompt,
+                images=images,
+                file_texts=file_texts,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                metrics=StreamMetrics(),
+            )])
+
+        parts = self._gemini_request_parts(prompt, images, file_texts)
+        response = await self._gemini_generate_async(parts, self._gemini_config(temperature, max_tokens))
+        self._note_gemini_usage(getattr(response, "usage_metadata", None))
+        self._note_gemini_finish(response)
+        return response.text
+
+    # --------------------------------------------------------------------------- #
+    # Mehrrunden‑Gespräche (siehe `Conversation`)
+    # --------------------------------------------------------------------------- #
+    def _turn(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        images: List[Attachment],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        context: Optional[List[int]] = None,
+        keep_alive: Optional[Union[str, float]] = None,
+    ) -> Tuple[str, Optional[List[int]]]:
+        """
+        Eine Gesprächsrunde. `messages` endet mit der neuen Nutzer‑Nachricht.
+        Liefert die Antwort und (nur Ollama) den neuen KV‑Kontext. Ein Präfix
+        (`set_prefix`) geht wie bei `get_answer` vorneweg mit; Token‑Zahlen
+        landen in `prompt_cache_stats` und im Trace.
+        """
+        trace, token = self._begin_trace("turn")
+        try:
+            with trace.phase("call"):
+                result = self._turn_request(
+                    messages,
+                    images=images,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    context=context,
+                    keep_alive=keep_alive,
+                )
+        except BaseException as exc:
+            self._end_trace(trace, token, exc)
+            raise
+        self._end_trace(trace, token)
+        return result
+
+    async def _turn_async(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        images: List[Attachment],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        context: Optional[List[int]] = None,
+        keep_alive: Optional[Union[str, float]] = None,
+    ) -> Tuple[str, Optional[List[int]]]:
+        """Asynchrone Variante von `_turn`."""
+        trace, token = self._begin_trace("aturn")
+        try:
+            with trace.phase("call"):
+                result = await self._turn_request_async(
+                    messages,
+                    images=images,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    context=context,
+                    keep_alive=keep_alive,
+                )
+        except BaseException as exc:
+            self._end_trace(trace, token, exc)
+            raise
+        self._end_trace(trace, token)
+        return result
+
+    def _turn_request(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        images: List[Attachment],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        context: Optional[List[int]],
+        keep_alive: Optional[Union[str, float]],
+    ) -> Tuple[str, Optional[List[int]]]:
+        self._throttle(messages[-1]["content"], images, [m["content"] for m in messages[:-1]], max_tokens)
+        if self.llm_type == "ollama":
+            resp = self.client.generate(**self._ollama_turn_args(
+                messages, images, temperature, max_tokens, context, keep_alive,
+                None if context else self._ollama_prefix_context(),
+            ))
+            self._note_ollama_usage(resp)
+            return resp["response"], resp.get("context")
+        if self.llm_type == "openai":
+            resp = self._openai_create(
+                self.client,
+                model=self.model,
+                messages=self._openai_turn_messages(messages, images),
+                max_tokens=self._openai_max_tokens(max_tokens),
+            )
+            self._note_openai_usage(resp.usage)
+            self._note_finish(resp.choices[0].finish_reason, resp.model)
+            return resp.choices[0].message.content, None
+        response = self.client.generate_content(
+            self._gemini_contents(messages, images),
+            generation_config=self._gemini_config(temperature, max_tokens),
+        )
+        self._note_gemini_usage(getattr(response, "usage_metadata", None))
+        self._note_gemini_finish(response)
+        return response.text, None
+
+    async def _turn_request_async(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        images: List[Attachment],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        context: Optional[List[int]],
+        keep_alive: Optional[Union[str, float]],
+    ) -> Tuple[str, Optional[List[int]]]:
+        await self._athrottle(
+            messages[-1]["content"], images, [m["content"] for m in messages[:-1]], max_tokens
+        )
+        client = self._get_async_client()
+        if self.llm_type == "ollama":
+            resp = await client.generate(**self._ollama_turn_args(
+                messages, images, temperature, max_tokens, context, keep_alive,
+                None if context else await self._ollama_prefix_context_async(),
+            ))
+            self._note_ollama_usage(resp)
+            return resp["response"], resp.get("context")
+        if self.llm_type == "openai":
+            resp = await self._aopenai_create(
+                client,
+                model=self.model,
+                messages=self._openai_turn_messages(messages, images),
+                max_tokens=self._openai_max_tokens(max_tokens),
+            )
+            self._note_openai_usage(resp.usage)
+            self._note_finish(resp.choices[0].finish_reason, resp.model)
+            return resp.choices[0].message.content, None
+        response = await self._gemini_generate_async(
+            self._gemini_contents(messages, images), self._gemini_config(temperature, max_tokens)
+        )
+        self._note_gemini_usage(getattr(response, "usage_metadata", None))
+        self._note_gemini_finish(response)
+        return response.text, None
+
+    def _turn_stream(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        images: List[Attachment],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        metrics: StreamMetrics,
+        turn: Dict[str, Any],
+        context: Optional[List[int]] = None,
+        keep_alive: Optional[Union[str, float]] = None,
+    ) -> Iterator[str]:
+        """
+        Wie `_turn`, liefert die Antwort aber als Deltas. Den neuen KV‑Kontext
+        (nur Ollama) legt es am Ende unter `turn["context"]` ab.
+        """
+        deltas = self._turn_deltas(
+            messages,
+            images=images,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            metrics=metrics,
+            turn=turn,
+            context=context,
+            keep_alive=keep_alive,
+        )
+        if self.instrumentation is not None:
+            deltas = self._traced_deltas(deltas, self._new_trace("turn_stream"))
+        return deltas
+
+    def _turn_stream_async(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        images: List[Attachment],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        metrics: StreamMetrics,
+        turn: Dict[str, Any],
+        context: Optional[List[int]] = None,
+        keep_alive: Optional[Union[str, float]] = None,
+    ) -> AsyncIterator[str]:
+        """Asynchrone Variante von `_turn_stream`."""
+        deltas = self._turn_deltas_async(
+            messages,
+            images=images,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            metrics=metrics,
+            turn=turn,
+            context=context,
+            keep_alive=keep_alive,
+        )
+        if self.instrumentation is not None:
+            deltas = self._atraced_deltas(deltas, self._new_trace("aturn_stream"))
+        return deltas
+
+    def _turn_deltas(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        images: List[Attachment],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        metrics: StreamMetrics,
+        turn: Dict[str, Any],
+        context: Optional[List[int]],
+        keep_alive: Optional[Union[str, float]],
+    ) -> Iterator[str]:
+        self._throttle(messages[-1]["content"], images, [m["content"] for m in messages[:-1]], max_tokens)
+        if self.llm_type == "ollama":
+            for part in self.client.generate(stream=True, **self._ollama_turn_args(
+                messages, images, temperature, max_tokens, context, keep_alive,
+                None if context else self._ollama_prefix_context(),
+            )):
+                if part.get("done"):
+                    metrics.completion_tokens = part.get("eval_count")
+                    turn["context"] = part.get("context")
+                    self._note_ollama_usage(part)
+                yield part["response"]
+        elif self.llm_type == "openai":
+            for chunk in self._openai_create(
+                self.client,
+                model=self.model,
+                messages=self._openai_turn_messages(messages, images),
+                max_tokens=self._openai_max_tokens(max_tokens),
+                stream=True,
+                stream_options={"include_usage": True},
+            ):
+                if chunk.usage is not None:
+                    metrics.completion_tokens = chunk.usage.completion_tokens
+                    self._note_openai_usage(chunk.usage)
+                if chunk.choices and chunk.choices[0].finish_reason:
+                    self._note_finish(chunk.choices[0].finish_reason, chunk.model)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        else:
+            usage = last = None
+            for chunk in self.client.generate_content(
+                self._gemini_contents(messages, images),
+                generation_config=self._gemini_config(temperature, max_tokens),
+                stream=True,
+            ):
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                if usage is not None:
+                    metrics.completion_tokens = usage.candidates_token_count
+                last = chunk
+                yield chunk.text
+            self._note_gemini_usage(usage)
+            self._note_gemini_finish(last)
+
+    async def _turn_deltas_async(
+        self,
+        messages: List[Dict[str, str]],
+        *,
+        images: List[Attachment],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        metrics: StreamMetrics,
+        turn: Dict[str, Any],
+        context: Optional[List[int]],
+        keep_alive: Optional[Union[str, float]],
+    ) -> AsyncIterator[str]:
+        await self._athrottle(
+            messages[-1]["content"], images, [m["content"] for m in messages[:-1]], max_tokens
+        )
+        client = self._get_async_client()
+        if self.llm_type == "ollama":
+            async for part in await client.generate(stream=True, **self._ollama_turn_args(
+                messages, images, temperature, max_tokens, context, keep_alive,
+                None if context else await self._ollama_prefix_context_async(),
+            )):
+                if part.get("done"):
+                    metrics.completion_tokens = part.get("eval_count")
+                    turn["context"] = part.get("context")
+                    self._note_ollama_usage(part)
+                yield part["response"]
+        elif self.llm_type == "openai":
+            async for chunk in await self._aopenai_create(
+                client,
+                model=self.model,
+                messages=self._openai_turn_messages(messages, images),
+                max_tokens=self._openai_max_tokens(max_tokens),
+                stream=True,
+                stream_options={"include_usage": True},
+            ):
+                if chunk.usage is not None:
+                    metrics.completion_tokens = chunk.usage.completion_tokens
+                    self._note_openai_usage(chunk.usage)
+                if chunk.choices and chunk.choices[0].finish_reason:
+                    self._note_finish(chunk.choices[0].finish_reason, chunk.model)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        else:
+            usage = last = None
+            async for chunk in await self._gemini_generate_async(
+                self._gemini_contents(messages, images),
+                self._gemini_config(temperature, max_tokens),
+                stream=True,
+            ):
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                if usage is not None:
+                    metrics.completion_tokens = usage.candidates_token_count
+                last = chunk
+                yield chunk.text
+            self._note_gemini_usage(usage)
+            self._note_gemini_finish(last)
+
+    def _openai_turn_messages(
+        self, messages: List[Dict[str, str]], images: List[Attachment]
+    ) -> List[Dict[str, Any]]:
+        """Stellt den Präfix voran und hängt die Bilder dieser Runde an die letzte Nutzer‑Nachricht."""
+        messages = [*self._prefix_messages(), *messages]
+        if not images:
+            return messages
+        *earlier, last = messages
+        parts = [{"type": "text", "text": last["content"]}, *self._openai_image_parts(images)]
+        return [*earlier, {"role": last["role"], "content": parts}]
+
+    def _ollama_turn_args(
+        self,
+        messages: List[Dict[str, str]],
+        images: List[Attachment],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        context: Optional[List[int]],
+        keep_alive: Optional[Union[str, float]],
+        prefix_context: Optional[List[int]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Mit `context` geht nur die neue Nachricht an den Server, der die
+        bisherigen Runden aus seinem KV‑Cache fortsetzt. Ohne (erste Runde
+        oder nach dem Kürzen) wird der Verlauf einmal als Text übertragen –
+        hinter dem Präfix‑Kontext (`prefix_context`), falls es einen gibt.
+        """
+        args: Dict[str, Any] = {
+            "model": self.model,
+            "options": self._ollama_options(temperature, max_tokens),
+            "images": self._ollama_images(images),
+        }
+        if keep_alive is not None:
+            args["keep_alive"] = keep_alive
+        if context:
+            args["prompt"] = messages[-1]["content"]
+            args["context"] = context
+            return args
+        system = [m["content"] for m in messages if m["role"] == "system"]
+        turns = [m for m in messages if m["role"] != "system"]
+        if system:
+            args["system"] = "\n\n".join(system)
+        if prefix_context:
+            args["context"] = prefix_context
+        if len(turns) == 1:
+            args["prompt"] = turns[0]["content"]
+        else:
+            speaker = {"user": "Nutzer", "assistant": "Assistent"}
+            transcript = [f"{speaker[m['role']]}: {m['content']}" for m in turns]
+            args["prompt"] = "\n\n".join(transcript) + "\n\nAssistent:"
+        return args
+
+    def _gemini_contents(self, messages: List[Dict[str, str]], images: List[Attachment]) -> List[Dict[str, Any]]:
+        """Verlauf im Gemini‑Format (`model` statt `assistant`, Präfix und System vorne an)."""
+        messages = [*self._prefix_messages(), *messages]
+        system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+        turns = [m for m in messages if m["role"] != "system"]
+        contents: List[Dict[str, Any]] = []
+        for idx, message in enumerate(turns):
+            text = message["content"]
+            if idx == 0 and system:
+                text = f"{system}\n\n{text}"
+            if idx == len(turns) - 1:
+                parts = self._gemini_parts(text, images)
+            else:
+                parts = [text]
+            role = "model" if message["role"] == "assistant" else "user"
+            contents.append({"role": role, "parts": parts})
+        return contents
+
+    # --------------------------------------------------------------------------- #
+    # Gemeinsame Helfer (sync & async)
+    # --------------------------------------------------------------------------- #
+    @staticmethod
+    def _ollama_options(temperature: Optional[float], max_tokens: Optional[int]) -> Dict[str, Any]:
+        opts: Dict[str, Any] = {}
+        if temperature is not None:
+            opts["temperature"] = temperature
+        if max_tokens is not None:
+            opts["num_predict"] = max_tokens
+        return opts
+
+    @staticmethod
+    def _ollama_prompt(prompt: str, file_texts: List[str]) -> str:
+        # `generate` kennt nur einen Prompt: Datei‑Texte davor, wie in `Conversation`
+        return "\n\n".join([*file_texts, prompt]) if file_texts else prompt
+
+    def _openai_messages(
+        self, prompt: str, file_texts: List[str], images: Sequence[Attachment] = ()
+    ) -> List[Dict[str, Any]]:
+        """
+        Baut die Nachrichten für OpenAI. Datei‑Texte werden als eigene
+        Content‑Parts vor den Prompt gestellt, statt alles zu einem großen
+        String zusammenzukleben (spart eine vollständige Kopie der Eingaben).
+        Bilder folgen als `image_url` mit dem einmal berechneten Base64.
+
+        Ein statischer Präfix steht unverändert vorne (System‑Nachricht, dann
+        seine Texte), damit OpenAIs Prompt‑Cache über Anfragen hinweg trifft.
+        """
+        messages: List[Dict[str, Any]] = []
+        texts = file_texts
+        if self.prefix is not None:
+            if self.prefix.system:
+                messages.append({"role": "system", "content": self.prefix.system})
+            texts = [*self.prefix.texts, *file_texts]
+        if not texts and not images:
+            messages.append({"role": "user", "content": prompt})
+            return messages
+        parts = [{"type": "text", "text": text} for text in texts]
+        parts.extend(self._openai_image_parts(images))
+        parts.append({"type": "text", "text": prompt})
+        messages.append({"role": "user", "content": parts})
+        return messages
+
+    @staticmethod
+    def _openai_image_parts(images: Sequence[Attachment]) -> List[Dict[str, Any]]:
+        return [{"type": "image_url", "image_url": {"url": att.data_url}} for att in images]
+
+    @staticmethod
+    def _ollama_images(images: List[Attachment]) -> Optional[List[bytes]]:
+        # Rohe Bytes: der Client kodiert sie genau einmal. Ein fertiger
+        # Base64‑String würde dort zur Prüfung vollständig dekodiert.
+        return [att.data for att in images] or None
+
+    # ----- Statischer Präfix & Prompt‑Cache ------------------------------------
+    def _prefix_texts(self) -> List[str]:
+        if self.prefix is None:
+            return []
+        return [self.prefix.system, *self.prefix.texts] if self.prefix.system else self.prefix.texts
+
+    def _prefix_messages(self) -> List[Dict[str, str]]:
+        """Der Präfix als führende System‑Nachricht einer Gesprächsrunde (OpenAI, Gemini)."""
+        texts = self._prefix_texts()
+        return [{"role": "system", "content": "\n\n".join(texts)}] if texts else []
+
+    def _ollama_prefix_request(self) -> Dict[str, Any]:
+        """Einmalige Anfrage, die den Präfix tokenisiert und im KV‑Cache ablegt."""
+        assert self.prefix is not None
+        args: Dict[str, Any] = {
+            "model": self.model,
+            "prompt": "\n\n".join(self.prefix.texts),
+            "options": {"num_predict": 1},
+            "keep_alive": self.prefix.keep_alive,
+        }
+        if self.prefix.system:
+            args["system"] = self.prefix.system
+        return args
+
+    def _ollama_prefix_context(self) -> Optional[List[int]]:
+        prefix = self.prefix
+        if prefix is None or prefix.context is not None:
+            return prefix.context if prefix else None
+        with self._prefix_lock:
+            if prefix.context is None:
+                prefix.context = self._prefix_context(self.client.generate(**self._ollama_prefix_request()))
+        return prefix.context
+
+    async def _ollama_prefix_context_async(self) -> Optional[List[int]]:
+        prefix = self.prefix
+        if prefix is None or prefix.context is not None:
+            return prefix.context if prefix else None
+        # gleichzeitige Anfragen warten auf dieselbe Vorab‑Anfrage
+        async with self._async_prefix_lock():
+            if prefix.context is None:
+                resp = await self._get_async_client().generate(**self._ollama_prefix_request())
+                prefix.context = self._prefix_context(resp)
+        return prefix.context
+
+    def _async_prefix_lock(self) -> Any:
+        """`asyncio.Lock` für die Präfix‑Anfrage – je Event‑Loop eine eigene."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self._init_lock:
+            if self._prefix_alock is None or self._prefix_alock[0] is not loop:
+                self._prefix_alock = (loop, asyncio.Lock())
+            return self._prefix_alock[1]
+
+    @staticmethod
+    def _prefix_context(resp: Any) -> Optional[List[int]]:
+        # Der Kontext endet mit dem einen erzeugten Token (`num_predict: 1`);
+        # ohne ihn setzen spätere Anfragen direkt hinter dem Präfix fort.
+        context = resp.get("context")
+        generated = resp.get("eval_count") or 0
+        if context and generated:
+            context = context[:-generated]
+        return context
+
+    def _ollama_prefix_args(self, context: Optional[List[int]]) -> Dict[str, Any]:
+        """Setzt eine Anfrage auf dem Präfix‑Kontext fort (Modell bleibt geladen)."""
+        if self.prefix is None:
+            return {}
+        args: Dict[str, Any] = {"keep_alive": self.prefix.keep_alive}
+        if context:
+            args["context"] = context
+        return args
+
+    def _note_usage(
+        self,
+        prompt_tokens: Optional[int],
+        completion_tokens: Optional[int],
+        cached_tokens: Optional[int],
+    ) -> None:
+        """Verbucht Token‑Zahlen im Prompt‑Cache‑Zähler und im laufenden Trace."""
+        if prompt_tokens is not None:
+            with self._init_lock:
+                self._prompt_cache.requests += 1
+                self._prompt_cache.prompt_tokens += prompt_tokens
+                self._prompt_cache.cached_tokens += cached_tokens or 0
+        trace = current_trace.get()
+        if trace is not None:
+            trace.add_usage(prompt_tokens, completion_tokens, cached_tokens)
+
+    @staticmethod
+    def _note_finish(finish_reason: Any, model: Optional[str] = None) -> None:
+        """Hält Abbruchgrund und tatsächlich genutztes Modell im Trace fest."""
+        trace = current_trace.get()
+        if trace is None or finish_reason is None:
+            return
+        trace.finish_reason = getattr(finish_reason, "name", None) or str(finish_reason)
+        if model:
+            trace.response_model = model
+
+    def _note_gemini_finish(self, response: Any) -> None:
+        candidates = getattr(response, "candidates", None)
+        if candidates:
+            self._note_finish(candidates[0].finish_reason, getattr(response, "model_version", None))
+
+    def _note_openai_usage(self, usage: Any) -> None:
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        self._note_usage(
+            usage.prompt_tokens,
+            getattr(usage, "completion_tokens", None),
+            getattr(details, "cached_tokens", 0),
+        )
+
+    def _note_ollama_usage(self, resp: Any) -> None:
+        self._note_finish(resp.get("done_reason"), resp.get("model"))
+        # Nur, was der Server meldet: neu ausgewertete Prompt‑Tokens. Ob der
+        # Präfix aus dem KV‑Cache kam, sagt Ollama nicht (siehe `PromptCacheStats`).
+        evaluated = resp.get("prompt_eval_count")
+        if evaluated is None:
+            return
+        self._note_usage(evaluated, resp.get("eval_count"), None)
+        trace = current_trace.get()
+        if trace is not None:
+            # Server‑Zeiten in ns → s
+            for key, name in _OLLAMA_TIMINGS:
+                value = resp.get(key)
+                if value:
+                    trace.server[name] = trace.server.get(name, 0.0) + value / 1e9
+
+    def _note_gemini_usage(self, usage: Any) -> None:
+        if usage is None:
+            return
+        self._note_usage(
+            getattr(usage, "prompt_token_count", None),
+            getattr(usage, "candidates_token_count", None),
+            getattr(usage, "cached_content_token_count", 0),
+        )
+
+    def _openai_create(self, client: Any, **kwargs: Any) -> Any:
+        """
+        `chat.completions.create`; mit Rate‑Limiter über `with_raw_response`,
+        um die `x-ratelimit-*`‑Header auszuwerten. Ein 429 pausiert den
+        Limiter; danach wird die Anfrage über ihn erneut eingereiht (ihre
+        Tokens sind schon gebucht) – bis zu `_RATE_LIMIT_ATTEMPTS` Versuche.
+        """
+        if self.rate_limiter is None:
+            return client.chat.completions.create(**kwargs)
+        for attempt in range(1, _RATE_LIMIT_ATTEMPTS + 1):
+            try:
+                raw = client.chat.completions.with_raw_response.create(**kwargs)
+                break
+            except self._lib.RateLimitError as exc:
+                if not self._requeue_after(exc, attempt):
+                    raise
+            with (current_trace.get() or NULL_TRACE).phase("rate_limit"):
+                self.rate_limiter.acquire()
+        self.rate_limiter.update_from_headers(raw.headers)
+        return raw.parse()
+
+    async def _aopenai_create(self, client: Any, **kwargs: Any) -> Any:
+        """Asynchrone Variante von `_openai_create`."""
+        if self.rate_limiter is None:
+            return await client.chat.completions.create(**kwargs)
+        for attempt in range(1, _RATE_LIMIT_ATTEMPTS + 1):
+            try:
+                raw = await client.chat.completions.with_raw_response.create(**kwargs)
+                break
+            except self._lib.RateLimitError as exc:
+                if not self._requeue_after(exc, attempt):
+                    raise
+            with (current_trace.get() or NULL_TRACE).phase("rate_limit"):
+                await self.rate_limiter.aacquire()
+        self.rate_limiter.update_from_headers(raw.headers)
+        # `with_raw_response` liefert auch asynchron eine `LegacyAPIResponse` (sync `parse`)
+        return raw.parse()
+
+    def _requeue_after(self, exc: Any, attempt: int) -> bool:
+        """
+        Meldet ein 429 an den Limiter; `True`, wenn erneut eingereiht werden
+        soll. Ein erschöpftes Kontingent (`insufficient_quota`) wartet man
+        nicht aus.
+        """
+        self.rate_limiter.penalize(headers=exc.response.headers)
+        return attempt < _RATE_LIMIT_ATTEMPTS and getattr(exc, "code", None) != "insufficient_quota"
+
+    def _openai_max_tokens(self, max_tokens: Optional[int]) -> Any:
+        return max_tokens if max_tokens is not None else self._import_backend().NOT_GIVEN
+
+    @staticmethod
+    def _gemini_config(temperature: Optional[float], max_tokens: Optional[int]) -> Optional[Dict[str, Any]]:
+        config: Dict[str, Any] = {}
+        if temperature is not None:
+            config["temperature"] = temperature
+        if max_tokens is not None:
+            config["max_output_tokens"] = max_tokens
+        return config or None
+
+    async def _gemini_generate_async(
+        self, contents: Any, generation_config: Optional[Dict[str, Any]], *, stream: bool = False
+    ) -> Any:
+        """
+        `generate_content_async` – mit eigenem `host` (REST) gibt es keinen
+        echten Async‑Transport; dann laufen Aufruf und Stream in Threads,
+        damit der Event‑Loop nicht blockiert.
+        """
+        model = self._get_async_client()
+        if not self.host:
+            return await model.generate_content_async(contents, generation_config=generation_config, stream=stream)
+        import asyncio
+
+        response = await asyncio.to_thread(
+            model.generate_content, contents, generation_config=generation_config, stream=stream
+        )
+        return _athreaded(response) if stream else response
+
+    def _gemini_request_parts(
+        self, prompt: str, images: List[Attachment], file_texts: List[str]
+    ) -> List[Any]:
+        """
+        Wie `_gemini_parts`, mit dem statischen Präfix unverändert vorne und
+        den Datei‑Texten als eigene Text‑Parts davor (wie bei OpenAI).
+        """
+        parts = [*file_texts, *self._gemini_parts(prompt, images)]
+        if self.prefix is None:
+            return parts
+        head = [self.prefix.system] if self.prefix.system else []
+        return [*head, *self.prefix.texts, *parts]
+
+    @staticmethod
+    def _gemini_parts(prompt: str, images: List[Attachment]) -> List[Any]:
+        # Blob‑Parts mit den unveränderten Bytes und dem MIME‑Typ der Datei
+        parts: List[Any] = [prompt]
+        parts.extend({"mime_type": att.mime, "data": att.data} for att in images)
+        return parts
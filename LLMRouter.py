@@ -0,0 +1,369 @@
+# LLMRouter.py
+"""
+Lastverteilung über mehrere **LLMHandler** (z. B. mehrere Ollama‑Rechner
+plus OpenAI/Gemini als Überlauf).
+
+Jede Anfrage geht an den gesunden Endpunkt mit der geringsten erwarteten
+Wartezeit – geschätzt aus der EWMA‑Latenz und der Anzahl laufender
+Anfragen. Gleichstände (etwa solange noch keine Latenz gemessen ist)
+entscheidet die Zahl laufender Anfragen, danach geht es reihum. Dabei gilt:
+
+* **Obergrenzen** je Endpunkt (`max_concurrency`); sind alle Endpunkte einer
+  Stufe voll, läuft die Anfrage auf die nächste `priority`‑Stufe über oder
+  wartet auf einen freien Platz.
+* **Failover**: Fehler und Zeitüberschreitungen führen zum nächsten
+  Endpunkt; nach `failure_threshold` Fehlern in Folge pausiert ein Endpunkt
+  für `cooldown` Sekunden und wird danach wieder probiert.
+* Fehler der Anfrage selbst (`ContextLimitExceeded`, `InputBudgetExceeded`)
+  werden nicht wiederholt – sie schlagen überall gleich fehl. Andere
+  Fehler, auch unlesbare Antworten (`JSONDecodeError` u. Ä.), zählen
+  gegen den Endpunkt.
+
+Beispiel::
+
+    router = LLMRouter([
+        Endpoint(LLMHandler("ollama", host="http://gpu1:11434"), max_concurrency=4),
+        Endpoint(LLMHandler("ollama", host="http://gpu2:11434"), max_concurrency=4),
+        Endpoint(LLMHandler("openai"), priority=1, max_concurrency=32),
+    ])
+    router.get_answer("Was ist 2+2?")
+    print(router.stats())
+"""
+
+# --------------------------------------------------------------------------- #
+# IMPORTS
+# --------------------------------------------------------------------------- #
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Sequence
+
+from FileIngestor import InputBudgetExceeded
+from TokenCounter import ContextLimitExceeded
+
+if TYPE_CHECKING:
+    from LLMHandler import LLMHandler
+
+# Vorab‑Prüfungen des Handlers: liegen an der Anfrage, nicht am Endpunkt
+_REQUEST_ERRORS = (ContextLimitExceeded, InputBudgetExceeded)
+
+# --------------------------------------------------------------------------- #
+# Fehler & Statistik
+# --------------------------------------------------------------------------- #
+class NoHealthyEndpoint(RuntimeError):
+    """Alle Endpunkte sind ausgefallen oder pausieren."""
+
+@dataclass
+class EndpointStats:
+    """Momentaufnahme eines Endpunkts."""
+    name: str
+    priority: int
+    in_flight: int
+    max_concurrency: int
+    ewma_latency: Optional[float]
+    requests: int
+    errors: int
+    healthy: bool
+
+# --------------------------------------------------------------------------- #
+# Endpunkt
+# --------------------------------------------------------------------------- #
+class Endpoint:
+    """
+    Ein Handler samt Obergrenze und Priorität im Router.
+
+    Parameters
+    ----------
+    handler : LLMHandler
+        Der Handler (Backend + Host/Modell) dieses Endpunkts.
+    name : str | None
+        Anzeigename; Standard ist `llm_type:host` bzw. `llm_type:model`.
+    max_concurrency : int
+        Höchstzahl gleichzeitig laufender Anfragen auf diesem Endpunkt.
+    priority : int
+        Stufe (0 = bevorzugt); höhere Stufen dienen als Überlauf.
+    """
+
+    def __init__(
+        self,
+        handler: "LLMHandler",
+        *,
+        name: Optional[str] = None,
+        max_concurrency: int = 8,
+        priority: int = 0,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency muss mindestens 1 sein.")
+        self.handler = handler
+        self.name = name or f"{handler.llm_type}:{getattr(handler, 'host', None) or handler.model}"
+        self.max_concurrency = max_concurrency
+        self.priority = priority
+
+        self.in_flight = 0
+        self.ewma_latency: Optional[float] = None
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.down_until = 0.0
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.down_until
+
+    def expected_wait(self) -> float:
+        """Erwartete Dauer einer weiteren Anfrage (unbekannte Latenz = 0 → wird probiert)."""
+        return (self.in_flight + 1) * (self.ewma_latency or 0.0)
+
+    def stats(self, now: float) -> EndpointStats:
+        return EndpointStats(
+            name=self.name,
+            priority=self.priority,
+            in_flight=self.in_flight,
+            max_concurrency=self.max_concurrency,
+            ewma_latency=self.ewma_latency,
+            requests=self.requests,
+            errors=self.errors,
+            healthy=self.healthy(now),
+        )
+
+# --------------------------------------------------------------------------- #
+# Router
+# --------------------------------------------------------------------------- #
+class LLMRouter:
+    """
+    Verteilt Anfragen auf mehrere Endpunkte (thread‑ und asyncio‑tauglich).
+
+    Parameters
+    ----------
+    endpoints : sequence of Endpoint | LLMHandler
+        Die Endpunkte; nackte Handler erhalten Standard‑Einstellungen.
+    alpha : float
+        Glättungsfaktor der EWMA‑Latenz (0 < alpha ≤ 1).
+    failure_threshold : int
+        Fehler in Folge, nach denen ein Endpunkt pausiert.
+    cooldown : float
+        Pause eines ausgefallenen Endpunkts in Sekunden.
+    max_attempts : int | None
+        Höchstzahl Versuche pro Anfrage (Standard: Anzahl der Endpunkte).
+    timeout : float | None
+        Zeitlimit pro Versuch in Sekunden (nur asynchron; synchron gilt das
+        Timeout des jeweiligen Clients).
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[Any],
+        *,
+        alpha: float = 0.3,
+        failure_threshold: int = 2,
+        cooldown: float = 30.0,
+        max_attempts: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        if not endpoints:
+            raise ValueError("Der Router braucht mindestens einen Endpunkt.")
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha muss in (0, 1] liegen.")
+        self.endpoints = [e if isinstance(e, Endpoint) else Endpoint(e) for e in endpoints]
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_attempts = max_attempts or len(self.endpoints)
+        self.timeout = timeout
+
+        self._rotation = 0   # Startpunkt der Suche, damit Gleichstände reihum gehen
+        self._cond = threading.Condition()
+        self._async_waiters: List[Any] = []   # (loop, future) wartender Coroutinen
+
+    @classmethod
+    def from_ollama_hosts(
+        cls,
+        hosts: Sequence[str],
+        *,
+        model: Optional[str] = None,
+        max_concurrency: int = 4,
+        handler_options: Optional[dict] = None,
+        **router_options: Any,
+    ) -> "LLMRouter":
+        """Router über mehrere Ollama‑Rechner mit demselben Modell."""
+        from LLMHandler import LLMHandler
+
+        return cls(
+            [
+                Endpoint(
+                    LLMHandler("ollama", model=model, host=host, **(handler_options or {})),
+                    max_concurrency=max_concurrency,
+                )
+                for host in hosts
+            ],
+            **router_options,
+        )
+
+    # --------------------------------------------------------------------------- #
+    # Interface
+    # --------------------------------------------------------------------------- #
+    def get_answer(self, prompt: str, **options: Any) -> str:
+        """Wie `LLMHandler.get_answer`, aber mit Lastverteilung und Failover."""
+        return self.call(lambda handler: handler.get_answer(prompt, **options))
+
+    async def aget_answer(self, prompt: str, **options: Any) -> str:
+        """Asynchrone Variante von `get_answer`."""
+        return await self.acall(lambda handler: handler.aget_answer(prompt, **options))
+
+    def call(self, fn: Callable[["LLMHandler"], Any]) -> Any:
+        """Führt `fn(handler)` auf dem besten Endpunkt aus (mit Failover)."""
+        tried: List[Endpoint] = []
+        last_exc: Optional[BaseException] = None
+        for _ in range(self.max_attempts):
+            endpoint = self._acquire(tried)
+            if endpoint is None:
+                break
+            tried.append(endpoint)
+            started = time.perf_counter()
+            try:
+                result = fn(endpoint.handler)
+            except _REQUEST_ERRORS:
+                self._release(endpoint, None)
+                raise
+            except Exception as exc:
+                self._release(endpoint, None, failed=True)
+                last_exc = exc
+                continue
+            except BaseException:   # z. B. KeyboardInterrupt
+                self._release(endpoint, None)
+                raise
+            self._release(endpoint, time.perf_counter() - started)
+            return result
+        raise self._exhausted(last_exc)
+
+    async def acall(self, fn: Callable[["LLMHandler"], Any]) -> Any:
+        """Asynchrone Variante von `call`; `fn` liefert ein Awaitable."""
+        import asyncio
+
+        tried: List[Endpoint] = []
+        last_exc: Optional[BaseException] = None
+        for _ in range(self.max_attempts):
+            endpoint = await self._aacquire(tried)
+            if endpoint is None:
+                break
+            tried.append(endpoint)
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(fn(endpoint.handler), self.timeout)
+            except _REQUEST_ERRORS:
+                self._release(endpoint, None)
+                raise
+            except Exception as exc:   # inkl. asyncio.TimeoutError
+                self._release(endpoint, None, failed=True)
+                last_exc = exc
+                continue
+            except BaseException:   # inkl. asyncio.CancelledError
+                self._release(endpoint, None)
+                raise
+            self._release(endpoint, time.perf_counter() - started)
+            return result
+        raise self._exhausted(last_exc)
+
+    def stats(self) -> List[EndpointStats]:
+        """Momentaufnahme aller Endpunkte."""
+        now = time.monotonic()
+        with self._cond:
+            return [endpoint.stats(now) for endpoint in self.endpoints]
+
+    def close(self) -> None:
+        """Schließt die Clients aller Endpunkte."""
+        for endpoint in self.endpoints:
+            endpoint.handler.close()
+
+    async def aclose(self) -> None:
+        for endpoint in self.endpoints:
+            await endpoint.handler.aclose()
+        self.close()
+
+    # --------------------------------------------------------------------------- #
+    # Auswahl
+    # --------------------------------------------------------------------------- #
+    def _pick(self, tried: List[Endpoint]) -> Optional[Endpoint]:
+        """
+        Wählt unter gesunden, freien und noch nicht probierten Endpunkten
+        den der niedrigsten Stufe mit der kleinsten erwarteten Wartezeit, bei
+        Gleichstand den mit weniger laufenden Anfragen. Die Suche beginnt bei
+        jedem Aufruf einen Endpunkt später, sodass verbleibende Gleichstände
+        reihum verteilt werden. Aufruf nur unter `self._cond`.
+        """
+        now = time.monotonic()
+        count = len(self.endpoints)
+        start, self._rotation = self._rotation, (self._rotation + 1) % count
+        best: Optional[Endpoint] = None
+        best_key: Any = None
+        for offset in range(count):
+            endpoint = self.endpoints[(start + offset) % count]
+            if endpoint in tried or not endpoint.healthy(now):
+                continue
+            if endpoint.in_flight >= endpoint.max_concurrency:
+                continue
+            key = (endpoint.priority, endpoint.expected_wait(), endpoint.in_flight)
+            if best is None or key < best_key:
+                best, best_key = endpoint, key
+        if best is not None:
+            best.in_flight += 1
+            best.requests += 1
+        return best
+
+    def _candidates_left(self, tried: List[Endpoint]) -> bool:
+        now = time.monotonic()
+        return any(e not in tried and e.healthy(now) for e in self.endpoints)
+
+    def _acquire(self, tried: List[Endpoint]) -> Optional[Endpoint]:
+        with self._cond:
+            while True:
+                endpoint = self._pick(tried)
+                if endpoint is not None or not self._candidates_left(tried):
+                    return endpoint
+                # alle Kandidaten voll → auf einen freien Platz warten
+                self._cond.wait(timeout=1.0)
+
+    async def _aacquire(self, tried: List[Endpoint]) -> Optional[Endpoint]:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                endpoint = self._pick(tried)
+                if endpoint is not None or not self._candidates_left(tried):
+                    return endpoint
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            try:
+                await asyncio.wait_for(waiter, 1.0)
+            except asyncio.TimeoutError:
+                pass
+
+    def _release(self, endpoint: Endpoint, latency: Optional[float], *, failed: bool = False) -> None:
+        with self._cond:
+            endpoint.in_flight -= 1
+            if latency is not None:
+                if endpoint.ewma_latency is None:
+                    endpoint.ewma_latency = latency
+                else:
+                    endpoint.ewma_latency += self.alpha * (latency - endpoint.ewma_latency)
+                endpoint.consecutive_errors = 0
+            if failed:
+                endpoint.errors += 1
+                endpoint.consecutive_errors += 1
+                if endpoint.consecutive_errors >= self.failure_threshold:
+                    endpoint.down_until = time.monotonic() + self.cooldown
+                    endpoint.consecutive_errors = 0
+            self._cond.notify()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_resolve, waiter)
+
+    def _exhausted(self, last_exc: Optional[BaseException]) -> BaseException:
+        if last_exc is not None:
+            return last_exc
+        return NoHealthyEndpoint("Kein gesunder Endpunkt verfügbar.")
+
+
+def _resolve(waiter: Any) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
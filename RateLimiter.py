@@ -0,0 +1,210 @@
+# RateLimiter.py
+"""
+Client‑seitige Ratenbegrenzung für den **LLMHandler**.
+
+Statt Anfragen abzufeuern und nach einem 429 in Retry‑Schleifen zu laufen,
+reiht der `RateLimiter` sie vorab ein: je ein Token‑Bucket für Anfragen
+pro Minute (RPM) und Tokens pro Minute (TPM). Ein Bucket darf ins Minus
+gehen – jede Reservierung bekommt damit einen festen Platz in der
+Warteschlange, und der Durchsatz pendelt sich beim Provider‑Limit ein.
+
+* thread‑ und asyncio‑tauglich (eine Instanz für alle Handler eines Kontos),
+* lernt Limits und Restkontingente aus `x-ratelimit-*`‑Antwort‑Headern
+  (darüber werden auch zu knapp geschätzte Tokens nachträglich abgeglichen),
+* pausiert nach einem 429 für die gemeldete `retry-after`‑Dauer.
+
+Beispiel::
+
+    limiter = RateLimiter(requests_per_minute=500, tokens_per_minute=200_000)
+    handler = LLMHandler("openai", rate_limiter=limiter)
+    handler.get_answers(prompts, max_concurrency=64)   # bleibt unter dem Limit
+"""
+
+# --------------------------------------------------------------------------- #
+# IMPORTS
+# --------------------------------------------------------------------------- #
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+# "6m0s", "1.5s", "20ms", "2h" → Sekunden
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Wandelt OpenAI‑Dauern (`6m0s`, `20ms`) oder Sekunden‑Zahlen in Sekunden."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _UNIT_SECONDS[unit] for amount, unit in parts)
+
+# --------------------------------------------------------------------------- #
+# Token‑Bucket
+# --------------------------------------------------------------------------- #
+class TokenBucket:
+    """
+    Bucket mit `capacity` Einheiten, der in `period` Sekunden voll nachläuft.
+    Nicht selbst synchronisiert – der `RateLimiter` hält die Sperre.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.period = period
+        self.level = float(capacity)
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Bucht `amount` (ggf. ins Minus) und liefert die nötige Wartezeit."""
+        self._refill(now)
+        # größer als der ganze Bucket → auf volle Kapazität begrenzen, sonst nie erfüllbar
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+    def observe(self, limit: Optional[float], remaining: Optional[float], now: float) -> None:
+        """Übernimmt Limit und Restkontingent aus den Antwort‑Headern."""
+        self._refill(now)
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            self.level = min(self.level, float(remaining))
+
+@dataclass
+class RateLimitStats:
+    """Zähler eines `RateLimiter`."""
+    requests: int = 0
+    tokens: int = 0
+    waits: int = 0
+    waited_seconds: float = 0.0
+    throttled: int = 0   # beobachtete 429‑Antworten
+
+# --------------------------------------------------------------------------- #
+# Limiter
+# --------------------------------------------------------------------------- #
+class RateLimiter:
+    """
+    RPM‑ und TPM‑Begrenzung, geteilt über Threads und Tasks.
+
+    Parameters
+    ----------
+    requests_per_minute : float | None
+        Startwert für das Anfrage‑Limit (`None` = unbegrenzt, bis Header
+        ein Limit melden).
+    tokens_per_minute : float | None
+        Startwert für das Token‑Limit (wie oben).
+    learn_from_headers : bool
+        Limits aus `x-ratelimit-*`‑Headern übernehmen (OpenAI u. a.).
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        learn_from_headers: bool = True,
+    ):
+        self.learn_from_headers = learn_from_headers
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = RateLimitStats()
+
+    @property
+    def counts_tokens(self) -> bool:
+        """Ob Reservierungen eine Token‑Schätzung brauchen."""
+        return self._tokens is not None or self.learn_from_headers
+
+    @property
+    def stats(self) -> RateLimitStats:
+        with self._lock:
+            return RateLimitStats(**vars(self._stats))
+
+    # --------------------------------------------------------------------------- #
+    # Reservieren
+    # --------------------------------------------------------------------------- #
+    def _reserve(self, tokens: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            wait = max(0.0, self._paused_until - now)
+            if self._requests is not None:
+                wait = max(wait, self._requests.reserve(1, now))
+            if self._tokens is not None and tokens:
+                wait = max(wait, self._tokens.reserve(tokens, now))
+            self._stats.requests += 1
+            self._stats.tokens += tokens
+            if wait > 0:
+                self._stats.waits += 1
+                self._stats.waited_seconds += wait
+            return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Reserviert eine Anfrage mit `tokens` Tokens und wartet ggf. (blockierend)."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """Asynchrone Variante von `acquire` (blockiert den Event‑Loop nicht)."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            import asyncio
+
+            await asyncio.sleep(wait)
+
+    # --------------------------------------------------------------------------- #
+    # Rückmeldungen
+    # --------------------------------------------------------------------------- #
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Übernimmt `x-ratelimit-{limit,remaining}-{requests,tokens}`."""
+        if not self.learn_from_headers:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for kind in ("requests", "tokens"):
+                limit = _number(headers.get(f"x-ratelimit-limit-{kind}"))
+                remaining = _number(headers.get(f"x-ratelimit-remaining-{kind}"))
+                if limit is None and remaining is None:
+                    continue
+                bucket = self._requests if kind == "requests" else self._tokens
+                if bucket is None:
+                    if not limit:
+                        continue
+                    bucket = TokenBucket(limit)
+                    if kind == "requests":
+                        self._requests = bucket
+                    else:
+                        self._tokens = bucket
+                bucket.observe(limit, remaining, now)
+
+    def penalize(self, retry_after: Optional[float] = None, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Nach einem 429: alle Reservierungen bis `retry_after` Sekunden anhalten."""
+        if retry_after is None and headers is not None:
+            retry_ms = _number(headers.get("retry-after-ms"))
+            retry_after = retry_ms / 1000 if retry_ms is not None else parse_duration(headers.get("retry-after"))
+        now = time.monotonic()
+        with self._lock:
+            self._stats.throttled += 1
+            self._paused_until = max(self._paused_until, now + (retry_after or 1.0))
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
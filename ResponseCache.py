@@ -0,0 +1,291 @@
+# ResponseCache.py
+"""
+Inhalts‑adressierter Antwort‑Cache für den **LLMHandler**.
+
+Der Schlüssel ist ein SHA‑256 über (llm_type, Modell, Prompt, Datei‑Inhalte,
+Temperatur, Länge). Es gibt zwei Stufen:
+
+* einen In‑Memory‑LRU (schnell, prozess‑lokal) und
+* optional eine SQLite‑Datei auf der Platte mit TTL und Größen‑Limit.
+
+Beispiel::
+
+    from LLMHandler import LLMHandler
+    from ResponseCache import ResponseCache
+
+    cache = ResponseCache(path="cache/responses.sqlite", ttl=7 * 24 * 3600)
+    handler = LLMHandler("ollama", cache=cache)
+    handler.get_answer("Was ist 2+2?", temperature=0)   # Miss → Modell
+    handler.get_answer("Was ist 2+2?", temperature=0)   # Hit  → Cache
+    print(cache.stats)
+"""
+
+# --------------------------------------------------------------------------- #
+# IMPORTS
+# --------------------------------------------------------------------------- #
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Ab so vielen vorgemerkten Zugriffen werden sie gesammelt in SQLite geschrieben
+_TOUCH_BATCH = 256
+
+# --------------------------------------------------------------------------- #
+# Statistik
+# --------------------------------------------------------------------------- #
+@dataclass
+class CacheStats:
+    """Treffer‑/Fehlzugriffs‑Zähler eines `ResponseCache`."""
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+# --------------------------------------------------------------------------- #
+# Cache
+# --------------------------------------------------------------------------- #
+class ResponseCache:
+    """
+    Zweistufiger Antwort‑Cache (LRU im Speicher + optional SQLite).
+
+    Parameters
+    ----------
+    max_entries : int
+        Maximale Anzahl Einträge im In‑Memory‑LRU.
+    path : str | Path | None
+        Pfad der SQLite‑Datei; `None` = nur In‑Memory.
+    ttl : float | None
+        Lebensdauer eines Eintrags in Sekunden (`None` = unbegrenzt).
+    max_disk_bytes : int | None
+        Obergrenze für die Summe der gespeicherten Antworten auf der Platte;
+        bei Überschreitung werden die am längsten nicht genutzten verdrängt.
+    cache_nonzero_temperature : bool
+        Standardmäßig werden nur deterministische Anfragen (`temperature=0`)
+        gecacht. Mit `True` auch alle anderen.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        path: Optional[Union[str, Path]] = None,
+        ttl: Optional[float] = None,
+        max_disk_bytes: Optional[int] = None,
+        cache_nonzero_temperature: bool = False,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes
+        self.cache_nonzero_temperature = cache_nonzero_temperature
+
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0                        # laufende Summe von `size`
+        self._touched: Dict[str, float] = {}        # noch nicht geschriebene `accessed`
+        if path is not None:
+            self._open_db(Path(path))
+
+    # --------------------------------------------------------------------------- #
+    # Schlüssel & Richtlinie
+    # --------------------------------------------------------------------------- #
+    @staticmethod
+    def make_key(
+        llm_type: str,
+        model: str,
+        prompt: str,
+        *,
+        attachments: Iterable[Union[bytes, str]] = (),
+        temperature: Optional[float] = None,
+        length: Optional[int] = None,
+    ) -> str:
+        """Bildet den inhalts‑adressierten Schlüssel einer Anfrage."""
+        h = hashlib.sha256()
+        for field in (llm_type, model, repr(temperature), repr(length), prompt):
+            data = field.encode("utf-8")
+            h.update(len(data).to_bytes(8, "big"))
+            h.update(data)
+        for item in attachments:
+            data = item.encode("utf-8") if isinstance(item, str) else item
+            h.update(len(data).to_bytes(8, "big"))
+            h.update(data)
+        return h.hexdigest()
+
+    def should_cache(self, temperature: Optional[float]) -> bool:
+        """Nur deterministische Anfragen cachen, außer explizit anders gewünscht."""
+        return self.cache_nonzero_temperature or temperature == 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """Momentaufnahme der Treffer‑Statistik."""
+        with self._lock:
+            return replace(self._stats)
+
+    # --------------------------------------------------------------------------- #
+    # Zugriff
+    # --------------------------------------------------------------------------- #
+    def get(self, key: str) -> Optional[str]:
+        """Liefert die gecachte Antwort oder `None` (zählt Hit/Miss)."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self._touch(key, now)
+                    self._stats.hits += 1
+                    self._stats.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created, size FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created, size = row
+                    if not self._expired(created, now):
+                        self._touch(key, now)
+                        self._remember(key, value, created)
+                        self._stats.hits += 1
+                        self._stats.disk_hits += 1
+                        return value
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._disk_bytes -= size
+                    self._touched.pop(key, None)
+
+            self._stats.misses += 1
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        """Legt eine Antwort in beiden Stufen ab."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self._stats.stores += 1
+            if self._db is not None:
+                size = len(value.encode("utf-8"))
+                row = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created, accessed, size) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, value, now, now, size),
+                )
+                self._disk_bytes += size - (row[0] if row else 0)
+                self._touched.pop(key, None)
+                self._evict_disk(now)
+                self._db.commit()
+
+    def clear(self) -> None:
+        """Leert beide Stufen (die Statistik bleibt erhalten)."""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+                self._disk_bytes = 0
+
+    def close(self) -> None:
+        """Schließt die SQLite‑Verbindung."""
+        with self._lock:
+            if self._db is not None:
+                self._flush_touched()
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    # --------------------------------------------------------------------------- #
+    # Interna
+    # --------------------------------------------------------------------------- #
+    def _open_db(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL,"
+            " size INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created)")
+        self._db.commit()
+        # einmal summieren, danach führen put/Verdrängen die Summe mit
+        (self._disk_bytes,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats.evictions += 1
+
+    def _touch(self, key: str, now: float) -> None:
+        """Merkt einen Zugriff für `accessed` vor (gesammelt geschrieben)."""
+        if self._db is None:
+            return
+        self._touched[key] = now
+        if len(self._touched) >= _TOUCH_BATCH:
+            self._flush_touched()
+            self._db.commit()
+
+    def _flush_touched(self) -> None:
+        assert self._db is not None
+        if self._touched:
+            self._db.executemany(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict_disk(self, now: float) -> None:
+        assert self._db is not None
+        if self.ttl is not None:
+            # über den Index auf `created` – nur die abgelaufenen Zeilen werden gelesen
+            expired = self._db.execute(
+                "SELECT key, size FROM responses WHERE created < ?", (now - self.ttl,)
+            ).fetchall()
+            if expired:
+                self._delete_disk(expired)
+        if self.max_disk_bytes is None or self._disk_bytes <= self.max_disk_bytes:
+            return
+        # die LRU‑Reihenfolge auf der Platte braucht die vorgemerkten Zugriffe
+        self._flush_touched()
+        rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed ASC")
+        total = self._disk_bytes
+        victims = []
+        for key, size in rows:
+            if total <= self.max_disk_bytes:
+                break
+            victims.append((key, size))
+            total -= size
+        self._delete_disk(victims)
+
+    def _delete_disk(self, rows: List[Tuple[str, int]]) -> None:
+        assert self._db is not None
+        self._db.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key, _ in rows])
+        for key, size in rows:
+            self._disk_bytes -= size
+            self._touched.pop(key, None)
+        self._stats.evictions += len(rows)
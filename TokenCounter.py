@@ -0,0 +1,257 @@
+# TokenCounter.py
+"""
+Lokale Token‑Schätzung und Kontext‑Budget für den **LLMHandler**.
+
+Ohne Netzwerk‑Roundtrip wird abgeschätzt, wie viele Tokens Prompt und Anhänge
+belegen, wie viel Platz im Kontext‑Fenster bleibt und was eine Anfrage
+ungefähr kostet.
+
+* OpenAI: exakt über `tiktoken` (falls installiert), sonst Heuristik.
+* Ollama / Gemini: Heuristik (Zeichen pro Token); eigene Schätzer lassen sich
+  mit `register_estimator` je Backend und Modell‑Präfix einhängen.
+
+Wiederholte Texte (z. B. dieselben Referenz‑Dateien) werden über einen
+LRU‑Cache nur einmal gezählt.
+
+Beispiel::
+
+    counter = TokenCounter("openai", "gpt-4o")
+    counter.count("Hallo Welt")            # → 3
+    counter.context_limit                  # → 128000
+"""
+
+# --------------------------------------------------------------------------- #
+# IMPORTS
+# --------------------------------------------------------------------------- #
+import math
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# --------------------------------------------------------------------------- #
+# Modell‑Tabellen (Präfix → Wert, längster Präfix gewinnt)
+# --------------------------------------------------------------------------- #
+# (Kontext‑Fenster, maximale Ausgabe‑Tokens)
+_MODEL_LIMITS: Dict[str, Tuple[int, int]] = {
+    "gpt-4o-mini": (128_000, 16_384),
+    "gpt-4o": (128_000, 16_384),
+    "gpt-4.1": (1_047_576, 32_768),
+    "gpt-4-turbo": (128_000, 4_096),
+    "gpt-4": (8_192, 8_192),
+    "gpt-3.5-turbo": (16_385, 4_096),
+    "o1": (200_000, 100_000),
+    "o3": (200_000, 100_000),
+    "o4-mini": (200_000, 100_000),
+    "gemini-1.5-pro": (2_097_152, 8_192),
+    "gemini-1.5-flash": (1_048_576, 8_192),
+    "gemini-2": (1_048_576, 8_192),
+}
+
+# USD pro 1 Mio. Tokens (Eingabe, Ausgabe) – Listenpreise, Stand 2025
+_MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4": (30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "o1": (15.00, 60.00),
+    "o3": (2.00, 8.00),
+    "o4-mini": (1.10, 4.40),
+    "gemini-1.5-pro": (1.25, 5.00),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-2": (0.10, 0.40),
+}
+
+# Pauschale Token‑Kosten eines Bildes je Backend
+_IMAGE_TOKENS: Dict[str, int] = {"openai": 765, "gemini": 258, "ollama": 576}
+
+# Ollama schneidet serverseitig auf num_ctx ab (Standard 4096)
+_OLLAMA_DEFAULT_CONTEXT = 4096
+
+def _lookup(table: Dict[str, Tuple], model: str) -> Optional[Tuple]:
+    best = None
+    for prefix in table:
+        if model.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return table[best] if best is not None else None
+
+# --------------------------------------------------------------------------- #
+# Schätzer
+# --------------------------------------------------------------------------- #
+Estimator = Callable[[str], int]
+
+class HeuristicEstimator:
+    """Schätzt Tokens über die Zeichenanzahl (`chars_per_token`)."""
+
+    def __init__(self, chars_per_token: float = 4.0):
+        self.chars_per_token = chars_per_token
+
+    def __call__(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+class TiktokenEstimator:
+    """Exakte Zählung mit `tiktoken` (OpenAI‑kompatibel)."""
+
+    chars_per_token = 4.0
+
+    def __init__(self, model: str):
+        import tiktoken
+
+        try:
+            self._encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self._encoding = tiktoken.get_encoding("o200k_base")
+
+    def __call__(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+_ESTIMATORS: List[Tuple[str, str, Callable[[str], Estimator]]] = []
+
+def register_estimator(llm_type: str, model_prefix: str, factory: Callable[[str], Estimator]) -> None:
+    """
+    Hängt einen eigenen Schätzer ein. `factory(model)` liefert ein Callable
+    `text -> int`; der längste passende Modell‑Präfix gewinnt.
+    """
+    _ESTIMATORS.append((llm_type.lower(), model_prefix, factory))
+
+def _default_estimator(llm_type: str, model: str) -> Estimator:
+    best: Optional[Tuple[str, str, Callable[[str], Estimator]]] = None
+    for entry in _ESTIMATORS:
+        if entry[0] == llm_type and model.startswith(entry[1]):
+            if best is None or len(entry[1]) > len(best[1]):
+                best = entry
+    if best is not None:
+        return best[2](model)
+    if llm_type == "openai":
+        try:
+            return TiktokenEstimator(model)
+        except ImportError:
+            pass
+    return HeuristicEstimator()
+
+# --------------------------------------------------------------------------- #
+# Ergebnis‑Typen
+# --------------------------------------------------------------------------- #
+class ContextLimitExceeded(ValueError):
+    """Prompt und Anhänge passen nicht ins Kontext‑Fenster des Modells."""
+
+@dataclass
+class RequestEstimate:
+    """Vorab‑Schätzung einer Anfrage (ohne Netzwerk)."""
+    prompt_tokens: int
+    max_completion_tokens: int
+    context_limit: int
+    prompt_cost: Optional[float] = None
+    max_cost: Optional[float] = None
+
+    @property
+    def fits(self) -> bool:
+        return self.prompt_tokens < self.context_limit
+
+# --------------------------------------------------------------------------- #
+# Zähler
+# --------------------------------------------------------------------------- #
+class TokenCounter:
+    """
+    Token‑Schätzung für ein konkretes Backend + Modell.
+
+    Parameters
+    ----------
+    llm_type : str
+        'ollama' | 'openai' | 'gemini'
+    model : str
+        Modell‑Name (bestimmt Schätzer, Kontext‑Fenster und Preise).
+    estimator : callable | None
+        Eigener Schätzer `text -> int`; überschreibt die Registrierung.
+    context_limit : int | None
+        Kontext‑Fenster erzwingen (z. B. das `num_ctx` eines Ollama‑Modells).
+    cache_size : int
+        Anzahl gemerkter Zählungen im LRU‑Cache.
+    """
+
+    def __init__(
+        self,
+        llm_type: str,
+        model: str,
+        *,
+        estimator: Optional[Estimator] = None,
+        context_limit: Optional[int] = None,
+        cache_size: int = 256,
+    ):
+        self.llm_type = llm_type.lower()
+        self.model = model
+        self.estimator = estimator or _default_estimator(self.llm_type, model)
+        self._context_limit = context_limit
+        self.count = lru_cache(maxsize=cache_size)(self.estimator)
+
+    # --------------------------------------------------------------------------- #
+    # Modell‑Eigenschaften
+    # --------------------------------------------------------------------------- #
+    @property
+    def context_limit(self) -> int:
+        if self._context_limit is not None:
+            return self._context_limit
+        if self.llm_type == "ollama":
+            return int(os.getenv("OLLAMA_CONTEXT_LENGTH", _OLLAMA_DEFAULT_CONTEXT))
+        limits = _lookup(_MODEL_LIMITS, self.model)
+        return limits[0] if limits else 8_192
+
+    @property
+    def context_limit_given(self) -> bool:
+        """`True`, wenn das Kontext‑Fenster vorgegeben und nicht geschätzt ist."""
+        return self._context_limit is not None
+
+    @property
+    def max_output_tokens(self) -> int:
+        limits = _lookup(_MODEL_LIMITS, self.model)
+        return limits[1] if limits and self.llm_type != "ollama" else self.context_limit
+
+    @property
+    def chars_per_token(self) -> float:
+        """Näherung für Umrechnungen Zeichen ↔ Tokens (z. B. beim Chunking)."""
+        return getattr(self.estimator, "chars_per_token", 4.0)
+
+    # --------------------------------------------------------------------------- #
+    # Schätzung
+    # --------------------------------------------------------------------------- #
+    def count_request(self, prompt: str, texts: Iterable[str] = (), images: int = 0) -> int:
+        """Tokens für Prompt + Text‑Anhänge + Bilder (inkl. kleinem Overhead)."""
+        tokens = self.count(prompt) + sum(self.count(text) for text in texts)
+        tokens += images * _IMAGE_TOKENS.get(self.llm_type, 0)
+        return tokens + 8   # Rollen‑/Format‑Overhead der Chat‑Nachricht
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+        """Geschätzte Kosten in USD (`None` bei unbekanntem Preis, 0 bei Ollama)."""
+        if self.llm_type == "ollama":
+            return 0.0
+        prices = _lookup(_MODEL_PRICES, self.model)
+        if prices is None:
+            return None
+        return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+    def estimate(
+        self,
+        prompt: str,
+        texts: Iterable[str] = (),
+        images: int = 0,
+        *,
+        max_tokens: Optional[int] = None,
+    ) -> RequestEstimate:
+        """
+        Schätzt eine Anfrage und wählt die Ausgabe‑Länge: `max_tokens` wird
+        auf den Rest des Kontext‑Fensters und das Ausgabe‑Limit begrenzt.
+        """
+        prompt_tokens = self.count_request(prompt, texts, images)
+        room = max(self.context_limit - prompt_tokens, 0)
+        completion = min(room, self.max_output_tokens)
+        if max_tokens is not None:
+            completion = min(completion, max_tokens)
+        return RequestEstimate(
+            prompt_tokens=prompt_tokens,
+            max_completion_tokens=completion,
+            context_limit=self.context_limit,
+            prompt_cost=self.cost(prompt_tokens, 0),
+            max_cost=self.cost(prompt_tokens, completion),
+        )
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# benchmarks/bench_chat_stream.py
+"""
+Benchmark des `ChatCompletionStreamState` im mitgelieferten OpenAI‑SDK
+(``samples/OpenAI_callOutOfJavaFrameset/openai``) auf langen Streams.
+
+Zwei synthetische Streams je Länge (4 Zeichen pro Token‑Chunk):
+
+* ``structured`` – Structured Output (``response_format`` = Pydantic‑Modell),
+  der Inhalt wird nach jedem Chunk partiell als JSON geparst
+* ``tool``       – ein ``strict``‑Tool‑Call, dessen Argumente ebenso
+  mitgeparst werden
+
+Ausgegeben werden Gesamtzeit, µs pro Chunk (bleibt bei linearem Aufwand
+über die Längen konstant) sowie die reine Partial‑JSON‑Zeit: inkrementell
+(`PartialJSONParser`) gegenüber dem früheren Neu‑Parsen des ganzen Präfixes
+mit ``jiter.from_json(..., partial_mode=True)``.
+
+Aufruf::
+
+    python benchmarks/bench_chat_stream.py                   # 1k, 4k, 16k Tokens
+    python benchmarks/bench_chat_stream.py -t 50000 -r 1
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "samples" / "OpenAI_callOutOfJavaFrameset"))
+
+import pydantic                    # noqa: E402
+from jiter import from_json        # noqa: E402
+
+import openai                                                        # noqa: E402
+from openai.lib.streaming._partial_json import PartialJSONParser    # noqa: E402
+from openai.lib.streaming.chat import ChatCompletionStreamState      # noqa: E402
+from openai.types.chat import ChatCompletionChunk                    # noqa: E402
+
+KINDS = ("structured", "tool")
+
+class Item(pydantic.BaseModel):
+    name: str
+    value: int
+    tags: List[str]
+
+class Report(pydantic.BaseModel):
+    title: str
+    items: List[Item]
+    summary: Optional[str] = None
+
+TOOL = openai.pydantic_function_tool(Report, name="report")
+
+# --------------------------------------------------------------------------- #
+# Synthetische Streams
+# --------------------------------------------------------------------------- #
+def _document(tokens: int) -> str:
+    """JSON‑Dokument mit etwa `tokens` × 4 Zeichen."""
+    items = []
+    size = 0
+    while size < tokens * 4:
+        item = {"name": f"Eintrag {len(items)}", "value": len(items) * 7, "tags": ["a", "ü"]}
+        items.append(item)
+        size += len(json.dumps(item, ensure_ascii=False)) + 2
+    return json.dumps(
+        {"title": "Bericht", "items": items, "summary": "Zusammenfassung " * 8}, ensure_ascii=False
+    )
+
+
+def _chunks(kind: str, tokens: int) -> Tuple[List[ChatCompletionChunk], str]:
+    document = _document(tokens)
+    pieces = [document[i:i + 4] for i in range(0, len(document), 4)]
+    base = {"id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4o-mini"}
+
+    def chunk(delta: Any, finish_reason: Optional[str] = None) -> ChatCompletionChunk:
+        choice = {"index": 0, "delta": delta, "finish_reason": finish_reason}
+        return ChatCompletionChunk.model_validate({**base, "choices": [choice]})
+
+    if kind == "structured":
+        chunks = [chunk({"role": "assistant", "content": ""})]
+        chunks += [chunk({"content": piece}) for piece in pieces]
+        chunks.append(chunk({}, "stop"))
+    else:
+        call = {"index": 0, "id": "call_0", "type": "function", "function": {"name": "report", "arguments": ""}}
+        chunks = [chunk({"role": "assistant", "tool_calls": [call]})]
+        chunks += [chunk({"tool_calls": [{"index": 0, "function": {"arguments": piece}}]}) for piece in pieces]
+        chunks.append(chunk({}, "tool_calls"))
+    return chunks, document
+
+# --------------------------------------------------------------------------- #
+# Messung
+# --------------------------------------------------------------------------- #
+def _state(kind: str) -> ChatCompletionStreamState:
+    if kind == "structured":
+        return ChatCompletionStreamState(response_format=Report)
+    return ChatCompletionStreamState(input_tools=[TOOL])
+
+
+def _stream_seconds(kind: str, chunks: List[ChatCompletionChunk], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        state = _state(kind)
+        start = time.perf_counter()
+        for chunk in chunks:
+            for _event in state.handle_chunk(chunk):
+                pass
+        state.get_final_completion()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _json_seconds(document: str, repeat: int) -> Tuple[float, float]:
+    """Nur das Partial‑JSON: inkrementell gegenüber Neu‑Parsen je Chunk."""
+    pieces = [document[i:i + 4] for i in range(0, len(document), 4)]
+    incremental = reparse = float("inf")
+    for _ in range(repeat):
+        parser = PartialJSONParser()
+        start = time.perf_counter()
+        for piece in pieces:
+            parser.feed(piece)
+            parser.snapshot()
+        incremental = min(incremental, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        end = 0
+        for piece in pieces:
+            end += len(piece)
+            from_json(document[:end].encode("utf-8"), partial_mode=True)
+        reparse = min(reparse, time.perf_counter() - start)
+    return incremental, reparse
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark des ChatCompletionStreamState.")
+    parser.add_argument("-t", "--tokens", type=int, action="append",
+                        help="Stream‑Länge in Tokens (mehrfach möglich; Standard 1000, 4000, 16000).")
+    parser.add_argument("-k", "--kind", choices=KINDS, action="append", help="Nur diese Streams messen.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Wiederholungen (bester Lauf zählt).")
+    args = parser.parse_args()
+
+    header = (f"{'stream':10} {'tokens':>7} {'chunks':>7} {'gesamt s':>9} {'µs/chunk':>9} "
+              f"{'json inkr. ms':>14} {'json neu ms':>12}")
+    print(header)
+    print("-" * len(header))
+    for kind in args.kind or KINDS:
+        for tokens in args.tokens or (1000, 4000, 16000):
+            chunks, document = _chunks(kind, tokens)
+            seconds = _stream_seconds(kind, chunks, args.repeat)
+            incremental, reparse = _json_seconds(document, args.repeat)
+            print(
+                f"{kind:10} {tokens:7d} {len(chunks):7d} {seconds:9.3f} {seconds / len(chunks) * 1e6:9.1f} "
+                f"{incremental * 1e3:14.1f} {reparse * 1e3:12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
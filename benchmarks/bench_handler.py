@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# benchmarks/bench_handler.py
+"""
+Durchsatz‑ und Latenz‑Benchmark des **LLMHandler** gegen lokale Fake‑Server
+(`fake_servers.py`) – reproduzierbar und ohne Netz.
+
+Je Backend und Modus werden gemessen:
+
+* ``req/s``          – Durchsatz (Anfragen pro Sekunde Wandzeit)
+* ``p50`` / ``p99``  – Latenz pro Anfrage
+* ``ttft``           – Zeit bis zum ersten Token (nur gestreamte Modi)
+* ``KiB/req``        – zusätzlicher Python‑Speicher je laufender Anfrage
+  (eigener Durchgang mit `tracemalloc`, damit er die Zeiten nicht verfälscht)
+* ``startup``        – Import, Konstruktor und erster Client in frischen
+  Prozessen (wie `bench_startup.py`)
+
+Modi: ``sync`` (nacheinander), ``threaded`` (`get_answers`), ``async``
+(`aget_answers`), ``stream`` (`stream_answer` in Threads) und ``astream``
+(`astream_answer` als Tasks). Die Gemini‑Bibliothek kann über REST nicht
+asynchron arbeiten; dort werden die Async‑Modi übersprungen.
+
+Aufruf::
+
+    python benchmarks/bench_handler.py                        # alle Backends
+    python benchmarks/bench_handler.py -b ollama -n 500 -c 32 --latency 0.2
+    python benchmarks/bench_handler.py -m async -m astream --error-rate 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_startup import _probe          # noqa: E402
+from fake_servers import FakeLLMServer    # noqa: E402
+
+BACKENDS = ("ollama", "openai", "gemini")
+MODES = ("sync", "threaded", "async", "stream", "astream")
+ASYNC_MODES = ("async", "astream")
+
+# Ergebnis eines Laufs: Latenzen, TTFTs, Fehler, Wandzeit. Jeder Modus ruft
+# `ready()` unmittelbar vor dem Start der Messung (nach dem Aufwärmen).
+Run = Tuple[List[float], List[float], int, float]
+
+# --------------------------------------------------------------------------- #
+# Modi
+# --------------------------------------------------------------------------- #
+def _sync(handler: Any, prompts: List[str], concurrency: int, ready: Callable[[], None]) -> Run:
+    latencies: List[float] = []
+    errors = 0
+    ready()
+    started = time.perf_counter()
+    for prompt in prompts:
+        t0 = time.perf_counter()
+        try:
+            handler.get_answer(prompt)
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - t0)
+    return latencies, [], errors, time.perf_counter() - started
+
+
+def _threaded(handler: Any, prompts: List[str], concurrency: int, ready: Callable[[], None]) -> Run:
+    ready()
+    started = time.perf_counter()
+    items = handler.get_answers(prompts, max_concurrency=concurrency)
+    wall = time.perf_counter() - started
+    return [i.latency for i in items], [], sum(not i.ok for i in items), wall
+
+
+def _async(handler: Any, prompts: List[str], concurrency: int, ready: Callable[[], None]) -> Run:
+    async def run() -> Run:
+        await _awarm(handler)
+        ready()
+        started = time.perf_counter()
+        items = await handler.aget_answers(prompts, max_concurrency=concurrency)
+        wall = time.perf_counter() - started
+        await handler.aclose()
+        return [i.latency for i in items], [], sum(not i.ok for i in items), wall
+
+    return asyncio.run(run())
+
+
+def _stream(handler: Any, prompts: List[str], concurrency: int, ready: Callable[[], None]) -> Run:
+    def one(prompt: str) -> Tuple[float, Optional[float], bool]:
+        t0 = time.perf_counter()
+        try:
+            stream = handler.stream_answer(prompt)
+            for _ in stream:
+                pass
+        except Exception:
+            return time.perf_counter() - t0, None, False
+        return time.perf_counter() - t0, stream.metrics.time_to_first_token, True
+
+    ready()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, prompts))
+    wall = time.perf_counter() - started
+    return _split(results, wall)
+
+
+def _astream(handler: Any, prompts: List[str], concurrency: int, ready: Callable[[], None]) -> Run:
+    async def run() -> Run:
+        limit = asyncio.Semaphore(concurrency)
+
+        async def one(prompt: str) -> Tuple[float, Optional[float], bool]:
+            async with limit:
+                t0 = time.perf_counter()
+                try:
+                    stream = handler.astream_answer(prompt)
+                    async for _ in stream:
+                        pass
+                except Exception:
+                    return time.perf_counter() - t0, None, False
+                return time.perf_counter() - t0, stream.metrics.time_to_first_token, True
+
+        await _awarm(handler)
+        ready()
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(p) for p in prompts))
+        wall = time.perf_counter() - started
+        await handler.aclose()
+        return _split(results, wall)
+
+    return asyncio.run(run())
+
+
+async def _awarm(handler: Any) -> None:
+    """Baut den Async‑Client auf dem laufenden Event‑Loop auf (außerhalb der Messung)."""
+    try:
+        await handler.aget_answer("warm-up")
+    except Exception:
+        pass
+
+
+def _nothing() -> None:
+    pass
+
+
+def _split(results: List[Tuple[float, Optional[float], bool]], wall: float) -> Run:
+    latencies = [latency for latency, _, _ in results]
+    ttfts = [ttft for _, ttft, ok in results if ok and ttft is not None]
+    return latencies, ttfts, sum(not ok for _, _, ok in results), wall
+
+
+_RUNNERS: Dict[str, Callable[[Any, List[str], int, Callable[[], None]], Run]] = {
+    "sync": _sync,
+    "threaded": _threaded,
+    "async": _async,
+    "stream": _stream,
+    "astream": _astream,
+}
+
+# --------------------------------------------------------------------------- #
+# Messung
+# --------------------------------------------------------------------------- #
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def _handler(backend: str, server: FakeLLMServer) -> Any:
+    from LLMHandler import LLMHandler
+
+    host = server.url + "/v1" if backend == "openai" else server.url
+    return LLMHandler(backend, host=host, model="fake-model")
+
+
+def _warm_up(handler: Any, mode: str, server: FakeLLMServer) -> None:
+    """
+    Ein Aufruf vorab (Client‑Aufbau, Verbindung) ohne eingestreute Fehler –
+    scheitert er, ist der Modus mit diesem Backend nicht nutzbar.
+    """
+    rate, server.error_rate = server.error_rate, 0.0
+    try:
+        if mode in ASYNC_MODES:
+            async def run() -> None:
+                await handler.aget_answer("warm-up")
+                await handler.aclose()
+
+            asyncio.run(run())
+        else:
+            handler.get_answer("warm-up")
+    finally:
+        server.error_rate = rate
+
+
+def _memory_per_request(backend: str, server: FakeLLMServer, mode: str, concurrency: int) -> Optional[float]:
+    """Spitzen‑Speicher (tracemalloc) über dem Ruhezustand, geteilt durch die Parallelität."""
+    if mode == "sync":
+        concurrency = 1
+    handler = _handler(backend, server)
+    _warm_up(handler, mode, server)
+    prompts = [f"Frage {i}" for i in range(concurrency)]
+    baseline = 0
+
+    def ready() -> None:
+        nonlocal baseline
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    tracemalloc.start()
+    try:
+        _RUNNERS[mode](handler, prompts, concurrency, ready)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        handler.close()
+    return (peak - baseline) / concurrency / 1024
+
+
+def _fmt_ms(value: Optional[float]) -> str:
+    return f"{value * 1e3:9.1f}" if value is not None else f"{'–':>9}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark des LLMHandler gegen Fake‑Server.")
+    parser.add_argument("-b", "--backend", choices=BACKENDS, action="append",
+                        help="Nur diese Backends messen (mehrfach möglich).")
+    parser.add_argument("-m", "--mode", choices=MODES, action="append",
+                        help="Nur diese Modi messen (mehrfach möglich).")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="Anfragen pro Modus.")
+    parser.add_argument("-c", "--concurrency", type=int, default=16,
+                        help="Parallele Anfragen (threaded/async/stream/astream).")
+    parser.add_argument("--latency", type=float, default=0.05, help="Server: Sekunden bis zum ersten Token.")
+    parser.add_argument("--rate", type=float, default=500.0, help="Server: Tokens pro Sekunde.")
+    parser.add_argument("--tokens", type=int, default=32, help="Server: Tokens pro Antwort.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Server: Anteil fehlerhafter Antworten.")
+    parser.add_argument("--error-status", type=int, default=500, help="Server: HTTP‑Status der Fehler.")
+    parser.add_argument("--seed", type=int, default=0, help="Startwert der Fehler‑Auswahl.")
+    parser.add_argument("--no-memory", action="store_true", help="Speicher‑Durchgang auslassen.")
+    parser.add_argument("--startup-runs", type=int, default=3,
+                        help="Prozess‑Starts für die Startzeit (0 = aus).")
+    args = parser.parse_args()
+
+    # Dummy‑Schlüssel, damit die Clients ohne .env erzeugt werden können
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ.setdefault("GEMINI_API_KEY", "bench")
+
+    print(
+        f"{args.requests} Anfragen, Parallelität {args.concurrency}, Server: "
+        f"{args.latency * 1e3:.0f} ms bis Token 1, {args.rate:.0f} Tokens/s, "
+        f"{args.tokens} Tokens, Fehlerquote {args.error_rate:.0%}\n"
+    )
+    header = (f"{'backend':8} {'modus':9} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} "
+              f"{'ttft p50':>9} {'ttft p99':>9} {'fehler':>7} {'KiB/req':>8}")
+    print(header)
+    print("-" * len(header))
+
+    prompts = [f"Frage {i}: Was ist {i} + {i}?" for i in range(args.requests)]
+    for backend in args.backend or BACKENDS:
+        with FakeLLMServer(
+            latency=args.latency,
+            tokens_per_second=args.rate,
+            completion_tokens=args.tokens,
+            error_rate=args.error_rate,
+            error_status=args.error_status,
+            seed=args.seed,
+        ) as server:
+            for mode in args.mode or MODES:
+                # frischer Handler je Modus (Async‑Clients hängen an ihrem Event‑Loop)
+                handler = _handler(backend, server)
+                try:
+                    _warm_up(handler, mode, server)
+                except ImportError:
+                    print(f"{backend:8} {mode:9} übersprungen (Backend nicht installiert)")
+                    handler.close()
+                    break
+                except Exception as exc:
+                    print(f"{backend:8} {mode:9} übersprungen ({type(exc).__name__}: {exc})")
+                    handler.close()
+                    continue
+                latencies, ttfts, errors, wall = _RUNNERS[mode](
+                    handler, prompts, args.concurrency, _nothing
+                )
+                handler.close()
+                memory = None
+                if not args.no_memory:
+                    memory = _memory_per_request(backend, server, mode, args.concurrency)
+                print(
+                    f"{backend:8} {mode:9} {len(latencies) / wall:8.1f} "
+                    f"{_fmt_ms(_percentile(latencies, 50))} {_fmt_ms(_percentile(latencies, 99))} "
+                    f"{_fmt_ms(_percentile(ttfts, 50))} {_fmt_ms(_percentile(ttfts, 99))} "
+                    f"{errors:7d} " + (f"{memory:8.1f}" if memory is not None else f"{'–':>8}")
+                )
+
+    if args.startup_runs:
+        print(f"\n{'backend':8} {'import ms':>10} {'init ms':>10} {'client ms':>10} {'wall ms':>10}  (Median)")
+        for backend in args.backend or BACKENDS:
+            runs = [r for r in (_probe(backend) for _ in range(args.startup_runs)) if r is not None]
+            if not runs:
+                print(f"{backend:8} übersprungen (Backend nicht installiert?)")
+                continue
+            medians = [sorted(col)[len(col) // 2] for col in zip(*runs)]
+            print(f"{backend:8} " + " ".join(f"{m:10.1f}" for m in medians))
+
+
+if __name__ == "__main__":
+    main()
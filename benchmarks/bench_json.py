@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# benchmarks/bench_json.py
+"""
+Benchmark der JSON‑Kodierung im mitgelieferten OpenAI‑SDK
+(``samples/OpenAI_callOutOfJavaFrameset/openai``) – Request‑Bodies beim
+Senden, Antworten und SSE‑Events beim Empfangen.
+
+Kodiert (Request‑Body, ``encode_json_body`` gegenüber ``httpx`` mit ``json=``):
+
+* ``messages``    – Chat‑Request mit vielen Text‑Nachrichten
+* ``image``       – Chat‑Request mit einem großen Base64‑Bild (``data:``‑URL)
+* ``tokens``      – Embedding‑Request mit Token‑Listen
+
+Dekodiert (``response_json`` bzw. ``json_loads`` gegenüber ``httpx`` bzw. ``json.loads``):
+
+* ``embeddings``  – Embedding‑Antwort mit vielen Floats
+* ``files.list``  – Dateiliste mit vielen Einträgen
+* ``sse``         – einzelne Chat‑Chunks, wie sie ``ServerSentEvent.json()`` liest
+
+Beide Ergebnisse werden vorab auf Gleichheit geprüft (beim Kodieren
+bytegenau). Ohne installiertes ``orjson`` fallen die neuen Funktionen auf
+``json`` zurück; dann ist kein Unterschied zu erwarten.
+
+Aufruf::
+
+    python benchmarks/bench_json.py                      # 1000 Nachrichten/Einträge, 3 MB Bild
+    python benchmarks/bench_json.py -n 10000 --image-mb 20 -r 1
+"""
+
+import argparse
+import base64
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "samples" / "OpenAI_callOutOfJavaFrameset"))
+
+import httpx                                                     # noqa: E402
+
+from openai._utils import _json                                 # noqa: E402
+from openai._utils import encode_json_body, json_loads, response_json  # noqa: E402
+
+# --------------------------------------------------------------------------- #
+# Synthetische Daten
+# --------------------------------------------------------------------------- #
+def _requests(items: int, image_mb: float) -> List[Tuple[str, Any]]:
+    messages = [{"role": "system", "content": "Du bist ein hilfreicher Assistent."}]
+    messages += [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"Nachricht {i}: Grüße 👋 " * 4}
+        for i in range(items)
+    ]
+    image = base64.b64encode(random.Random(0).randbytes(int(image_mb * 3 / 4 * 2**20))).decode("ascii")
+    parts = [
+        {"type": "text", "text": "Was zeigt das Bild?"},
+        {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{image}", "detail": "high"}},
+    ]
+    tokens = [[(i * 7919 + j) % 100000 for j in range(256)] for i in range(max(1, items // 10))]
+    return [
+        ("messages", {"model": "gpt-4o-mini", "messages": messages, "temperature": 0.2}),
+        ("image", {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": parts}]}),
+        ("tokens", {"model": "text-embedding-3-small", "input": tokens, "encoding_format": "float"}),
+    ]
+
+
+def _responses(items: int) -> List[Tuple[str, List[bytes]]]:
+    rng = random.Random(0)
+    embeddings = {
+        "object": "list",
+        "data": [{"object": "embedding", "index": i, "embedding": [rng.uniform(-0.1, 0.1) for _ in range(1536)]}
+                 for i in range(max(1, items // 10))],
+        "model": "text-embedding-3-small",
+        "usage": {"prompt_tokens": 8, "total_tokens": 8},
+    }
+    files = {
+        "object": "list",
+        "data": [{"id": f"file-{i}", "object": "file", "bytes": 1024 + i, "created_at": 1700000000,
+                  "filename": f"batch-{i}.jsonl", "purpose": "batch", "status": "processed"}
+                 for i in range(items * 10)],
+        "has_more": False,
+    }
+    chunks = [
+        {"id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": 1700000000, "model": "gpt-4o-mini",
+         "choices": [{"index": 0, "delta": {"content": f" tok{i}"}, "logprobs": None, "finish_reason": None}]}
+        for i in range(items * 10)
+    ]
+    return [
+        ("embeddings", [json.dumps(embeddings).encode()]),
+        ("files.list", [json.dumps(files).encode()]),
+        ("sse", [json.dumps(chunk).encode() for chunk in chunks]),
+    ]
+
+# --------------------------------------------------------------------------- #
+# Messung
+# --------------------------------------------------------------------------- #
+def _httpx_body(data: Any) -> bytes:
+    return httpx.Request("POST", "http://localhost", json=data).content
+
+
+def _orjson_body(data: Any) -> bytes:
+    body = encode_json_body(data)
+    return _httpx_body(data) if body is None else body
+
+
+def _response_json(content: bytes) -> Any:
+    return response_json(httpx.Response(200, content=content))
+
+
+def _httpx_json(content: bytes) -> Any:
+    return httpx.Response(200, content=content).json()
+
+
+def _seconds(function: Callable[[Any], Any], values: List[Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            function(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _report(name: str, size: int, variants: List[Tuple[str, Callable[[Any], Any]]], values: List[Any],
+            repeat: int) -> None:
+    reference = [variants[0][1](value) for value in values]
+    if [variants[1][1](value) for value in values] != reference:
+        raise SystemExit(f"{name}: json und neu liefern unterschiedliche Ergebnisse")
+    baseline = None
+    for label, function in variants:
+        seconds = _seconds(function, values, repeat)
+        baseline = baseline or seconds
+        print(f"{name:11} {size / 2**20:8.2f} {label:9} {seconds * 1e3:9.2f} {size / 2**20 / seconds:9.1f} "
+              f"{baseline / seconds:6.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark der JSON‑Kodierung.")
+    parser.add_argument("-n", "--items", type=int, default=1000, help="Nachrichten bzw. Einträge je Messung.")
+    parser.add_argument("--image-mb", type=float, default=3.0, help="Größe des Base64‑Bilds in MB.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Wiederholungen (bester Lauf zählt).")
+    args = parser.parse_args()
+
+    if _json.orjson is None:
+        print("orjson ist nicht installiert – die neuen Funktionen nutzen json.\n")
+
+    print(f"{'daten':11} {'MB':>8} {'impl.':9} {'ms':>9} {'MB/s':>9} {'faktor':>7}")
+    for name, data in _requests(args.items, args.image_mb):
+        size = len(_httpx_body(data))
+        _report(name, size, [("httpx", _httpx_body), ("neu", _orjson_body)], [data], args.repeat)
+    for name, contents in _responses(args.items):
+        size = sum(map(len, contents))
+        if name == "sse":
+            variants: List[Tuple[str, Callable[[Any], Any]]] = [("json", json.loads), ("neu", json_loads)]
+        else:
+            variants = [("httpx", _httpx_json), ("neu", _response_json)]
+        _report(name, size, variants, contents, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# benchmarks/bench_models.py
+"""
+Benchmark von `construct_type` im mitgelieferten OpenAI‑SDK
+(``samples/OpenAI_callOutOfJavaFrameset/openai``) – also dem Schritt, der
+aus jedem Stream‑Chunk und jeder Antwort die Modellobjekte baut.
+
+Gemessen werden:
+
+* ``chunks``       – ``ChatCompletionChunk`` mit Text‑Delta (Chat‑Stream)
+* ``tool-chunks``  – ``ChatCompletionChunk`` mit Tool‑Call‑Delta
+* ``files.list``   – ``SyncCursorPage[FileObject]`` mit vielen Einträgen
+* ``models.list``  – ``SyncPage[Model]`` mit vielen Einträgen
+
+Zum Vergleich läuft die frühere Implementierung (Typ‑Inspektion bei jedem
+Wert, ohne vorbereitete Konstruktoren) als ``legacy`` mit; beide Ergebnisse
+werden vorab auf Gleichheit geprüft.
+
+Aufruf::
+
+    python benchmarks/bench_models.py                    # 20k Chunks, Listen mit 1000 Einträgen
+    python benchmarks/bench_models.py -c 100000 -n 10000 -r 1
+"""
+
+import argparse
+import inspect
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "samples" / "OpenAI_callOutOfJavaFrameset"))
+
+from openai import _models                                      # noqa: E402
+from openai._compat import (                                     # noqa: E402
+    get_args, get_model_config, get_model_fields, get_origin, is_literal_type, is_union,
+)
+from openai._utils import (                                      # noqa: E402
+    extract_type_arg, is_annotated_type, is_list, is_mapping, is_type_alias_type, parse_date, parse_datetime,
+)
+from openai.pagination import SyncCursorPage, SyncPage          # noqa: E402
+from openai.types import FileObject, Model                       # noqa: E402
+from openai.types.chat import ChatCompletionChunk                # noqa: E402
+
+# --------------------------------------------------------------------------- #
+# Frühere Implementierung (Referenz)
+# --------------------------------------------------------------------------- #
+def legacy_construct(cls: Any, **values: Any) -> Any:
+    """`BaseModel.construct` vor den vorbereiteten Konstruktoren (nur Pydantic v2)."""
+    m = cls.__new__(cls)
+    fields_values: Dict[str, Any] = {}
+    populate_by_name = get_model_config(cls).get("populate_by_name")
+    fields_set = set()
+    model_fields = get_model_fields(cls)
+    for name, field in model_fields.items():
+        key = field.alias
+        if key is None or (key not in values and populate_by_name):
+            key = name
+        if key in values:
+            value = values[key]
+            if value is None:
+                fields_values[name] = _models.field_get_default(field)
+            else:
+                fields_values[name] = legacy_construct_type(value, field.annotation)
+            fields_set.add(name)
+        else:
+            fields_values[name] = _models.field_get_default(field)
+    extra = {key: value for key, value in values.items() if key not in model_fields}
+    object.__setattr__(m, "__dict__", fields_values)
+    object.__setattr__(m, "__pydantic_private__", None)
+    object.__setattr__(m, "__pydantic_extra__", extra)
+    object.__setattr__(m, "__pydantic_fields_set__", fields_set)
+    return m
+
+
+def legacy_construct_type(value: Any, type_: Any) -> Any:
+    """`construct_type` vor den vorbereiteten Konstruktoren."""
+    original_type = None
+    if is_type_alias_type(type_):
+        original_type = type_
+        type_ = type_.__value__
+    if is_annotated_type(type_):
+        meta = get_args(type_)[1:]
+        type_ = extract_type_arg(type_, 0)
+    else:
+        meta = ()
+    origin = get_origin(type_) or type_
+    args = get_args(type_)
+
+    if is_union(origin):
+        try:
+            return _models.validate_type(type_=original_type or type_, value=value)
+        except Exception:
+            pass
+        discriminator = _models._build_discriminated_union_meta(union=type_, meta_annotations=meta)
+        if discriminator and is_mapping(value):
+            variant_value = value.get(discriminator.field_alias_from or discriminator.field_name)
+            if variant_value and isinstance(variant_value, str):
+                variant_type = discriminator.mapping.get(variant_value)
+                if variant_type:
+                    return legacy_construct_type(value, variant_type)
+        for variant in args:
+            try:
+                return legacy_construct_type(value, variant)
+            except Exception:
+                continue
+        raise RuntimeError(f"Could not convert data into a valid instance of {type_}")
+
+    if origin == dict:
+        if not is_mapping(value):
+            return value
+        _, items_type = get_args(type_)
+        return {key: legacy_construct_type(item, items_type) for key, item in value.items()}
+
+    if not is_literal_type(type_) and inspect.isclass(origin) and issubclass(origin, _models.BaseModel):
+        if is_list(value):
+            return [legacy_construct(type_, **entry) if is_mapping(entry) else entry for entry in value]
+        if is_mapping(value):
+            return legacy_construct(type_, **value)
+
+    if origin == list:
+        if not is_list(value):
+            return value
+        return [legacy_construct_type(entry, args[0]) for entry in value]
+
+    if origin == float:
+        if isinstance(value, int):
+            coerced = float(value)
+            return value if coerced != value else coerced
+        return value
+
+    for parsed, parse in ((_models.datetime, parse_datetime), (_models.date, parse_date)):
+        if type_ == parsed:
+            try:
+                return parse(value)
+            except Exception:
+                return value
+
+    return value
+
+
+DECODERS: Tuple[Tuple[str, Callable[[Any, Any], Any]], ...] = (
+    ("legacy", legacy_construct_type),
+    ("neu", lambda value, type_: _models.construct_type(value=value, type_=type_)),
+)
+
+# --------------------------------------------------------------------------- #
+# Synthetische Antworten
+# --------------------------------------------------------------------------- #
+def _chunk(delta: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion.chunk",
+        "created": 1700000000,
+        "model": "gpt-4o-mini",
+        "system_fingerprint": "fp_bench",
+        "choices": [{"index": 0, "delta": delta, "logprobs": None, "finish_reason": None}],
+    }
+
+
+def _cases(chunks: int, items: int) -> List[Tuple[str, Any, List[Any]]]:
+    """(Name, Zieltyp, Werte) – gezählt wird je Wert."""
+    text = [_chunk({"content": f" tok{i}"}) for i in range(chunks)]
+    tool = [_chunk({"tool_calls": [{"index": 0, "function": {"arguments": f'"a{i}'}}]}) for i in range(chunks)]
+    files = {
+        "object": "list",
+        "data": [
+            {"id": f"file-{i}", "object": "file", "bytes": 1024 + i, "created_at": 1700000000,
+             "filename": f"batch-{i}.jsonl", "purpose": "batch", "status": "processed"}
+            for i in range(items)
+        ],
+        "has_more": False,
+    }
+    models = {
+        "object": "list",
+        "data": [{"id": f"model-{i}", "object": "model", "created": 1700000000, "owned_by": "openai"}
+                 for i in range(items)],
+    }
+    return [
+        ("chunks", ChatCompletionChunk, text),
+        ("tool-chunks", ChatCompletionChunk, tool),
+        ("files.list", SyncCursorPage[FileObject], [files]),
+        ("models.list", SyncPage[Model], [models]),
+    ]
+
+# --------------------------------------------------------------------------- #
+# Messung
+# --------------------------------------------------------------------------- #
+def _seconds(construct: Callable[[Any, Any], Any], type_: Any, values: List[Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            construct(value, type_)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark von construct_type.")
+    parser.add_argument("-c", "--chunks", type=int, default=20000, help="Anzahl Stream‑Chunks je Messung.")
+    parser.add_argument("-n", "--items", type=int, default=1000, help="Einträge je Listen‑Antwort.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Wiederholungen (bester Lauf zählt).")
+    parser.add_argument("--no-legacy", action="store_true", help="Die frühere Implementierung nicht mitmessen.")
+    args = parser.parse_args()
+
+    decoders = DECODERS[1:] if args.no_legacy else DECODERS
+
+    print(f"{'antwort':12} {'impl.':7} {'objekte/s':>12} {'ms gesamt':>10} {'faktor':>7}")
+    for name, type_, values in _cases(args.chunks, args.items):
+        if not args.no_legacy and legacy_construct_type(values[0], type_) != DECODERS[1][1](values[0], type_):
+            raise SystemExit(f"{name}: legacy und neu liefern unterschiedliche Objekte")
+        # Objekte = Chunks bzw. Listeneinträge
+        objects = len(values) if len(values) > 1 else args.items
+        baseline = None
+        for label, construct in decoders:
+            seconds = _seconds(construct, type_, values, args.repeat)
+            baseline = baseline or seconds
+            print(f"{name:12} {label:7} {objects / seconds:12,.0f} {seconds * 1e3:10.1f} {baseline / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# benchmarks/bench_sse.py
+"""
+Mikro‑Benchmark des `SSEDecoder` im mitgelieferten OpenAI‑SDK
+(``samples/OpenAI_callOutOfJavaFrameset/openai``).
+
+Gemessen werden Events/s und MB/s auf synthetischen Streams, die in
+Netzwerk‑Häppchen fester Größe zerlegt sind:
+
+* ``deltas``     – viele kleine ``chat.completion.chunk``‑Events
+  (typischer Token‑Stream)
+* ``multiline``  – wenige große Events aus vielen ``data:``‑Zeilen (hier war
+  der alte Decoder quadratisch in der Event‑Größe)
+
+Zum Vergleich läuft der frühere Decoder (``bytes += line`` je Zeile,
+danach erneutes Zerlegen jedes Events) als ``legacy`` mit.
+
+Aufruf::
+
+    python benchmarks/bench_sse.py                       # 8 MB, Häppchen 64 B / 1 KiB / 16 KiB
+    python benchmarks/bench_sse.py --mb 32 --chunk 4096 --event-kib 512
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterator, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "samples" / "OpenAI_callOutOfJavaFrameset"))
+
+from openai._streaming import ServerSentEvent, SSEDecoder   # noqa: E402
+
+# --------------------------------------------------------------------------- #
+# Früherer Decoder (Referenz)
+# --------------------------------------------------------------------------- #
+class LegacySSEDecoder(SSEDecoder):
+    """Der Decoder vor der Umstellung auf den Zeilen‑Puffer."""
+
+    def iter_bytes(self, iterator: Iterator[bytes]) -> Iterator[ServerSentEvent]:
+        for chunk in self._iter_chunks(iterator):
+            for raw_line in chunk.splitlines():
+                sse = self.decode(raw_line.decode("utf-8"))
+                if sse:
+                    yield sse
+
+    def _iter_chunks(self, iterator: Iterator[bytes]) -> Iterator[bytes]:
+        data = b""
+        for chunk in iterator:
+            for line in chunk.splitlines(keepends=True):
+                data += line
+                if data.endswith((b"\r\r", b"\n\n", b"\r\n\r\n")):
+                    yield data
+                    data = b""
+        if data:
+            yield data
+
+    async def aiter_bytes(self, iterator: AsyncIterator[bytes]) -> AsyncIterator[ServerSentEvent]:
+        data = b""
+        async for chunk in iterator:
+            for line in chunk.splitlines(keepends=True):
+                data += line
+                if data.endswith((b"\r\r", b"\n\n", b"\r\n\r\n")):
+                    for raw_line in data.splitlines():
+                        sse = self.decode(raw_line.decode("utf-8"))
+                        if sse:
+                            yield sse
+                    data = b""
+        for raw_line in data.splitlines():
+            sse = self.decode(raw_line.decode("utf-8"))
+            if sse:
+                yield sse
+
+DECODERS: Tuple[Tuple[str, Callable[[], SSEDecoder]], ...] = (
+    ("legacy", LegacySSEDecoder),
+    ("neu", SSEDecoder),
+)
+
+# --------------------------------------------------------------------------- #
+# Synthetische Streams
+# --------------------------------------------------------------------------- #
+def _deltas(size: int) -> Tuple[bytes, int]:
+    """Token‑Stream: ein kurzes Delta je Event, bis `size` Bytes erreicht sind."""
+    events: List[bytes] = []
+    total = 0
+    i = 0
+    while total < size:
+        chunk = {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion.chunk",
+            "created": 1700000000,
+            "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "delta": {"content": f" tok{i}"}, "finish_reason": None}],
+        }
+        event = b"data: " + json.dumps(chunk).encode() + b"\n\n"
+        events.append(event)
+        total += len(event)
+        i += 1
+    events.append(b"data: [DONE]\n\n")
+    return b"".join(events), len(events)
+
+
+def _multiline(size: int, event_size: int) -> Tuple[bytes, int]:
+    """Große Events aus 64‑Byte‑Zeilen (``data:`` je Zeile, CRLF‑Zeilenenden)."""
+    line = b"data: " + b"x" * 56 + b"\r\n"
+    lines_per_event = max(1, event_size // len(line))
+    event = line * lines_per_event + b"\r\n"
+    count = max(1, size // len(event))
+    return event * count, count
+
+
+def _split(data: bytes, chunk_size: int) -> List[bytes]:
+    return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+# --------------------------------------------------------------------------- #
+# Messung
+# --------------------------------------------------------------------------- #
+def _measure_sync(factory: Callable[[], SSEDecoder], chunks: List[bytes], repeat: int) -> Tuple[float, int]:
+    best = float("inf")
+    events = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        events = sum(1 for _ in factory().iter_bytes(iter(chunks)))
+        best = min(best, time.perf_counter() - start)
+    return best, events
+
+
+def _measure_async(factory: Callable[[], SSEDecoder], chunks: List[bytes], repeat: int) -> Tuple[float, int]:
+    async def source() -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+
+    async def run() -> Tuple[float, int]:
+        best = float("inf")
+        events = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            events = 0
+            async for _ in factory().aiter_bytes(source()):
+                events += 1
+            best = min(best, time.perf_counter() - start)
+        return best, events
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mikro‑Benchmark des SSEDecoder.")
+    parser.add_argument("--mb", type=float, default=8.0, help="Größe je Stream in MB.")
+    parser.add_argument("--chunk", type=int, action="append",
+                        help="Häppchen‑Größe in Bytes (mehrfach möglich; Standard 64, 1024, 16384).")
+    parser.add_argument("--event-kib", type=int, default=256, help="Event‑Größe für 'multiline' in KiB.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Wiederholungen (bester Lauf zählt).")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="aiter_bytes statt iter_bytes messen.")
+    parser.add_argument("--no-legacy", action="store_true", help="Den früheren Decoder nicht mitmessen.")
+    args = parser.parse_args()
+
+    size = int(args.mb * 1e6)
+    streams = {
+        "deltas": _deltas(size),
+        "multiline": _multiline(size, args.event_kib * 1024),
+    }
+    measure = _measure_async if args.use_async else _measure_sync
+    decoders = DECODERS[1:] if args.no_legacy else DECODERS
+
+    print(f"{'stream':10} {'häppchen':>9} {'decoder':8} {'events':>8} {'events/s':>12} {'MB/s':>8} {'faktor':>7}")
+    for name, (data, expected) in streams.items():
+        for chunk_size in args.chunk or (64, 1024, 16384):
+            chunks = _split(data, chunk_size)
+            baseline = None
+            for label, factory in decoders:
+                seconds, events = measure(factory, chunks, args.repeat)
+                if events != expected:
+                    raise SystemExit(f"{label}: {events} Events statt {expected} ({name}, {chunk_size} B)")
+                baseline = baseline or seconds
+                print(
+                    f"{name:10} {chunk_size:9d} {label:8} {events:8d} {events / seconds:12,.0f} "
+                    f"{len(data) / seconds / 1e6:8.1f} {baseline / seconds:6.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# benchmarks/bench_startup.py
+"""
+Misst die Startzeit des **LLMHandler** je Backend in frischen Prozessen.
+
+Für jedes Backend werden drei Phasen gemessen:
+
+* ``import``  – ``import LLMHandler``
+* ``init``    – ``LLMHandler(<backend>)`` (soll nichts nachladen)
+* ``client``  – erster Zugriff auf ``handler.client`` (Backend‑Import + Client)
+
+Zusätzlich wird über ``python -X importtime`` ermittelt, welche Module beim
+ersten Client‑Zugriff am meisten Zeit kosten. Nicht installierte Backends
+werden übersprungen.
+
+Aufruf::
+
+    python benchmarks/bench_startup.py               # alle Backends, 5 Läufe
+    python benchmarks/bench_startup.py -b openai -n 20 --top 15
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+BACKENDS = ("ollama", "openai", "gemini")
+
+# Läuft im Kind‑Prozess; gibt die Phasen in Millisekunden aus.
+_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import LLMHandler
+t1 = time.perf_counter()
+handler = LLMHandler.LLMHandler(sys.argv[1])
+t2 = time.perf_counter()
+handler.client
+t3 = time.perf_counter()
+print("%.3f %.3f %.3f" % ((t1 - t0) * 1e3, (t2 - t1) * 1e3, (t3 - t2) * 1e3))
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    # Dummy‑Schlüssel, damit die Clients ohne .env erzeugt werden können
+    env.setdefault("OPENAI_API_KEY", "sk-bench")
+    env.setdefault("GEMINI_API_KEY", "bench")
+    return env
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, env=_env(), capture_output=True, text=True
+    )
+
+
+def _probe(backend: str) -> Optional[Tuple[float, float, float, float]]:
+    """Ein Lauf: (import, init, client, Gesamt‑Wandzeit) in ms oder `None`."""
+    started = time.perf_counter()
+    proc = _run(["-c", _PROBE, backend])
+    wall = (time.perf_counter() - started) * 1e3
+    if proc.returncode != 0:
+        return None
+    imp, init, client = (float(x) for x in proc.stdout.split())
+    return imp, init, client, wall
+
+
+def _top_imports(backend: str, top: int) -> List[Tuple[int, str]]:
+    """Teuerste Top‑Level‑Importe (kumulativ, µs) laut `-X importtime`."""
+    proc = _run(["-X", "importtime", "-c", _PROBE, backend])
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[12:].split("|"))
+        if not name.startswith(" "):   # nur Top‑Level (nicht eingerückt)
+            rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def _cli_help() -> float:
+    started = time.perf_counter()
+    _run(["dummy.py", "--help"])
+    return (time.perf_counter() - started) * 1e3
+
+
+def _fmt(values: List[float]) -> str:
+    return f"{statistics.median(values):8.1f} (min {min(values):7.1f})"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Startzeit des LLMHandler je Backend.")
+    parser.add_argument("-b", "--backend", choices=BACKENDS, action="append",
+                        help="Nur diese Backends messen (mehrfach möglich).")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="Läufe pro Backend.")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Anzahl der teuersten Importe je Backend (0 = aus).")
+    args = parser.parse_args()
+
+    print(f"{'backend':8} {'import ms':>24} {'init ms':>24} {'client ms':>24} {'wall ms':>24}")
+    for backend in args.backend or BACKENDS:
+        runs = [r for r in (_probe(backend) for _ in range(args.runs)) if r is not None]
+        if not runs:
+            print(f"{backend:8} übersprungen (Backend nicht installiert?)")
+            continue
+        columns = list(zip(*runs))
+        print(f"{backend:8} " + " ".join(_fmt(list(col)) for col in columns))
+        if args.top:
+            for cumulative, name in _top_imports(backend, args.top):
+                print(f"{'':8}   {cumulative / 1e3:8.1f} ms  {name.strip()}")
+
+    helps = [_cli_help() for _ in range(args.runs)]
+    print(f"\ndummy.py --help: {_fmt(helps)} ms")
+
+
+if __name__ == "__main__":
+    main()
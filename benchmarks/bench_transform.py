@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# benchmarks/bench_transform.py
+"""
+Benchmark von `maybe_transform` im mitgelieferten OpenAI‑SDK
+(``samples/OpenAI_callOutOfJavaFrameset/openai``) – der Umwandlung der
+Request‑Parameter (Aliase, Formate, Pydantic‑Objekte) vor jedem Aufruf.
+
+Gemessen wird ``chat.completions.create`` mit langen ``messages``‑Listen:
+
+* ``text``   – abwechselnd User‑/Assistant‑Nachrichten mit Text‑Inhalt
+* ``parts``  – User‑Nachrichten mit Inhalts‑Teilen (Text + Bild‑URL)
+* ``tools``  – Assistant‑Tool‑Calls und Tool‑Antworten, dazu Tool‑Definitionen
+* ``tuples`` – wie ``parts``, die Inhalts‑Teile aber als Tupel: solche Daten
+  müssen umgewandelt werden, hier läuft also der volle (vorbereitete) Durchlauf
+
+Zum Vergleich läuft die frühere Implementierung (Typ‑Inspektion und
+``get_type_hints`` bei jedem Aufruf) als ``legacy`` mit; beide Ergebnisse
+werden vorab auf Gleichheit geprüft. Mit ``--async`` wird
+``async_maybe_transform`` gemessen.
+
+Aufruf::
+
+    python benchmarks/bench_transform.py                 # 10, 100, 1000 Nachrichten
+    python benchmarks/bench_transform.py -m 5000 -r 1 --async
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "samples" / "OpenAI_callOutOfJavaFrameset"))
+
+import pydantic                                                  # noqa: E402
+from typing_extensions import get_args, get_type_hints           # noqa: E402
+
+from openai._compat import get_origin, is_typeddict, model_dump  # noqa: E402
+from openai._utils import _transform                             # noqa: E402
+from openai._utils import is_iterable, is_list, is_mapping       # noqa: E402
+from openai._utils._typing import (                              # noqa: E402
+    extract_type_arg, is_iterable_type, is_list_type, is_union_type, strip_annotated_type,
+)
+from openai.types.chat import completion_create_params           # noqa: E402
+
+PARAMS = completion_create_params.CompletionCreateParamsNonStreaming
+KINDS = ("text", "parts", "tools", "tuples")
+
+# --------------------------------------------------------------------------- #
+# Frühere Implementierung (Referenz)
+# --------------------------------------------------------------------------- #
+def legacy_transform(data: Any, annotation: Any, inner_type: Any = None) -> Any:
+    """`_transform_recursive` vor den vorbereiteten Plänen."""
+    if inner_type is None:
+        inner_type = annotation
+    stripped_type = strip_annotated_type(inner_type)
+    origin = get_origin(stripped_type) or stripped_type
+    if is_typeddict(stripped_type) and is_mapping(data):
+        annotations = get_type_hints(stripped_type, include_extras=True)
+        result: Dict[str, Any] = {}
+        for key, value in data.items():
+            type_ = annotations.get(key)
+            if type_ is None:
+                result[key] = value
+            else:
+                result[_transform._maybe_transform_key(key, type_)] = legacy_transform(value, type_)
+        return result
+    if origin == dict and is_mapping(data):
+        items_type = get_args(stripped_type)[1]
+        return {key: legacy_transform(value, items_type) for key, value in data.items()}
+    if (is_list_type(stripped_type) and is_list(data)) or (
+        is_iterable_type(stripped_type) and is_iterable(data) and not isinstance(data, str)
+    ):
+        if isinstance(data, dict):
+            return data
+        inner_type = extract_type_arg(stripped_type, 0)
+        return [legacy_transform(d, annotation, inner_type) for d in data]
+    if is_union_type(stripped_type):
+        for subtype in get_args(stripped_type):
+            data = legacy_transform(data, annotation, subtype)
+        return data
+    if isinstance(data, pydantic.BaseModel):
+        return model_dump(data, exclude_unset=True, mode="json")
+    annotated_type = _transform._get_annotated_type(annotation)
+    if annotated_type is None:
+        return data
+    for info in get_args(annotated_type)[1:]:
+        if isinstance(info, _transform.PropertyInfo) and info.format is not None:
+            return _transform._format_data(data, info.format, info.format_template)
+    return data
+
+
+def _run_async(data: Any, type_: Any) -> Any:
+    return asyncio.run(_transform.async_maybe_transform(data, type_))
+
+
+IMPLEMENTATIONS: Tuple[Tuple[str, Callable[[Any, Any], Any]], ...] = (
+    ("legacy", legacy_transform),
+    ("neu", _transform.maybe_transform),
+)
+
+# --------------------------------------------------------------------------- #
+# Synthetische Requests
+# --------------------------------------------------------------------------- #
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": f"tool_{i}",
+            "description": "Liefert Daten.",
+            "parameters": {"type": "object", "properties": {"q": {"type": "string"}}, "required": ["q"]},
+            "strict": True,
+        },
+    }
+    for i in range(8)
+]
+
+
+def _messages(kind: str, count: int) -> List[Dict[str, Any]]:
+    messages: List[Dict[str, Any]] = [{"role": "system", "content": "Du bist ein hilfreicher Assistent."}]
+    for i in range(count):
+        if kind == "text":
+            role = "user" if i % 2 == 0 else "assistant"
+            messages.append({"role": role, "content": f"Nachricht {i} " * 8})
+        elif kind in ("parts", "tuples"):
+            parts = [
+                {"type": "text", "text": f"Was zeigt Bild {i}?"},
+                {"type": "image_url", "image_url": {"url": f"https://example.com/{i}.png", "detail": "low"}},
+            ]
+            messages.append({"role": "user", "content": parts if kind == "parts" else tuple(parts)})
+        elif i % 2 == 0:
+            call = {"id": f"call_{i}", "type": "function", "function": {"name": "tool_0", "arguments": '{"q": "x"}'}}
+            messages.append({"role": "assistant", "content": None, "tool_calls": [call]})
+        else:
+            messages.append({"role": "tool", "tool_call_id": f"call_{i - 1}", "content": "Ergebnis"})
+    return messages
+
+
+def _params(kind: str, count: int) -> Dict[str, Any]:
+    params: Dict[str, Any] = {
+        "messages": _messages(kind, count),
+        "model": "gpt-4o-mini",
+        "temperature": 0.2,
+        "max_completion_tokens": 512,
+        "metadata": {"lauf": "benchmark"},
+    }
+    if kind == "tools":
+        params["tools"] = TOOLS
+        params["tool_choice"] = "auto"
+    return params
+
+# --------------------------------------------------------------------------- #
+# Messung
+# --------------------------------------------------------------------------- #
+def _seconds(transform: Callable[[Any, Any], Any], params: Dict[str, Any], calls: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            transform(params, PARAMS)
+        best = min(best, time.perf_counter() - start)
+    return best / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark von maybe_transform.")
+    parser.add_argument("-m", "--messages", type=int, action="append",
+                        help="Nachrichten je Request (mehrfach möglich; Standard 10, 100, 1000).")
+    parser.add_argument("-k", "--kind", choices=KINDS, action="append", help="Nur diese Requests messen.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Wiederholungen (bester Lauf zählt).")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="async_maybe_transform statt maybe_transform messen.")
+    parser.add_argument("--no-legacy", action="store_true", help="Die frühere Implementierung nicht mitmessen.")
+    args = parser.parse_args()
+
+    implementations = list(IMPLEMENTATIONS[1:] if args.no_legacy else IMPLEMENTATIONS)
+    if args.use_async:
+        implementations[-1] = ("neu/async", _run_async)
+
+    print(f"{'request':8} {'nachr.':>7} {'impl.':9} {'µs/aufruf':>11} {'aufrufe/s':>11} {'faktor':>7}")
+    for kind in args.kind or KINDS:
+        for count in args.messages or (10, 100, 1000):
+            params = _params(kind, count)
+            if not args.no_legacy and legacy_transform(params, PARAMS) != implementations[-1][1](params, PARAMS):
+                raise SystemExit(f"{kind}: legacy und neu liefern unterschiedliche Ergebnisse")
+            # etwa gleich viele Nachrichten je Messung, unabhängig von der Request‑Größe
+            calls = max(1, 2000 // (count + 1))
+            baseline = None
+            for label, transform in implementations:
+                seconds = _seconds(transform, params, calls, args.repeat)
+                baseline = baseline or seconds
+                print(f"{kind:8} {count:7d} {label:9} {seconds * 1e6:11.1f} {1 / seconds:11,.0f} {baseline / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
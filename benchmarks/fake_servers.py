@@ -0,0 +1,472 @@
+#!/usr/bin/env python
+# benchmarks/fake_servers.py
+"""
+Lokaler Ersatz‑Server für Benchmarks des **LLMHandler** – ohne Netz, GPU
+oder API‑Schlüssel.
+
+Ein Prozess spricht alle drei Protokolle (unterschieden am Pfad):
+
+* Ollama  – ``POST /api/generate``, ``POST /api/chat`` (NDJSON‑Stream)
+* OpenAI  – ``POST /v1/chat/completions`` (auch SSE mit ``include_usage``)
+* Gemini  – ``POST /v1beta/models/<m>:generateContent`` bzw.
+  ``:streamGenerateContent`` (REST, gestreamtes JSON‑Array oder ``alt=sse``)
+
+Das Verhalten ist einstellbar: `latency` (Zeit bis zum ersten Token),
+`tokens_per_second`, `completion_tokens` und `error_rate` (Anteil der
+Anfragen, die mit `error_status` scheitern; 429 mit ``retry-after``).
+Die Antworten enthalten Usage‑Blöcke und – wie Ollama – Server‑Zeiten.
+
+Einzeln starten::
+
+    python benchmarks/fake_servers.py --port 11434 --latency 0.2 --rate 50
+    OLLAMA_HOST=http://127.0.0.1:11434 python dummy.py -m ollama -p "Hallo"
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+_WORDS = (
+    "Lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua"
+).split()
+
+# --------------------------------------------------------------------------- #
+# Server
+# --------------------------------------------------------------------------- #
+class FakeLLMServer:
+    """
+    HTTP‑Server in einem Hintergrund‑Thread (ein Thread pro Verbindung).
+
+    Parameters
+    ----------
+    host, port : str, int
+        Adresse; Port 0 wählt einen freien Port (siehe `url`).
+    latency : float
+        Sekunden bis zum ersten Token.
+    tokens_per_second : float
+        Generierungs‑Rate nach dem ersten Token.
+    completion_tokens : int
+        Länge jeder Antwort in Tokens (Wörtern); `max_tokens` kürzt.
+    error_rate : float
+        Anteil der Anfragen (0–1), die mit `error_status` beantwortet werden.
+    error_status : int
+        HTTP‑Status der eingestreuten Fehler (z. B. 500 oder 429).
+    seed : int | None
+        Startwert für die Fehler‑Auswahl (reproduzierbare Läufe).
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.05,
+        tokens_per_second: float = 500.0,
+        completion_tokens: int = 32,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.fake = self   # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-llm-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.requests = self.errors = self.max_in_flight = 0
+
+    # --------------------------------------------------------------------------- #
+    # Interna (vom Request‑Handler genutzt)
+    # --------------------------------------------------------------------------- #
+    def _begin(self) -> bool:
+        """Zählt die Anfrage und entscheidet, ob sie scheitern soll."""
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            return fail
+
+    def _end(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _tokens(self, max_tokens: Optional[int]) -> List[str]:
+        n = self.completion_tokens if not max_tokens else min(max_tokens, self.completion_tokens)
+        return [_WORDS[i % len(_WORDS)] + " " for i in range(n)]
+
+    def _paced(self, tokens: List[str]) -> Iterator[str]:
+        """Liefert die Tokens im eingestellten Takt (erstes nach `latency`)."""
+        time.sleep(self.latency)
+        interval = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        for index, token in enumerate(tokens):
+            if index and interval:
+                time.sleep(interval)
+            yield token
+
+    def _generation_time(self, n_tokens: int) -> float:
+        rate = self.tokens_per_second
+        return self.latency + (max(n_tokens - 1, 0) / rate if rate > 0 else 0.0)
+
+# --------------------------------------------------------------------------- #
+# Request‑Handler
+# --------------------------------------------------------------------------- #
+def _count_words(value: Any) -> int:
+    """Grobe Prompt‑Token‑Zählung über alle Texte einer Anfrage."""
+    if isinstance(value, str):
+        return len(value.split())
+    if isinstance(value, dict):
+        return sum(_count_words(v) for k, v in value.items() if k not in ("images", "inline_data", "inlineData"))
+    if isinstance(value, list):
+        return sum(_count_words(v) for v in value)
+    return 0
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024   # Standard 5 → Verbindungs‑Abbrüche bei hoher Parallelität
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # Keep‑Alive wie bei echten APIs
+
+    @property
+    def fake(self) -> FakeLLMServer:
+        return self.server.fake   # type: ignore[attr-defined]
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    # ----- Antwort‑Helfer ------------------------------------------------
+    def _send_json(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_chunked(self, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+    def _chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _end_chunked(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    # ----- Routing -------------------------------------------------------
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path == "/api/version":
+            self._send_json(200, {"version": "0.0.0-fake"})
+        elif path == "/api/tags":
+            self._send_json(200, {"models": []})
+        else:
+            self._send_json(404, {"error": f"unknown path {path}"})
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        query = parse_qs(url.query)
+
+        if url.path in ("/api/generate", "/api/chat"):
+            protocol = "ollama"
+        elif url.path.endswith("/chat/completions"):
+            protocol = "openai"
+        elif ":generateContent" in url.path or ":streamGenerateContent" in url.path:
+            protocol = "gemini"
+        else:
+            self._send_json(404, {"error": f"unknown path {url.path}"})
+            return
+
+        fail = self.fake._begin()
+        try:
+            if fail:
+                self._send_error(protocol)
+            elif protocol == "ollama":
+                self._ollama(url.path, body)
+            elif protocol == "openai":
+                self._openai(body)
+            else:
+                self._gemini(url.path, body, query)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        finally:
+            self.fake._end()
+
+    def _send_error(self, protocol: str) -> None:
+        status = self.fake.error_status
+        time.sleep(self.fake.latency)
+        message = f"Fake‑Fehler (HTTP {status})"
+        headers = {"retry-after-ms": "50", "retry-after": "0.05"} if status == 429 else None
+        if protocol == "ollama":
+            self._send_json(status, {"error": message}, headers)
+        elif protocol == "openai":
+            code = "rate_limit_exceeded" if status == 429 else "server_error"
+            self._send_json(status, {"error": {"message": message, "type": code, "code": code}}, headers)
+        else:
+            self._send_json(status, {"error": {"code": status, "message": message, "status": "INTERNAL"}}, headers)
+
+    # ----- Ollama --------------------------------------------------------
+    def _ollama(self, path: str, body: Dict[str, Any]) -> None:
+        fake = self.fake
+        options = body.get("options") or {}
+        tokens = fake._tokens(options.get("num_predict"))
+        prompt_tokens = _count_words(body.get("messages") or body.get("prompt") or "")
+        prompt_tokens += len(body.get("context") or ())
+        chat = path == "/api/chat"
+
+        def part(text: str, done: bool) -> Dict[str, Any]:
+            data: Dict[str, Any] = {
+                "model": body.get("model", "fake"),
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "done": done,
+            }
+            if chat:
+                data["message"] = {"role": "assistant", "content": text}
+            else:
+                data["response"] = text
+            return data
+
+        def final() -> Dict[str, Any]:
+            eval_ns = int(max(len(tokens) - 1, 0) / fake.tokens_per_second * 1e9) if fake.tokens_per_second > 0 else 0
+            data = part("", True)
+            data.update(
+                done_reason="length" if len(tokens) < fake.completion_tokens else "stop",
+                total_duration=int(fake._generation_time(len(tokens)) * 1e9),
+                load_duration=0,
+                prompt_eval_count=prompt_tokens,
+                prompt_eval_duration=int(fake.latency * 1e9),
+                eval_count=len(tokens),
+                eval_duration=eval_ns,
+            )
+            if not chat:
+                data["context"] = list(range(prompt_tokens + len(tokens)))
+            return data
+
+        if body.get("stream", True):
+            self._start_chunked("application/x-ndjson")
+            for token in fake._paced(tokens):
+                self._chunk(json.dumps(part(token, False)).encode("utf-8") + b"\n")
+            self._chunk(json.dumps(final()).encode("utf-8") + b"\n")
+            self._end_chunked()
+            return
+        time.sleep(fake._generation_time(len(tokens)))
+        data = final()
+        text = "".join(tokens)
+        if chat:
+            data["message"]["content"] = text
+        else:
+            data["response"] = text
+        self._send_json(200, data)
+
+    # ----- OpenAI --------------------------------------------------------
+    def _openai(self, body: Dict[str, Any]) -> None:
+        fake = self.fake
+        tokens = fake._tokens(body.get("max_completion_tokens") or body.get("max_tokens"))
+        finish = "length" if len(tokens) < fake.completion_tokens else "stop"
+        usage = {
+            "prompt_tokens": _count_words(body.get("messages")),
+            "completion_tokens": len(tokens),
+            "prompt_tokens_details": {"cached_tokens": 0},
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        model = body.get("model", "fake")
+        headers = {
+            "x-ratelimit-limit-requests": "100000",
+            "x-ratelimit-remaining-requests": "99999",
+            "x-ratelimit-limit-tokens": "100000000",
+            "x-ratelimit-remaining-tokens": "99999999",
+        }
+
+        if body.get("stream"):
+            def chunk(delta: Dict[str, Any], finish_reason: Optional[str]) -> bytes:
+                data = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                }
+                return b"data: " + json.dumps(data).encode("utf-8") + b"\n\n"
+
+            self._start_chunked("text/event-stream", headers)
+            first = True
+            for token in fake._paced(tokens):
+                delta = {"role": "assistant", "content": token} if first else {"content": token}
+                first = False
+                self._chunk(chunk(delta, None))
+            self._chunk(chunk({}, finish))
+            if (body.get("stream_options") or {}).get("include_usage"):
+                data = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [],
+                    "usage": usage,
+                }
+                self._chunk(b"data: " + json.dumps(data).encode("utf-8") + b"\n\n")
+            self._chunk(b"data: [DONE]\n\n")
+            self._end_chunked()
+            return
+
+        time.sleep(fake._generation_time(len(tokens)))
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": finish,
+                "logprobs": None,
+            }],
+            "usage": usage,
+        }, headers)
+
+    # ----- Gemini --------------------------------------------------------
+    def _gemini(self, path: str, body: Dict[str, Any], query: Dict[str, List[str]]) -> None:
+        fake = self.fake
+        config = body.get("generationConfig") or body.get("generation_config") or {}
+        tokens = fake._tokens(config.get("maxOutputTokens") or config.get("max_output_tokens"))
+        model = path.rsplit("/", 1)[-1].split(":", 1)[0]
+        # Die REST‑Transporte der Google‑Bibliotheken fordern Enums als Zahlen an
+        as_int = any("enum-encoding=int" in value for value in query.get("$alt", []))
+        stop = 1 if as_int else "STOP"
+        limit = 2 if as_int else "MAX_TOKENS"
+        finish = limit if len(tokens) < fake.completion_tokens else stop
+        prompt_tokens = _count_words(body.get("contents"))
+
+        def response(text: str, finish_reason: Any, n_tokens: int) -> Dict[str, Any]:
+            candidate: Dict[str, Any] = {
+                "content": {"parts": [{"text": text}], "role": "model"},
+                "index": 0,
+            }
+            if finish_reason is not None:
+                candidate["finishReason"] = finish_reason
+            return {
+                "candidates": [candidate],
+                "usageMetadata": {
+                    "promptTokenCount": prompt_tokens,
+                    "candidatesTokenCount": n_tokens,
+                    "totalTokenCount": prompt_tokens + n_tokens,
+                },
+                "modelVersion": model,
+            }
+
+        if ":streamGenerateContent" in path:
+            sse = query.get("alt", [""])[0] == "sse"
+            self._start_chunked("text/event-stream" if sse else "application/json")
+            if not sse:
+                self._chunk(b"[")
+            for index, token in enumerate(fake._paced(tokens)):
+                last = index == len(tokens) - 1
+                data = json.dumps(response(token, finish if last else None, index + 1)).encode("utf-8")
+                if sse:
+                    self._chunk(b"data: " + data + b"\r\n\r\n")
+                else:
+                    self._chunk((b",\r\n" if index else b"") + data)
+            if not sse:
+                self._chunk(b"]")
+            self._end_chunked()
+            return
+
+        time.sleep(fake._generation_time(len(tokens)))
+        self._send_json(200, response("".join(tokens), finish, len(tokens)))
+
+# --------------------------------------------------------------------------- #
+# CLI
+# --------------------------------------------------------------------------- #
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake‑Server für Ollama, OpenAI und Gemini.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.05, help="Sekunden bis zum ersten Token.")
+    parser.add_argument("--rate", type=float, default=500.0, help="Tokens pro Sekunde.")
+    parser.add_argument("--tokens", type=int, default=32, help="Tokens pro Antwort.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil fehlerhafter Antworten.")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP‑Status der Fehler.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        tokens_per_second=args.rate,
+        completion_tokens=args.tokens,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    print(f"Fake‑LLM‑Server auf {server.url} (Ollama: /api, OpenAI: /v1, Gemini: /v1beta)", flush=True)
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
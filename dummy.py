@@ -25,6 +25,15 @@ Beispielaufrufe:
 
     # 4️⃣ Prompt + Datei + Ausgabe‑Datei + max. 200 Tokens
     python dummy.py -m ollama -p "Was ist..." -F docs.txt -l 200 -O out.txt
+
+    # 5️⃣ Batch: ein Prompt pro Zeile, 16 parallele Anfragen
+    python dummy.py -m openai -b prompts.txt -c 16
+
+    # 6️⃣ Sehr langes Dokument per Map‑Reduce (Chunks à 4000 Tokens)
+    python dummy.py -m ollama -p "Fasse zusammen." -F buch.txt -M 4000
+
+    # 7️⃣ Batch mit gemeinsamer Spezifikation als gecachtem Präfix
+    python dummy.py -m openai -b fragen.txt -P spec.txt
 """
 
 import argparse
@@ -71,6 +80,12 @@ def _parse_args() -> argparse.Namespace:
         type=Path,
         help="Pfad zu einer Text‑Datei, die als Prompt benutzt wird.",
     )
+    group.add_argument(
+        "-b",
+        "--batch",
+        type=Path,
+        help="Pfad zu einer Text‑Datei mit einem Prompt pro Zeile (Batch‑Modus).",
+    )
 
     parser.add_argument(
         "-F",
@@ -80,6 +95,14 @@ def _parse_args() -> argparse.Namespace:
         help="Zusätzliche Dateien (Text‑ oder Bild‑Dateien), die zusammen mit dem Prompt gesendet werden.",
     )
 
+    parser.add_argument(
+        "-P",
+        "--prefix",
+        type=Path,
+        nargs="*",
+        help="Text‑Dateien als statischer Präfix jeder Anfrage (Prompt‑Cache, v. a. im Batch‑Modus).",
+    )
+
     parser.add_argument(
         "-t",
         "--temperature",
@@ -100,7 +123,24 @@ def _parse_args() -> argparse.Namespace:
         "-s",
         "--stream",
         action="store_true",
-        help="Antwort in Stream‑Modus zurückgeben (nur bei Ollama/Gemini).",
+        help="Antwort live ausgeben, sobald die ersten Tokens eintreffen.",
+    )
+
+    parser.add_argument(
+        "-M",
+        "--map-reduce",
+        type=int,
+        metavar="CHUNK_TOKENS",
+        default=None,
+        help="Lange Text‑Dateien in Chunks dieser Token‑Größe zerlegen und per Map‑Reduce beantworten.",
+    )
+
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximale Anzahl paralleler Anfragen (Batch‑ und Map‑Reduce‑Modus).",
     )
 
     parser.add_argument(
@@ -113,17 +153,69 @@ def _parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def _run_batch(handler: LLMHandler, args: argparse.Namespace, files: List[Path]) -> None:
+    """Beantwortet alle Prompts aus `args.batch` parallel und gibt sie geordnet aus."""
+    prompts = [line for line in _read_text_file(args.batch).splitlines() if line.strip()]
+    results = handler.get_answers(
+        prompts,
+        max_concurrency=args.concurrency,
+        files=files,
+        temperature=args.temperature,
+        length=args.length,
+    )
+    failed = 0
+    for item in results:
+        print(f"\n--- Antwort {item.index + 1}/{len(results)} ({item.latency:.2f}s) ---")
+        if item.ok:
+            print(item.answer)
+        else:
+            failed += 1
+            print(f"❌ Fehler: {item.error}", file=sys.stderr)
+    if handler.prefix is not None:
+        stats = handler.prompt_cache_stats
+        print(f"\nPrompt‑Cache: {stats.cached_tokens}/{stats.prompt_tokens} Tokens ({stats.hit_rate:.0%})")
+    if failed:
+        sys.exit(1)
+
+
+def _run_stream(handler: LLMHandler, args: argparse.Namespace, prompt: str, files: List[Path]) -> None:
+    """Gibt die Antwort Delta für Delta aus und zeigt danach die Stream‑Kennzahlen."""
+    stream = handler.stream_answer(
+        prompt,
+        files=files,
+        temperature=args.temperature,
+        length=args.length,
+        output_path=args.output,
+    )
+    print("\n--- Antwort ---")
+    for delta in stream:
+        print(delta, end="", flush=True)
+    print()
+
+    metrics = stream.metrics
+    ttft = metrics.time_to_first_token
+    tps = metrics.tokens_per_second
+    print(f"\nErstes Token nach: {f'{ttft * 1000:.0f} ms' if ttft is not None else '–'}")
+    print(f"Tokens/s: {f'{tps:.1f}' if tps is not None else '–'}")
+
+
 def main() -> None:
     args = _parse_args()
 
-    # Prompt aus Datei oder direktem Argument
-    prompt = args.prompt or _read_text_file(args.file)
+    # Initialisiere den Handler
+    handler = LLMHandler(args.model)
+    if args.prefix:
+        handler.set_prefix(files=args.prefix)
 
     # Alle optionalen Dateien (außer dem Prompt‑Datei)
     files: List[Path] = list(args.files or []) if args.files else []
 
-    # Initialisiere den Handler
-    handler = LLMHandler(args.model)
+    if args.batch:
+        _run_batch(handler, args, files)
+        return
+
+    # Prompt aus Datei oder direktem Argument
+    prompt = args.prompt or _read_text_file(args.file)
 
     # Schöne Rahmen‑Anzeige
     sep = "=" * 70
@@ -141,14 +233,27 @@ def main() -> None:
     print(sep)
 
     try:
-        answer = handler.get_answer(
-            prompt,
-            files=files,
-            temperature=args.temperature,
-            length=args.length,
-            stream=args.stream,
-            output_path=args.output,
-        )
+        if args.stream:
+            _run_stream(handler, args, prompt, files)
+            return
+        if args.map_reduce:
+            answer = handler.map_reduce_answer(
+                prompt,
+                files=files,
+                chunk_tokens=args.map_reduce,
+                max_concurrency=args.concurrency,
+                temperature=args.temperature,
+                length=args.length,
+                output_path=args.output,
+            )
+        else:
+            answer = handler.get_answer(
+                prompt,
+                files=files,
+                temperature=args.temperature,
+                length=args.length,
+                output_path=args.output,
+            )
         print("\n--- Antwort ---")
         print(answer)
     except Exception as exc:
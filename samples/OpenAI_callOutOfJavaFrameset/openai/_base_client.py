@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import sys
-import json
 import time
 import uuid
 import email
@@ -58,7 +57,17 @@ from ._types import (
     HttpxRequestFiles,
     ModelBuilderProtocol,
 )
-from ._utils import SensitiveHeadersFilter, is_dict, is_list, asyncify, is_given, lru_cache, is_mapping
+from ._utils import (
+    SensitiveHeadersFilter,
+    is_dict,
+    is_list,
+    asyncify,
+    is_given,
+    lru_cache,
+    is_mapping,
+    json_loads,
+    encode_json_body,
+)
 from ._compat import PYDANTIC_V2, model_copy, model_dump
 from ._models import GenericModel, FinalRequestOptions, validate_type, construct_type
 from ._response import (
@@ -385,7 +394,7 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
             body = err_text
 
             try:
-                body = json.loads(err_text)
+                body = json_loads(err_text)
                 err_msg = f"Error code: {response.status_code} - {body}"
             except Exception:
                 err_msg = err_text or f"Error code: {response.status_code}"
@@ -502,8 +511,16 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
             # work around https://github.com/encode/httpx/discussions/2880
             kwargs["extensions"] = {"sni_hostname": prepared_url.host.replace("_", "-")}
 
+        # httpx ignores `json` if there are `data` or `files`, otherwise it is encoded as compact JSON;
+        # with `orjson` installed the same bytes are produced here, without the standard `json` encoder
+        if is_given(json_data) and json_data is not None and not (kwargs.get("data") or files):
+            content = encode_json_body(json_data)
+            if content is not None:
+                kwargs["content"] = content
+                json_data = None
+
         # TODO: report this error to httpx
-        return self._client.build_request(  # pyright: ignore[reportUnknownMemberType]
+        request = self._client.build_request(  # pyright: ignore[reportUnknownMemberType]
             headers=headers,
             timeout=self.timeout if isinstance(options.timeout, NotGiven) else options.timeout,
             method=options.method,
@@ -517,6 +534,10 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
             files=files,
             **kwargs,
         )
+        if "content" in kwargs:
+            # added by httpx itself for `json`, after `Content-Length`
+            request.headers.setdefault("Content-Type", "application/json")
+        return request
 
     def _serialize_multipartform(self, data: Mapping[object, object]) -> dict[str, object]:
         items = self.qs.stringify_items(
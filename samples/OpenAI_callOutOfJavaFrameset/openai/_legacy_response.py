@@ -24,7 +24,7 @@ import httpx
 import pydantic
 
 from ._types import NoneType
-from ._utils import is_given, extract_type_arg, is_annotated_type, is_type_alias_type
+from ._utils import is_given, response_json, extract_type_arg, is_annotated_type, is_type_alias_type
 from ._models import BaseModel, is_basemodel, add_request_id
 from ._constants import RAW_RESPONSE_HEADER
 from ._streaming import Stream, AsyncStream, is_stream_class_type, extract_stream_chunk_type
@@ -307,7 +307,7 @@ class LegacyAPIResponse(Generic[R]):
         if content_type != "application/json":
             if is_basemodel(cast_to):
                 try:
-                    data = response.json()
+                    data = response_json(response)
                 except Exception as exc:
                     log.debug("Could not read JSON from response data due to %s - %s", type(exc), exc)
                 else:
@@ -329,7 +329,7 @@ class LegacyAPIResponse(Generic[R]):
             # handle the response however you need to.
             return response.text  # type: ignore
 
-        data = response.json()
+        data = response_json(response)
 
         return self._client._process_response_data(
             data=data,
@@ -406,7 +406,9 @@ class HttpxBinaryResponseContent:
         return self.response.charset_encoding
 
     def json(self, **kwargs: Any) -> Any:
-        return self.response.json(**kwargs)
+        if kwargs:
+            return self.response.json(**kwargs)
+        return response_json(self.response)
 
     def read(self) -> bytes:
         return self.response.read()
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import os
 import inspect
+import threading
 from typing import TYPE_CHECKING, Any, Type, Tuple, Union, Generic, TypeVar, Callable, Optional, cast
 from datetime import date, datetime
+from collections import OrderedDict
 from typing_extensions import (
     Unpack,
     Literal,
@@ -211,28 +213,30 @@ class BaseModel(pydantic.BaseModel):
         m = __cls.__new__(__cls)
         fields_values: dict[str, object] = {}
 
-        config = get_model_config(__cls)
-        populate_by_name = (
-            config.allow_population_by_field_name
-            if isinstance(config, _ConfigProtocol)
-            else config.get("populate_by_name")
-        )
+        plan = _get_construct_plan(__cls)
+        populate_by_name = plan.populate_by_name
 
         if _fields_set is None:
             _fields_set = set()
 
-        model_fields = get_model_fields(__cls)
-        for name, field in model_fields.items():
-            key = field.alias
+        for name, alias, field, field_type, default in plan.fields:
+            key = alias
             if key is None or (key not in values and populate_by_name):
                 key = name
 
             if key in values:
-                fields_values[name] = _construct_field(value=values[key], field=field, key=key)
+                value = values[key]
+                if value is not None:
+                    if field_type is None:
+                        raise RuntimeError(f"Unexpected field type is None for {key}")
+                    fields_values[name] = _get_constructor(field_type)(value)
+                else:
+                    fields_values[name] = field_get_default(field) if default is _NO_DEFAULT else default
                 _fields_set.add(name)
             else:
-                fields_values[name] = field_get_default(field)
+                fields_values[name] = field_get_default(field) if default is _NO_DEFAULT else default
 
+        model_fields = plan.model_fields
         _extra = {}
         for key, value in values.items():
             if key not in model_fields:
@@ -380,21 +384,6 @@ class BaseModel(pydantic.BaseModel):
             )
 
 
-def _construct_field(value: object, field: FieldInfo, key: str) -> object:
-    if value is None:
-        return field_get_default(field)
-
-    if PYDANTIC_V2:
-        type_ = field.annotation
-    else:
-        type_ = cast(type, field.outer_type_)  # type: ignore
-
-    if type_ is None:
-        raise RuntimeError(f"Unexpected field type is None for {key}")
-
-    return construct_type(value=value, type_=type_)
-
-
 def is_basemodel(type_: type) -> bool:
     """Returns whether or not the given type is either a `BaseModel` or a union of `BaseModel`"""
     if is_union(type_):
@@ -451,6 +440,53 @@ def construct_type(*, value: object, type_: object) -> object:
 
     If the given value does not match the expected type then it is returned as-is.
     """
+    return _get_constructor(type_)(value)
+
+
+_Constructor = Callable[[object], object]
+
+# Compiled constructors keyed by `id(type_)` rather than by the type itself, as equal typing objects
+# are not interchangeable here: `Union[A, B] == Union[B, A]` but the first variant that can be
+# constructed wins. The type is stored in the entry so that its id cannot be reused while cached.
+#
+# The set of types is not closed (callers may pass dynamically created models or freshly built
+# `List[...]` / `Union[...]` aliases to `construct_type()`), so the cache is a bounded LRU. A weak-keyed
+# map would not help for classes: every compiled constructor references its type, which would keep
+# the key alive. Evicted constructors are simply compiled again on their next use.
+_CONSTRUCTORS: OrderedDict[int, tuple[object, _Constructor]] = OrderedDict()
+_CONSTRUCTORS_MAXSIZE = 4096
+_CONSTRUCTORS_LOCK = threading.Lock()
+
+_PLAIN_TYPES = frozenset({str, int, float, bool, type(None)})
+
+_UNRESOLVED: Any = object()
+
+
+def _get_constructor(type_: object) -> _Constructor:
+    key = id(type_)
+    entry = _CONSTRUCTORS.get(key)
+    if entry is not None:
+        try:
+            _CONSTRUCTORS.move_to_end(key)
+        except KeyError:
+            # evicted by another thread in the meantime, the entry we read is still valid
+            pass
+        return entry[1]
+
+    constructor = _compile_constructor(type_)
+    with _CONSTRUCTORS_LOCK:
+        entry = _CONSTRUCTORS.setdefault(key, (type_, constructor))
+        while len(_CONSTRUCTORS) > _CONSTRUCTORS_MAXSIZE:
+            _CONSTRUCTORS.popitem(last=False)
+    return entry[1]
+
+
+def _compile_constructor(type_: object) -> _Constructor:
+    """Resolves everything `construct_type()` needs to know about the given type once.
+
+    Nested types are compiled lazily, the first time a value actually reaches them, so that
+    recursive types stay finite and unresolved forward references fail at the same point as before.
+    """
 
     # store a reference to the original type we were given before we extract any inner
     # types so that we can properly resolve forward references in `TypeAliasType` annotations
@@ -473,11 +509,69 @@ def construct_type(*, value: object, type_: object) -> object:
     # we need to use the origin class for any types that are subscripted generics
     # e.g. Dict[str, object]
     origin = get_origin(type_) or type_
-    args = get_args(type_)
 
     if is_union(origin):
+        return _compile_union_constructor(type_, original_type=original_type, meta=meta)
+
+    if origin == dict:
+        return _compile_dict_constructor(type_)
+
+    if (
+        not is_literal_type(type_)
+        and inspect.isclass(origin)
+        and (issubclass(origin, BaseModel) or issubclass(origin, GenericModel))
+    ):
+        return _compile_model_constructor(type_)
+
+    if origin == list:
+        return _compile_list_constructor(type_)
+
+    if origin == float:
+        return _construct_float
+
+    if type_ == datetime:
+        return _construct_datetime
+
+    if type_ == date:
+        return _construct_date
+
+    return _construct_as_is
+
+
+def _compile_union_constructor(
+    type_: type, *, original_type: object | None, meta: tuple[Any, ...]
+) -> _Constructor:
+    variants = get_args(type_)
+
+    # with pydantic v2's smart union mode a value whose exact type is one of the plain variants
+    # (or a string matching a literal variant) validates to itself, so validation can be skipped
+    plain_types: frozenset[type] = frozenset()
+    literal_strings: frozenset[str] = frozenset()
+    if PYDANTIC_V2:
+        plain_types = _PLAIN_TYPES.intersection(variants)
+        literal_strings = frozenset(
+            entry
+            for variant in variants
+            if is_literal_type(variant)
+            for entry in get_args(variant)
+            if type(entry) is str
+        )
+
+    validator: _Constructor | None = None
+    discriminator: DiscriminatorDetails | None = None
+    variant_constructors: list[_Constructor] | None = None
+
+    def construct_union(value: object) -> object:
+        nonlocal validator, discriminator, variant_constructors
+
+        value_type = type(value)
+        if value_type in plain_types or (value_type is str and value in literal_strings):
+            return value
+
         try:
-            return validate_type(type_=cast("type[object]", original_type or type_), value=value)
+            if validator is None:
+                validator = _get_validator(cast("type[object]", original_type or type_))
+            return validator(value)
         except Exception:
             pass
 
@@ -495,75 +589,156 @@ def construct_type(*, value: object, type_: object) -> object:
         #
         # without this block, if the data we get is something like `{'kind': 'bar', 'value': 'foo'}` then
         # we'd end up constructing `FooType` when it should be `BarType`.
-        discriminator = _build_discriminated_union_meta(union=type_, meta_annotations=meta)
+        if discriminator is None:
+            # not cached while missing as another `Annotated` use of the same union may add it later
+            discriminator = _build_discriminated_union_meta(union=type_, meta_annotations=meta)
         if discriminator and is_mapping(value):
             variant_value = value.get(discriminator.field_alias_from or discriminator.field_name)
             if variant_value and isinstance(variant_value, str):
                 variant_type = discriminator.mapping.get(variant_value)
                 if variant_type:
-                    return construct_type(type_=variant_type, value=value)
+                    return _get_constructor(variant_type)(value)
 
         # if the data is not valid, use the first variant that doesn't fail while deserializing
-        for variant in args:
+        if variant_constructors is None:
+            variant_constructors = [_get_constructor(variant) for variant in variants]
+        for construct_variant in variant_constructors:
             try:
-                return construct_type(value=value, type_=variant)
+                return construct_variant(value)
             except Exception:
                 continue
 
         raise RuntimeError(f"Could not convert data into a valid instance of {type_}")
 
-    if origin == dict:
+    return construct_union
+
+
+def _compile_dict_constructor(type_: type) -> _Constructor:
+    construct_item: _Constructor | None = None
+
+    def construct_dict(value: object) -> object:
+        nonlocal construct_item
+
         if not is_mapping(value):
             return value
 
-        _, items_type = get_args(type_)  # Dict[_, items_type]
-        return {key: construct_type(value=item, type_=items_type) for key, item in value.items()}
+        if construct_item is None:
+            _, items_type = get_args(type_)  # Dict[_, items_type]
+            construct_item = _get_constructor(items_type)
+        return {key: construct_item(item) for key, item in value.items()}
 
-    if (
-        not is_literal_type(type_)
-        and inspect.isclass(origin)
-        and (issubclass(origin, BaseModel) or issubclass(origin, GenericModel))
-    ):
+    return construct_dict
+
+
+def _compile_model_constructor(type_: type) -> _Constructor:
+    construct = cast(Any, type_).construct
+
+    def construct_model(value: object) -> object:
         if is_list(value):
-            return [cast(Any, type_).construct(**entry) if is_mapping(entry) else entry for entry in value]
+            return [construct(**entry) if is_mapping(entry) else entry for entry in value]
 
         if is_mapping(value):
-            if issubclass(type_, BaseModel):
-                return type_.construct(**value)  # type: ignore[arg-type]
+            return construct(**value)
 
-            return cast(Any, type_).construct(**value)
+        return value
+
+    return construct_model
+
+
+def _compile_list_constructor(type_: type) -> _Constructor:
+    construct_entry: _Constructor | None = None
+
+    def construct_list(value: object) -> object:
+        nonlocal construct_entry
 
-    if origin == list:
         if not is_list(value):
             return value
 
-        inner_type = args[0]  # List[inner_type]
-        return [construct_type(value=entry, type_=inner_type) for entry in value]
+        if construct_entry is None:
+            inner_type = get_args(type_)[0]  # List[inner_type]
+            construct_entry = _get_constructor(inner_type)
+        return [construct_entry(entry) for entry in value]
 
-    if origin == float:
-        if isinstance(value, int):
-            coerced = float(value)
-            if coerced != value:
-                return value
-            return coerced
+    return construct_list
 
-        return value
 
-    if type_ == datetime:
-        try:
-            return parse_datetime(value)  # type: ignore
-        except Exception:
+def _construct_float(value: object) -> object:
+    if isinstance(value, int):
+        coerced = float(value)
+        if coerced != value:
             return value
+        return coerced
 
-    if type_ == date:
-        try:
-            return parse_date(value)  # type: ignore
-        except Exception:
-            return value
+    return value
+
+
+def _construct_datetime(value: object) -> object:
+    try:
+        return parse_datetime(value)  # type: ignore
+    except Exception:
+        return value
 
+
+def _construct_date(value: object) -> object:
+    try:
+        return parse_date(value)  # type: ignore
+    except Exception:
+        return value
+
+
+def _construct_as_is(value: object) -> object:
     return value
 
 
+_NO_DEFAULT: Any = object()
+
+# immutable defaults that `field_get_default()` would return unchanged on every call
+_SHARED_DEFAULT_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+class _ConstructPlan:
+    """What `BaseModel.construct()` needs to know about a model class, resolved once."""
+
+    __slots__ = ("model_fields", "populate_by_name", "fields")
+
+    def __init__(self, model: type[pydantic.BaseModel], model_fields: dict[str, FieldInfo]) -> None:
+        config = get_model_config(model)
+        self.model_fields = model_fields
+        self.populate_by_name = (
+            config.allow_population_by_field_name
+            if isinstance(config, _ConfigProtocol)
+            else config.get("populate_by_name")
+        )
+
+        # (name, alias, field, field type, default or `_NO_DEFAULT` if it has to be copied per instance)
+        self.fields: list[tuple[str, str | None, FieldInfo, object, object]] = []
+        for name, field in model_fields.items():
+            if PYDANTIC_V2:
+                field_type = field.annotation
+            else:
+                field_type = cast(type, field.outer_type_)  # type: ignore
+
+            default = _NO_DEFAULT
+            if getattr(field, "default_factory", None) is None:
+                value = field_get_default(field)
+                if type(value) in _SHARED_DEFAULT_TYPES:
+                    default = value
+
+            self.fields.append((name, field.alias, field, field_type, default))
+
+
+_CONSTRUCT_PLANS: dict[type, _ConstructPlan] = {}
+
+
+def _get_construct_plan(model: type[pydantic.BaseModel]) -> _ConstructPlan:
+    model_fields = get_model_fields(model)
+    plan = _CONSTRUCT_PLANS.get(model)
+    # the fields are replaced when a model is rebuilt, e.g. after resolving forward references
+    if plan is None or plan.model_fields is not model_fields:
+        plan = _CONSTRUCT_PLANS[model] = _ConstructPlan(model, model_fields)
+    return plan
+
+
 @runtime_checkable
 class CachedDiscriminatorType(Protocol):
     __discriminator__: DiscriminatorDetails
@@ -695,6 +870,14 @@ def validate_type(*, type_: type[_T], value: object) -> _T:
     return cast(_T, _validate_non_model_type(type_=type_, value=value))
 
 
+def _get_validator(type_: type[_T]) -> Callable[[object], _T]:
+    """Returns a callable with the same behaviour as `validate_type(type_=type_, value=...)`"""
+    if PYDANTIC_V2 and not (inspect.isclass(type_) and issubclass(type_, pydantic.BaseModel)):
+        return TypeAdapter(type_).validate_python
+
+    return lambda value: validate_type(type_=type_, value=value)
+
+
 def set_pydantic_config(typ: Any, config: pydantic.ConfigDict) -> None:
     """Add a pydantic config for the given type.
 
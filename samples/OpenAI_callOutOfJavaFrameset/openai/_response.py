@@ -25,7 +25,14 @@ import httpx
 import pydantic
 
 from ._types import NoneType
-from ._utils import is_given, extract_type_arg, is_annotated_type, is_type_alias_type, extract_type_var_from_base
+from ._utils import (
+    is_given,
+    response_json,
+    extract_type_arg,
+    is_annotated_type,
+    is_type_alias_type,
+    extract_type_var_from_base,
+)
 from ._models import BaseModel, is_basemodel, add_request_id
 from ._constants import RAW_RESPONSE_HEADER, OVERRIDE_CAST_TO_HEADER
 from ._streaming import Stream, AsyncStream, is_stream_class_type, extract_stream_chunk_type
@@ -240,7 +247,7 @@ class BaseAPIResponse(Generic[R]):
         if content_type != "application/json":
             if is_basemodel(cast_to):
                 try:
-                    data = response.json()
+                    data = response_json(response)
                 except Exception as exc:
                     log.debug("Could not read JSON from response data due to %s - %s", type(exc), exc)
                 else:
@@ -262,7 +269,7 @@ class BaseAPIResponse(Generic[R]):
             # handle the response however you need to.
             return response.text  # type: ignore
 
-        data = response.json()
+        data = response_json(response)
 
         return self._client._process_response_data(
             data=data,
@@ -348,7 +355,7 @@ class APIResponse(BaseAPIResponse[R]):
     def json(self) -> object:
         """Read and decode the JSON response content."""
         self.read()
-        return self.http_response.json()
+        return response_json(self.http_response)
 
     def close(self) -> None:
         """Close the response and release the connection.
@@ -455,7 +462,7 @@ class AsyncAPIResponse(BaseAPIResponse[R]):
     async def json(self) -> object:
         """Read and decode the JSON response content."""
         await self.read()
-        return self.http_response.json()
+        return response_json(self.http_response)
 
     async def close(self) -> None:
         """Close the response and release the connection.
@@ -1,7 +1,6 @@
 # Note: initially copied from https://github.com/florimondmanca/httpx-sse/blob/master/src/httpx_sse/_decoders.py
 from __future__ import annotations
 
-import json
 import inspect
 from types import TracebackType
 from typing import TYPE_CHECKING, Any, Generic, TypeVar, Iterator, AsyncIterator, cast
@@ -9,7 +8,7 @@ from typing_extensions import Self, Protocol, TypeGuard, override, get_origin, r
 
 import httpx
 
-from ._utils import is_mapping, extract_type_var_from_base
+from ._utils import is_mapping, json_loads, extract_type_var_from_base
 from ._exceptions import APIError
 
 if TYPE_CHECKING:
@@ -256,7 +255,7 @@ class ServerSentEvent:
         return self._data
 
     def json(self) -> Any:
-        return json.loads(self.data)
+        return json_loads(self.data)
 
     @override
     def __repr__(self) -> str:
@@ -268,56 +267,75 @@ class SSEDecoder:
     _event: str | None
     _retry: int | None
     _last_event_id: str | None
+    _buffer: bytearray
+    _pending_cr: bool
 
     def __init__(self) -> None:
         self._event = None
         self._data = []
         self._last_event_id = None
         self._retry = None
+        self._buffer = bytearray()
+        self._pending_cr = False
 
     def iter_bytes(self, iterator: Iterator[bytes]) -> Iterator[ServerSentEvent]:
         """Given an iterator that yields raw binary data, iterate over it & yield every event encountered"""
-        for chunk in self._iter_chunks(iterator):
-            # Split before decoding so splitlines() only uses \r and \n
-            for raw_line in chunk.splitlines():
-                line = raw_line.decode("utf-8")
-                sse = self.decode(line)
-                if sse:
-                    yield sse
-
-    def _iter_chunks(self, iterator: Iterator[bytes]) -> Iterator[bytes]:
-        """Given an iterator that yields raw binary data, iterate over it and yield individual SSE chunks"""
-        data = b""
         for chunk in iterator:
-            for line in chunk.splitlines(keepends=True):
-                data += line
-                if data.endswith((b"\r\r", b"\n\n", b"\r\n\r\n")):
-                    yield data
-                    data = b""
-        if data:
-            yield data
+            yield from self._feed(chunk)
+        yield from self._flush()
 
     async def aiter_bytes(self, iterator: AsyncIterator[bytes]) -> AsyncIterator[ServerSentEvent]:
         """Given an iterator that yields raw binary data, iterate over it & yield every event encountered"""
-        async for chunk in self._aiter_chunks(iterator):
-            # Split before decoding so splitlines() only uses \r and \n
-            for raw_line in chunk.splitlines():
-                line = raw_line.decode("utf-8")
-                sse = self.decode(line)
-                if sse:
-                    yield sse
-
-    async def _aiter_chunks(self, iterator: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
-        """Given an iterator that yields raw binary data, iterate over it and yield individual SSE chunks"""
-        data = b""
         async for chunk in iterator:
-            for line in chunk.splitlines(keepends=True):
-                data += line
-                if data.endswith((b"\r\r", b"\n\n", b"\r\n\r\n")):
-                    yield data
-                    data = b""
-        if data:
-            yield data
+            for sse in self._feed(chunk):
+                yield sse
+        for sse in self._flush():
+            yield sse
+
+    def _feed(self, chunk: bytes) -> list[ServerSentEvent]:
+        """Append raw data to the line buffer and return every event completed by it.
+
+        Only complete lines are split off and decoded, each exactly once; an unterminated
+        trailing line stays in the buffer until the chunk that ends it arrives, so the
+        work per stream is linear in its size no matter how the bytes are chunked.
+        """
+        if self._pending_cr:
+            # the previous chunk ended on `\r`, which may be the first half of `\r\n`
+            self._pending_cr = False
+            if chunk[:1] == b"\n":
+                chunk = chunk[1:]
+        buffer = self._buffer
+        buffer += chunk
+        if b"\n" not in chunk and b"\r" not in chunk:
+            return []
+
+        # `splitlines()` only splits on `\r`, `\n` and `\r\n`, as the SSE spec requires
+        lines = buffer.splitlines()
+        tail = buffer[-1]
+        if tail == 0x0A or tail == 0x0D:
+            self._pending_cr = tail == 0x0D
+            buffer.clear()
+        else:
+            # unterminated, stays buffered
+            del buffer[: -len(lines.pop())]
+
+        events: list[ServerSentEvent] = []
+        for line in lines:
+            # line breaks are ASCII, so every complete line is valid UTF-8 on its own
+            sse = self.decode(line.decode("utf-8"))
+            if sse is not None:
+                events.append(sse)
+        return events
+
+    def _flush(self) -> list[ServerSentEvent]:
+        """Process a final line that was not terminated before the stream ended."""
+        self._pending_cr = False
+        if not self._buffer:
+            return []
+        line = self._buffer.decode("utf-8")
+        self._buffer.clear()
+        sse = self.decode(line)
+        return [sse] if sse is not None else []
 
     def decode(self, line: str) -> ServerSentEvent | None:
         # See: https://html.spec.whatwg.org/multipage/server-sent-events.html#event-stream-interpretation  # noqa: E501
@@ -46,6 +46,11 @@ from ._typing import (
     strip_annotated_type as strip_annotated_type,
     extract_type_var_from_base as extract_type_var_from_base,
 )
+from ._json import (
+    json_loads as json_loads,
+    response_json as response_json,
+    encode_json_body as encode_json_body,
+)
 from ._streams import consume_sync_iterator as consume_sync_iterator, consume_async_iterator as consume_async_iterator
 from ._transform import (
     PropertyInfo as PropertyInfo,
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import httpx
+
+from ._utils import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_SCALAR_TYPES = frozenset({str, int, bool, type(None)})
+
+# digits become `0`, signs, decimal points & exponents are kept and everything else becomes a space
+_NUMBER_SHAPES = bytes(0x30 if 0x30 <= char <= 0x39 else char if char in b"-.eE" else 0x20 for char in range(256))
+
+# at least 20 digits (>= 10**19) or a minus sign and at least 19 digits (<= -10**18), not after a decimal point
+_LONG_INTEGER = b" " + b"0" * 20
+_LONG_NEGATIVE_INTEGER = b"-" + b"0" * 19
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Same as `json.loads(data)`, but decoded with `orjson` when it is installed.
+
+    Anything `orjson` rejects or might decode differently (e.g. `NaN`, integers beyond 64 bits or
+    lone surrogates) is handed to `json.loads()`, so values and errors always match the standard library.
+    """
+    if orjson is not None:
+        try:
+            raw = data.encode("utf-8") if isinstance(data, str) else data
+            if not _may_contain_long_integers(raw):
+                return orjson.loads(raw)
+        except Exception:
+            pass
+
+    return json.loads(data)
+
+
+def response_json(response: httpx.Response) -> Any:
+    """Same as `response.json()`, but decoded with `orjson` when it is installed.
+
+    `httpx` ignores the charset here as well, content that is not UTF-8 is rejected by `orjson`.
+    """
+    if orjson is not None:
+        try:
+            content = response.content
+            if not _may_contain_long_integers(content):
+                return orjson.loads(content)
+        except Exception:
+            pass
+
+    return response.json()
+
+
+def _may_contain_long_integers(data: bytes) -> bool:
+    """Whether the JSON document may contain integers outside of 64 bits, which `orjson` turns into floats.
+
+    Checked on the "shape" of the document, so that only integer tokens count, not the digits
+    after a decimal point; digits in strings can cause false positives, which just fall back to `json`.
+    """
+    shapes = data.translate(_NUMBER_SHAPES)
+    return shapes.startswith(_LONG_INTEGER[1:]) or _LONG_INTEGER in shapes or _LONG_NEGATIVE_INTEGER in shapes
+
+
+def encode_json_body(data: object) -> bytes | None:
+    """Encodes a request body with `orjson` to exactly the bytes `httpx` would send for `json=data`.
+
+    Returns `None` if the body should be left to `httpx`: `orjson` is not installed, the installed
+    `httpx` version encodes differently than `orjson` can, or the data contains values that the two
+    would encode differently.
+    """
+    if orjson is None or not _httpx_encodes_like_orjson() or not _orjson_encodes_identically(data):
+        return None
+
+    try:
+        return orjson.dumps(data)
+    except Exception:
+        # e.g. integers beyond 64 bits or lone surrogates
+        return None
+
+
+@lru_cache(maxsize=None)
+def _httpx_encodes_like_orjson() -> bool:
+    # httpx >= 0.28 sends compact, non-ASCII-escaped JSON, older versions use the `json.dumps()` defaults
+    probe = {"a": ["é", 1.5, None, True]}
+    return httpx.Request("POST", "http://localhost", json=probe).content == orjson.dumps(probe)  # type: ignore
+
+
+def _orjson_encodes_identically(data: object) -> bool:
+    """Whether `orjson.dumps(data)` gives the same bytes as compact `json.dumps(data)`.
+
+    Only exact JSON types qualify: `orjson` also encodes enums, UUIDs or dataclasses that `json`
+    rejects, writes `NaN` as `null` and formats floats that need an exponent differently.
+    """
+    type_ = type(data)
+    if type_ in _SCALAR_TYPES:
+        return True
+
+    if type_ is float:
+        return _is_fixed_point_float(data)  # type: ignore[arg-type]
+
+    if type_ is dict:
+        if not set(map(type, data)) <= {str}:  # type: ignore[call-overload]
+            return False
+        values: Any = data.values()  # type: ignore[attr-defined]
+    elif type_ is list or type_ is tuple:
+        values = data
+    else:
+        return False
+
+    if set(map(type, values)) <= _SCALAR_TYPES:
+        return True
+
+    return all(_orjson_encodes_identically(value) for value in values)
+
+
+def _is_fixed_point_float(value: float) -> bool:
+    # `repr()` (and therefore `json`) switches to an exponent outside of this range, `orjson` does
+    # so at other thresholds; `NaN` and infinities fail the comparisons
+    return value == 0 or 1e-4 <= abs(value) < 1e16
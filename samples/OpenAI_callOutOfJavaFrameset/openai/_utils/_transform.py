@@ -3,7 +3,7 @@ from __future__ import annotations
 import io
 import base64
 import pathlib
-from typing import Any, Mapping, TypeVar, cast
+from typing import Any, Mapping, TypeVar, Iterable, cast
 from datetime import date, datetime
 from typing_extensions import Literal, get_args, override, get_type_hints
 
@@ -163,52 +163,221 @@ def _transform_recursive(
     if inner_type is None:
         inner_type = annotation
 
-    stripped_type = strip_annotated_type(inner_type)
-    origin = get_origin(stripped_type) or stripped_type
-    if is_typeddict(stripped_type) and is_mapping(data):
-        return _transform_typeddict(data, stripped_type)
-
-    if origin == dict and is_mapping(data):
-        items_type = get_args(stripped_type)[1]
-        return {key: _transform_recursive(value, annotation=items_type) for key, value in data.items()}
-
-    if (
-        # List[T]
-        (is_list_type(stripped_type) and is_list(data))
-        # Iterable[T]
-        or (is_iterable_type(stripped_type) and is_iterable(data) and not isinstance(data, str))
-    ):
+    return _transform_value(data, _get_transform_plan(annotation, inner_type))
+
+
+# types of values that are never changed by a transform, whatever the annotation says
+_PLAIN_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+class _TransformPlan:
+    """Everything the transforms need to know about the types for one `annotation` / `inner_type` pair.
+
+    Plans are built once per pair and shared by the sync and async transforms. The plans for nested
+    types are resolved on first use, so building a plan for a recursive type terminates.
+    """
+
+    __slots__ = (
+        "annotation",
+        "inner_type",
+        "stripped_type",
+        "typeddict",
+        "is_dict",
+        "sequence",
+        "is_union",
+        "format",
+        "_items",
+        "_entries",
+        "_variants",
+        "_static",
+    )
+
+    def __init__(self, annotation: type, inner_type: type) -> None:
+        self.annotation = annotation
+        self.inner_type = inner_type
+
+        stripped_type = strip_annotated_type(inner_type)
+        origin = get_origin(stripped_type) or stripped_type
+        self.stripped_type = stripped_type
+        self.typeddict: type | None = stripped_type if is_typeddict(stripped_type) else None
+        self.is_dict = origin == dict
+
+        # `List[T]` only transforms lists, `Iterable[T]` any iterable but strings
+        self.sequence: Literal["list", "iterable"] | None = None
+        if is_list_type(stripped_type):
+            self.sequence = "list"
+        elif is_iterable_type(stripped_type):
+            self.sequence = "iterable"
+
+        self.is_union = is_union_type(stripped_type)
+        self.format = _get_format_info(annotation)
+
+        self._items: _TransformPlan | None = None
+        self._entries: _TransformPlan | None = None
+        self._variants: list[_TransformPlan] | None = None
+        self._static: bool | None = None
+
+    def is_static(self) -> bool:
+        """Whether no alias can be reached from this plan, so that plain data passes through unchanged.
+
+        Formats only apply to dates and file inputs, model dumps only to models and iterables are only
+        turned into lists if they are not lists already; lists, dicts and JSON scalars are only copied.
+        """
+        if self._static is None:
+            self._static = all(plan._static_children() is not None for plan in self._reachable())
+        return self._static
+
+    def _reachable(self) -> list[_TransformPlan]:
+        seen = {id(self): self}
+        pending = [self]
+        while pending:
+            for child in pending.pop()._static_children() or ():
+                if id(child) not in seen:
+                    seen[id(child)] = child
+                    pending.append(child)
+        return list(seen.values())
+
+    def _static_children(self) -> list[_TransformPlan] | None:
+        """The plans directly below this one, or `None` if this one may rename keys of plain data."""
+        children: list[_TransformPlan] = []
+        try:
+            if self.typeddict is not None:
+                for key, (transformed_key, plan) in _get_typeddict_fields(self.typeddict).items():
+                    if transformed_key != key:
+                        return None
+                    children.append(plan)
+            if self.is_dict:
+                children.append(self.items())
+            if self.sequence is not None:
+                children.append(self.entries())
+            if self.is_union:
+                children.extend(self.variants())
+        except Exception:
+            # e.g. a bare `List`, which has to fail the same way once data reaches it
+            return None
+        return children
+
+    def items(self) -> _TransformPlan:
+        if self._items is None:
+            items_type = get_args(self.stripped_type)[1]  # Dict[_, items_type]
+            self._items = _get_transform_plan(items_type)
+        return self._items
+
+    def entries(self) -> _TransformPlan:
+        if self._entries is None:
+            inner_type = extract_type_arg(self.stripped_type, 0)  # List[inner_type]
+            self._entries = _get_transform_plan(self.annotation, inner_type)
+        return self._entries
+
+    def variants(self) -> list[_TransformPlan]:
+        if self._variants is None:
+            self._variants = [_get_transform_plan(self.annotation, subtype) for subtype in get_args(self.stripped_type)]
+        return self._variants
+
+    def matches_sequence(self, data: object) -> bool:
+        if self.sequence == "list":
+            return is_list(data)
+        return self.sequence == "iterable" and is_iterable(data) and not isinstance(data, str)
+
+
+# Keyed by `id()` as equal typing objects are not interchangeable here: `Union[A, B] == Union[B, A]`
+# but union members are transformed in order. Each plan keeps its types alive, so ids are not reused.
+_TRANSFORM_PLANS: dict[tuple[int, int], _TransformPlan] = {}
+
+_TYPEDDICT_FIELDS: dict[type, dict[str, tuple[str, _TransformPlan]]] = {}
+
+
+def _get_transform_plan(annotation: type, inner_type: type | None = None) -> _TransformPlan:
+    if inner_type is None:
+        inner_type = annotation
+
+    key = (id(annotation), id(inner_type))
+    plan = _TRANSFORM_PLANS.get(key)
+    if plan is None:
+        plan = _TRANSFORM_PLANS.setdefault(key, _TransformPlan(annotation, inner_type))
+    return plan
+
+
+def _get_typeddict_fields(expected_type: type) -> dict[str, tuple[str, _TransformPlan]]:
+    """Maps each annotated key of the given `TypedDict` to its transformed key and plan."""
+    fields = _TYPEDDICT_FIELDS.get(expected_type)
+    if fields is None:
+        annotations = get_type_hints(expected_type, include_extras=True)
+        fields = {key: (_maybe_transform_key(key, type_), _get_transform_plan(type_)) for key, type_ in annotations.items()}
+        _TYPEDDICT_FIELDS[expected_type] = fields
+    return fields
+
+
+def _is_plain_data(data: object) -> bool:
+    """Whether the given data only consists of JSON scalars and lists / dicts with string keys."""
+    if type(data) in _PLAIN_TYPES:
+        return True
+
+    if type(data) is list:
+        for entry in cast("list[object]", data):
+            if not _is_plain_data(entry):
+                return False
+        return True
+
+    if type(data) is dict:
+        for key, value in cast("dict[object, object]", data).items():
+            if type(key) is not str or not _is_plain_data(value):
+                return False
+        return True
+
+    return False
+
+
+def _get_format_info(annotation: type) -> PropertyInfo | None:
+    annotated_type = _get_annotated_type(annotation)
+    if annotated_type is None:
+        return None
+
+    # ignore the first argument as it is the actual type
+    for info in get_args(annotated_type)[1:]:
+        if isinstance(info, PropertyInfo) and info.format is not None:
+            return info
+
+    return None
+
+
+def _transform_value(data: object, plan: _TransformPlan) -> object:
+    if type(data) in _PLAIN_TYPES or (plan.is_static() and _is_plain_data(data)):
+        # nothing below would change the data, so it is returned as is instead of being copied
+        return data
+
+    if plan.typeddict is not None and is_mapping(data):
+        return _transform_typeddict(data, plan.typeddict)
+
+    if plan.is_dict and is_mapping(data):
+        items = plan.items()
+        return {key: _transform_value(value, items) for key, value in data.items()}
+
+    if plan.matches_sequence(data):
         # dicts are technically iterable, but it is an iterable on the keys of the dict and is not usually
         # intended as an iterable, so we don't transform it.
         if isinstance(data, dict):
             return cast(object, data)
 
-        inner_type = extract_type_arg(stripped_type, 0)
-        return [_transform_recursive(d, annotation=annotation, inner_type=inner_type) for d in data]
+        entries = plan.entries()
+        return [_transform_value(d, entries) for d in cast("Iterable[object]", data)]
 
-    if is_union_type(stripped_type):
+    if plan.is_union:
         # For union types we run the transformation against all subtypes to ensure that everything is transformed.
         #
         # TODO: there may be edge cases where the same normalized field name will transform to two different names
         # in different subtypes.
-        for subtype in get_args(stripped_type):
-            data = _transform_recursive(data, annotation=annotation, inner_type=subtype)
+        for variant in plan.variants():
+            data = _transform_value(data, variant)
         return data
 
     if isinstance(data, pydantic.BaseModel):
         return model_dump(data, exclude_unset=True, mode="json")
 
-    annotated_type = _get_annotated_type(annotation)
-    if annotated_type is None:
+    if plan.format is None:
         return data
 
-    # ignore the first argument as it is the actual type
-    annotations = get_args(annotated_type)[1:]
-    for annotation in annotations:
-        if isinstance(annotation, PropertyInfo) and annotation.format is not None:
-            return _format_data(data, annotation.format, annotation.format_template)
-
-    return data
+    return _format_data(data, plan.format.format, plan.format.format_template)  # type: ignore[arg-type]
 
 
 def _format_data(data: object, format_: PropertyFormat, format_template: str | None) -> object:
@@ -243,14 +412,16 @@ def _transform_typeddict(
     expected_type: type,
 ) -> Mapping[str, object]:
     result: dict[str, object] = {}
-    annotations = get_type_hints(expected_type, include_extras=True)
+    fields = _get_typeddict_fields(expected_type)
     for key, value in data.items():
-        type_ = annotations.get(key)
-        if type_ is None:
+        field = fields.get(key)
+        if field is None:
             # we do not have a type annotation for this field, leave it as is
             result[key] = value
+        elif type(value) in _PLAIN_TYPES:
+            result[field[0]] = value
         else:
-            result[_maybe_transform_key(key, type_)] = _transform_recursive(value, annotation=type_)
+            result[field[0]] = _transform_value(value, field[1])
     return result
 
 
@@ -311,52 +482,46 @@ async def _async_transform_recursive(
     if inner_type is None:
         inner_type = annotation
 
-    stripped_type = strip_annotated_type(inner_type)
-    origin = get_origin(stripped_type) or stripped_type
-    if is_typeddict(stripped_type) and is_mapping(data):
-        return await _async_transform_typeddict(data, stripped_type)
-
-    if origin == dict and is_mapping(data):
-        items_type = get_args(stripped_type)[1]
-        return {key: _transform_recursive(value, annotation=items_type) for key, value in data.items()}
-
-    if (
-        # List[T]
-        (is_list_type(stripped_type) and is_list(data))
-        # Iterable[T]
-        or (is_iterable_type(stripped_type) and is_iterable(data) and not isinstance(data, str))
-    ):
+    return await _async_transform_value(data, _get_transform_plan(annotation, inner_type))
+
+
+async def _async_transform_value(data: object, plan: _TransformPlan) -> object:
+    if type(data) in _PLAIN_TYPES or (plan.is_static() and _is_plain_data(data)):
+        # nothing below would change the data, so it is returned as is instead of being copied
+        return data
+
+    if plan.typeddict is not None and is_mapping(data):
+        return await _async_transform_typeddict(data, plan.typeddict)
+
+    if plan.is_dict and is_mapping(data):
+        items = plan.items()
+        return {key: await _async_transform_value(value, items) for key, value in data.items()}
+
+    if plan.matches_sequence(data):
         # dicts are technically iterable, but it is an iterable on the keys of the dict and is not usually
         # intended as an iterable, so we don't transform it.
         if isinstance(data, dict):
             return cast(object, data)
 
-        inner_type = extract_type_arg(stripped_type, 0)
-        return [await _async_transform_recursive(d, annotation=annotation, inner_type=inner_type) for d in data]
+        entries = plan.entries()
+        return [await _async_transform_value(d, entries) for d in cast("Iterable[object]", data)]
 
-    if is_union_type(stripped_type):
+    if plan.is_union:
         # For union types we run the transformation against all subtypes to ensure that everything is transformed.
         #
         # TODO: there may be edge cases where the same normalized field name will transform to two different names
         # in different subtypes.
-        for subtype in get_args(stripped_type):
-            data = await _async_transform_recursive(data, annotation=annotation, inner_type=subtype)
+        for variant in plan.variants():
+            data = await _async_transform_value(data, variant)
         return data
 
     if isinstance(data, pydantic.BaseModel):
         return model_dump(data, exclude_unset=True, mode="json")
 
-    annotated_type = _get_annotated_type(annotation)
-    if annotated_type is None:
+    if plan.format is None:
         return data
 
-    # ignore the first argument as it is the actual type
-    annotations = get_args(annotated_type)[1:]
-    for annotation in annotations:
-        if isinstance(annotation, PropertyInfo) and annotation.format is not None:
-            return await _async_format_data(data, annotation.format, annotation.format_template)
-
-    return data
+    return await _async_format_data(data, plan.format.format, plan.format.format_template)  # type: ignore[arg-type]
 
 
 async def _async_format_data(data: object, format_: PropertyFormat, format_template: str | None) -> object:
@@ -391,12 +556,14 @@ async def _async_transform_typeddict(
     expected_type: type,
 ) -> Mapping[str, object]:
     result: dict[str, object] = {}
-    annotations = get_type_hints(expected_type, include_extras=True)
+    fields = _get_typeddict_fields(expected_type)
     for key, value in data.items():
-        type_ = annotations.get(key)
-        if type_ is None:
+        field = fields.get(key)
+        if field is None:
             # we do not have a type annotation for this field, leave it as is
             result[key] = value
+        elif type(value) in _PLAIN_TYPES:
+            result[field[0]] = value
         else:
-            result[_maybe_transform_key(key, type_)] = await _async_transform_recursive(value, annotation=type_)
+            result[field[0]] = await _async_transform_value(value, field[1])
     return result
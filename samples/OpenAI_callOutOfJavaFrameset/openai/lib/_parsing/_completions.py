@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from typing import TYPE_CHECKING, Any, Iterable, cast
 from typing_extensions import TypeVar, TypeGuard, assert_never
 
@@ -8,7 +7,7 @@ import pydantic
 
 from .._tools import PydanticFunctionTool
 from ..._types import NOT_GIVEN, NotGiven
-from ..._utils import is_dict, is_given
+from ..._utils import is_dict, is_given, json_loads
 from ..._compat import PYDANTIC_V2, model_parse_json
 from ..._models import construct_type_unchecked
 from .._pydantic import is_basemodel_type, to_strict_json_schema, is_dataclass_like_type
@@ -149,7 +148,7 @@ def parse_function_tool_arguments(
     if not input_fn.get("strict"):
         return None
 
-    return json.loads(function.arguments)
+    return json_loads(function.arguments)
 
 
 def maybe_parse_content(
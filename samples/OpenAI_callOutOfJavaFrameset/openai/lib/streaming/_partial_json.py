@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import re
+from typing import Union
+
+from jiter import from_json
+
+# structural states of an open container
+_LIST_START = 0  # after `[`: value or `]`
+_DICT_START = 1  # after `{`: key or `}`
+_VALUE = 2  # after `,` in a list or `:` in a dict
+_KEY = 3  # after `,` in a dict
+_COLON = 4  # after a key
+_AFTER_VALUE = 5  # `,` or the closing bracket
+
+_WHITESPACE = " \t\n\r"
+_STRING_CHARS = re.compile(r'[^"\\\x00-\x1f]*')
+_BARE_CHARS = re.compile(r'[^ \t\n\r,:\[\]{}"]*')
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?")
+_NUMBER_PREFIX = re.compile(r"-?(?:(?:0|[1-9][0-9]*)(?:\.(?:[0-9]+(?:[eE][+-]?[0-9]*)?)?|[eE][+-]?[0-9]*)?)?")
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+_ESCAPES = '"\\/bfnrt'
+_HEX = "0123456789abcdefABCDEF"
+
+_MISSING = object()
+
+
+class _Unsupported(Exception):
+    """The document left the subset this parser follows incrementally (e.g. it is invalid)."""
+
+
+class _Frame:
+    __slots__ = ("items", "key", "state")
+
+    def __init__(self, items: Union[list[object], dict[str, object]], state: int) -> None:
+        self.items = items
+        self.key: str | None = None
+        self.state = state
+
+
+class PartialJSONParser:
+    """Incrementally parses a JSON document that is received in pieces.
+
+    `snapshot()` returns the same value as `jiter.from_json(document, partial_mode=True)`
+    for everything fed so far, but each piece is only scanned once: completed values are
+    parsed a single time and kept, and a snapshot only copies the containers that are
+    still open. Accumulating a streamed document therefore costs O(delta) per chunk
+    instead of re-parsing it from the start.
+
+    Completed values are shared between snapshots and must not be mutated. Documents
+    that are not an object or array, or that turn out to be invalid, are handed to
+    `from_json` as a whole, so values and errors always match it.
+    """
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._length = 0
+        self._stack: list[_Frame] = []
+        self._root: object = _MISSING
+        self._string: list[str] | None = None
+        self._string_is_key = False
+        self._escape = 0  # 0: none, 1: after `\`, 2-5: hex digits of `\uXXXX` seen + 2
+        self._high_surrogate = False  # a `\uD800`-`\uDBFF` escape still awaits its pair
+        self._bare: list[str] | None = None
+        self._fallback = False
+        self._snapshot: object = _MISSING
+
+    @property
+    def length(self) -> int:
+        """Number of characters fed so far."""
+        return self._length
+
+    def feed(self, text: str) -> None:
+        if not text:
+            return
+
+        self._parts.append(text)
+        self._length += len(text)
+        self._snapshot = _MISSING
+        if self._fallback:
+            return
+
+        try:
+            self._scan(text)
+        except _Unsupported:
+            self._fallback = True
+
+    def snapshot(self) -> object:
+        if self._fallback or (not self._stack and self._root is _MISSING):
+            return from_json("".join(self._parts).encode("utf-8"), partial_mode=True)
+
+        if self._snapshot is _MISSING:
+            try:
+                self._snapshot = self._build_snapshot()
+            except _Unsupported:
+                self._fallback = True
+                return self.snapshot()
+
+        return self._snapshot
+
+    def _build_snapshot(self) -> object:
+        if self._root is not _MISSING:
+            return self._root
+
+        pending = self._bare_value(partial=True) if self._bare is not None else _MISSING
+        for frame in reversed(self._stack):
+            if isinstance(frame.items, list):
+                items: object = list(frame.items)
+                if pending is not _MISSING:
+                    items.append(pending)  # type: ignore[attr-defined]
+            else:
+                items = dict(frame.items)
+                if pending is not _MISSING and frame.key is not None:
+                    items[frame.key] = pending  # type: ignore[index]
+            pending = items
+        return pending
+
+    def _scan(self, text: str) -> None:
+        i = 0
+        end = len(text)
+        while i < end:
+            if self._string is not None:
+                i = self._scan_string(text, i)
+                continue
+
+            if self._bare is not None:
+                stop = _BARE_CHARS.match(text, i).end()  # type: ignore[union-attr]
+                self._bare.append(text[i:stop])
+                i = stop
+                if i < end:
+                    # the delimiter is handled as structure on the next iteration
+                    self._add_value(self._bare_value(partial=False))
+                    self._bare = None
+                continue
+
+            char = text[i]
+            i += 1
+            if char in _WHITESPACE:
+                continue
+
+            if not self._stack:
+                if self._root is not _MISSING:
+                    raise _Unsupported()
+                self._open(char)
+                continue
+
+            frame = self._stack[-1]
+            state = frame.state
+            is_list = isinstance(frame.items, list)
+
+            if state == _AFTER_VALUE:
+                if char == ",":
+                    frame.state = _VALUE if is_list else _KEY
+                elif char == ("]" if is_list else "}"):
+                    self._close()
+                else:
+                    raise _Unsupported()
+            elif state == _DICT_START or state == _KEY:
+                if char == '"':
+                    self._start_string(key=True)
+                elif char == "}" and state == _DICT_START:
+                    self._close()
+                else:
+                    raise _Unsupported()
+            elif state == _COLON:
+                if char != ":":
+                    raise _Unsupported()
+                frame.state = _VALUE
+            elif char == "]" and state == _LIST_START:
+                self._close()
+            elif char == '"':
+                self._start_string(key=False)
+            elif char == "{" or char == "[":
+                self._open(char)
+            elif char in ",:]}":
+                raise _Unsupported()
+            else:
+                self._bare = [char]
+
+    def _scan_string(self, text: str, i: int) -> int:
+        assert self._string is not None
+
+        if self._escape:
+            char = text[i]
+            if self._escape == 1:
+                if char == "u":
+                    self._escape = 2
+                elif char in _ESCAPES and not self._high_surrogate:
+                    self._escape = 0
+                else:
+                    raise _Unsupported()
+            elif char in _HEX:
+                self._escape += 1
+            else:
+                raise _Unsupported()
+            self._string.append(char)
+            if self._escape == 6:
+                self._escape = 0
+                self._check_surrogate(int("".join(self._string[-4:]), 16))
+            return i + 1
+
+        stop = _STRING_CHARS.match(text, i).end()  # type: ignore[union-attr]
+        if stop > i:
+            if self._high_surrogate:
+                raise _Unsupported()
+            self._string.append(text[i:stop])
+        if stop == len(text):
+            return stop
+
+        char = text[stop]
+        if self._high_surrogate and char != "\\":
+            raise _Unsupported()
+        self._string.append(char)
+        if char == "\\":
+            self._escape = 1
+        elif char == '"':
+            value = self._parse("".join(self._string))
+            self._string = None
+            if self._string_is_key:
+                frame = self._stack[-1]
+                frame.key = value  # type: ignore[assignment]
+                frame.state = _COLON
+            else:
+                self._add_value(value)
+        else:
+            # control characters must be escaped
+            raise _Unsupported()
+        return stop + 1
+
+    def _check_surrogate(self, code: int) -> None:
+        # unpaired surrogates are rejected by `from_json`, even in a string that is not finished yet
+        if 0xD800 <= code <= 0xDBFF:
+            if self._high_surrogate:
+                raise _Unsupported()
+            self._high_surrogate = True
+        elif 0xDC00 <= code <= 0xDFFF:
+            if not self._high_surrogate:
+                raise _Unsupported()
+            self._high_surrogate = False
+        elif self._high_surrogate:
+            raise _Unsupported()
+
+    def _start_string(self, *, key: bool) -> None:
+        self._string = ['"']
+        self._string_is_key = key
+
+    def _bare_value(self, *, partial: bool) -> object:
+        assert self._bare is not None
+
+        token = "".join(self._bare)
+        if token in _LITERALS or _NUMBER.fullmatch(token):
+            return self._parse(token)
+        if partial and (
+            _NUMBER_PREFIX.fullmatch(token) or any(literal.startswith(token) for literal in _LITERALS)
+        ):
+            # incomplete numbers & literals are left out, as in `from_json(..., partial_mode=True)`
+            return _MISSING
+        raise _Unsupported()
+
+    def _open(self, char: str) -> None:
+        if char == "{":
+            self._stack.append(_Frame({}, _DICT_START))
+        elif char == "[":
+            self._stack.append(_Frame([], _LIST_START))
+        else:
+            raise _Unsupported()
+
+    def _close(self) -> None:
+        frame = self._stack.pop()
+        if self._stack:
+            self._add_value(frame.items)
+        else:
+            self._root = frame.items
+
+    def _add_value(self, value: object) -> None:
+        frame = self._stack[-1]
+        if isinstance(frame.items, list):
+            frame.items.append(value)
+        else:
+            assert frame.key is not None
+            frame.items[frame.key] = value
+            frame.key = None
+        frame.state = _AFTER_VALUE
+
+    @staticmethod
+    def _parse(token: str) -> object:
+        try:
+            return from_json(token.encode("utf-8"))
+        except ValueError as exc:
+            raise _Unsupported() from exc
@@ -5,8 +5,6 @@ from types import TracebackType
 from typing import TYPE_CHECKING, Any, Generic, Callable, Iterable, Awaitable, AsyncIterator, cast
 from typing_extensions import Self, Iterator, assert_never
 
-from jiter import from_json
-
 from ._types import ParsedChoiceSnapshot, ParsedChatCompletionSnapshot, ParsedChatCompletionMessageSnapshot
 from ._events import (
     ChunkEvent,
@@ -25,8 +23,9 @@ from ._events import (
 from .._deltas import accumulate_delta
 from ...._types import NOT_GIVEN, IncEx, NotGiven
 from ...._utils import is_given, consume_sync_iterator, consume_async_iterator
-from ...._compat import model_dump
-from ...._models import build, construct_type
+from ...._compat import PYDANTIC_V2, model_dump, get_model_fields
+from ...._models import BaseModel, build, construct_type
+from .._partial_json import PartialJSONParser
 from ..._parsing import (
     ResponseFormatT,
     has_parseable_input,
@@ -40,7 +39,8 @@ from ...._streaming import Stream, AsyncStream
 from ....types.chat import ChatCompletionChunk, ParsedChatCompletion, ChatCompletionToolParam
 from ...._exceptions import LengthFinishReasonError, ContentFilterFinishReasonError
 from ....types.chat.chat_completion import ChoiceLogprobs
-from ....types.chat.chat_completion_chunk import Choice as ChoiceChunk
+from ....types.chat.chat_completion_chunk import Choice as ChoiceChunk, ChoiceDelta, ChoiceDeltaToolCall
+from ....types.chat.parsed_function_tool_call import ParsedFunction, ParsedFunctionToolCall
 from ....types.chat.completion_create_params import ResponseFormat as ResponseFormatParam
 
 
@@ -315,6 +315,7 @@ class ChatCompletionStreamState(Generic[ResponseFormatT]):
     ) -> None:
         self.__current_completion_snapshot: ParsedChatCompletionSnapshot | None = None
         self.__choice_event_states: list[ChoiceEventState] = []
+        self.__partial_json_parsers: dict[tuple[int, int | None], PartialJSONParser] = {}
 
         self._input_tools = [tool for tool in input_tools] if is_given(input_tools) else []
         self._response_format = response_format
@@ -363,48 +364,50 @@ class ChatCompletionStreamState(Generic[ResponseFormatT]):
         for choice in chunk.choices:
             try:
                 choice_snapshot = completion_snapshot.choices[choice.index]
-                previous_tool_calls = choice_snapshot.message.tool_calls or []
 
-                choice_snapshot.message = cast(
-                    ParsedChatCompletionMessageSnapshot,
-                    construct_type(
-                        type_=ParsedChatCompletionMessageSnapshot,
-                        value=accumulate_delta(
-                            cast(
-                                "dict[object, object]",
-                                model_dump(
-                                    choice_snapshot.message,
-                                    # we don't want to serialise / deserialise our custom properties
-                                    # as they won't appear in the delta and we don't want to have to
-                                    # continuosly reparse the content
-                                    exclude=cast(
-                                        # cast required as mypy isn't smart enough to infer `True` here to `Literal[True]`
-                                        IncEx,
-                                        {
-                                            "parsed": True,
-                                            "tool_calls": {
-                                                idx: {"function": {"parsed_arguments": True}}
-                                                for idx, _ in enumerate(choice_snapshot.message.tool_calls or [])
+                if not _accumulate_delta_in_place(choice_snapshot.message, choice.delta):
+                    previous_tool_calls = choice_snapshot.message.tool_calls or []
+
+                    choice_snapshot.message = cast(
+                        ParsedChatCompletionMessageSnapshot,
+                        construct_type(
+                            type_=ParsedChatCompletionMessageSnapshot,
+                            value=accumulate_delta(
+                                cast(
+                                    "dict[object, object]",
+                                    model_dump(
+                                        choice_snapshot.message,
+                                        # we don't want to serialise / deserialise our custom properties
+                                        # as they won't appear in the delta and we don't want to have to
+                                        # continuosly reparse the content
+                                        exclude=cast(
+                                            # cast required as mypy isn't smart enough to infer `True` here to `Literal[True]`
+                                            IncEx,
+                                            {
+                                                "parsed": True,
+                                                "tool_calls": {
+                                                    idx: {"function": {"parsed_arguments": True}}
+                                                    for idx, _ in enumerate(choice_snapshot.message.tool_calls or [])
+                                                },
                                             },
-                                        },
+                                        ),
                                     ),
                                 ),
+                                cast("dict[object, object]", choice.delta.to_dict()),
                             ),
-                            cast("dict[object, object]", choice.delta.to_dict()),
                         ),
-                    ),
-                )
+                    )
 
-                # ensure tools that have already been parsed are added back into the newly
-                # constructed message snapshot
-                for tool_index, prev_tool in enumerate(previous_tool_calls):
-                    new_tool = (choice_snapshot.message.tool_calls or [])[tool_index]
+                    # ensure tools that have already been parsed are added back into the newly
+                    # constructed message snapshot
+                    for tool_index, prev_tool in enumerate(previous_tool_calls):
+                        new_tool = (choice_snapshot.message.tool_calls or [])[tool_index]
 
-                    if prev_tool.type == "function":
-                        assert new_tool.type == "function"
-                        new_tool.function.parsed_arguments = prev_tool.function.parsed_arguments
-                    elif TYPE_CHECKING:  # type: ignore[unreachable]
-                        assert_never(prev_tool)
+                        if prev_tool.type == "function":
+                            assert new_tool.type == "function"
+                            new_tool.function.parsed_arguments = prev_tool.function.parsed_arguments
+                        elif TYPE_CHECKING:  # type: ignore[unreachable]
+                            assert_never(prev_tool)
             except IndexError:
                 choice_snapshot = cast(
                     ParsedChoiceSnapshot,
@@ -435,9 +438,8 @@ class ChatCompletionStreamState(Generic[ResponseFormatT]):
                 and not choice_snapshot.message.refusal
                 and is_given(self._rich_response_format)
             ):
-                choice_snapshot.message.parsed = from_json(
-                    bytes(choice_snapshot.message.content, "utf-8"),
-                    partial_mode=True,
+                choice_snapshot.message.parsed = self._parse_partial_json(
+                    (choice.index, None), choice_snapshot.message.content
                 )
 
             for tool_call_chunk in choice.delta.tool_calls or []:
@@ -453,9 +455,8 @@ class ChatCompletionStreamState(Generic[ResponseFormatT]):
                         and input_tool.get("function", {}).get("strict")
                         and tool_call_snapshot.function.arguments
                     ):
-                        tool_call_snapshot.function.parsed_arguments = from_json(
-                            bytes(tool_call_snapshot.function.arguments, "utf-8"),
-                            partial_mode=True,
+                        tool_call_snapshot.function.parsed_arguments = self._parse_partial_json(
+                            (choice.index, tool_call_chunk.index), tool_call_snapshot.function.arguments
                         )
                 elif TYPE_CHECKING:  # type: ignore[unreachable]
                     assert_never(tool_call_snapshot)
@@ -485,6 +486,17 @@ class ChatCompletionStreamState(Generic[ResponseFormatT]):
 
         return completion_snapshot
 
+    def _parse_partial_json(self, key: tuple[int, int | None], document: str) -> object:
+        """Equivalent to `from_json(document, partial_mode=True)`, but only the part of `document`
+        that was appended since the last call is parsed.
+        """
+        parser = self.__partial_json_parsers.get(key)
+        if parser is None or parser.length > len(document):
+            parser = self.__partial_json_parsers[key] = PartialJSONParser()
+
+        parser.feed(document[parser.length :])
+        return parser.snapshot()
+
     def _build_events(
         self,
         *,
@@ -753,3 +765,115 @@ def _convert_initial_chunk_into_snapshot(chunk: ChatCompletionChunk) -> ParsedCh
             },
         ),
     )
+
+
+_IN_PLACE_DELTA_FIELDS = frozenset({"content", "refusal", "role", "tool_calls"})
+_IN_PLACE_TOOL_CALL_FIELDS = frozenset({"index", "id", "type", "function"})
+_IN_PLACE_FUNCTION_FIELDS = frozenset({"name", "arguments"})
+
+
+def _accumulate_delta_in_place(message: ParsedChatCompletionMessageSnapshot, delta: ChoiceDelta) -> bool:
+    """Apply `delta` to `message` directly, with the same result as round-tripping the
+    message through `model_dump()`, `accumulate_delta()` and `construct_type()`.
+
+    That round-trip rebuilds the whole message for every chunk; here only the fields
+    present in the delta are touched. Returns `False` without changing anything if
+    the delta has fields this function doesn't handle, e.g. `function_call` or
+    unknown extra properties.
+    """
+    if not _only_fields(delta, _IN_PLACE_DELTA_FIELDS):
+        return False
+
+    for tool_call_delta in delta.tool_calls or []:
+        if not _only_fields(tool_call_delta, _IN_PLACE_TOOL_CALL_FIELDS):
+            return False
+        if tool_call_delta.function is not None and not _only_fields(
+            tool_call_delta.function, _IN_PLACE_FUNCTION_FIELDS
+        ):
+            return False
+
+    tool_calls = message.tool_calls
+    if tool_calls is not None:
+        # the round-trip re-creates existing tool calls from complete dumps
+        for tool_call in tool_calls:
+            _mark_fields_set(tool_call)
+            _mark_fields_set(tool_call.function)
+
+    _append(message, "content", delta.content)
+    _append(message, "refusal", delta.refusal)
+    _append(message, "role", delta.role)
+
+    if delta.tool_calls is not None:
+        if not tool_calls:
+            new_tool_calls = [_construct_tool_call(tool_call_delta) for tool_call_delta in delta.tool_calls]
+            if tool_calls is None:
+                message.tool_calls = new_tool_calls
+            else:
+                tool_calls.extend(new_tool_calls)
+        else:
+            for tool_call_delta in delta.tool_calls:
+                try:
+                    tool_call = tool_calls[tool_call_delta.index]
+                except IndexError:
+                    tool_calls.insert(tool_call_delta.index, _construct_tool_call(tool_call_delta))
+                    continue
+
+                _accumulate_tool_call_delta(tool_call, tool_call_delta)
+
+    # `parsed` is left out of the round-trip and re-computed by the caller
+    message.parsed = None
+    _mark_fields_set(message, unset="parsed")
+    return True
+
+
+def _accumulate_tool_call_delta(tool_call: ParsedFunctionToolCall, delta: ChoiceDeltaToolCall) -> None:
+    fields_set = _fields_set(delta)
+
+    # `index` & `type` are replaced instead of accumulated, see `accumulate_delta()`
+    setattr(tool_call, "index", delta.index)  # noqa: B010
+    if "type" in fields_set:
+        tool_call.type = cast(Any, delta.type)
+
+    _append(tool_call, "id", delta.id)
+
+    function = delta.function
+    if function is not None:
+        if tool_call.function is None:  # pyright: ignore[reportUnnecessaryComparison]
+            tool_call.function = cast(ParsedFunction, construct_type(type_=ParsedFunction, value=function.to_dict()))
+        else:
+            _append(tool_call.function, "name", function.name)
+            _append(tool_call.function, "arguments", function.arguments)
+
+
+def _construct_tool_call(delta: ChoiceDeltaToolCall) -> ParsedFunctionToolCall:
+    return cast(ParsedFunctionToolCall, construct_type(type_=ParsedFunctionToolCall, value=delta.to_dict()))
+
+
+def _append(model: BaseModel, name: str, delta: str | None) -> None:
+    if delta is None:
+        return
+
+    value = getattr(model, name)
+    if value is None:
+        setattr(model, name, delta)
+    elif isinstance(value, str):
+        setattr(model, name, value + delta)
+
+
+def _fields_set(model: BaseModel) -> set[str]:
+    if PYDANTIC_V2:
+        return model.model_fields_set
+    return cast("set[str]", model.__fields_set__)  # type: ignore
+
+
+def _only_fields(model: BaseModel, fields: frozenset[str]) -> bool:
+    if PYDANTIC_V2 and model.model_extra:
+        return False
+    return _fields_set(model) <= fields
+
+
+def _mark_fields_set(model: BaseModel, *, unset: str | None = None) -> None:
+    fields_set = _fields_set(model)
+    fields_set.update(get_model_fields(type(model)))
+    if unset is not None:
+        fields_set.discard(unset)
@@ -21,6 +21,7 @@ from .sessions import (
 )
 from ...._types import NOT_GIVEN, Query, Headers, NotGiven
 from ...._utils import (
+    json_loads,
     is_azure_client,
     maybe_transform,
     strip_not_given,
@@ -263,7 +264,7 @@ class AsyncRealtimeConnection:
         This is helpful if you're using `.recv_bytes()`.
         """
         return cast(
-            RealtimeServerEvent, construct_type_unchecked(value=json.loads(data), type_=cast(Any, RealtimeServerEvent))
+            RealtimeServerEvent, construct_type_unchecked(value=json_loads(data), type_=cast(Any, RealtimeServerEvent))
         )
 
 
@@ -445,7 +446,7 @@ class RealtimeConnection:
         This is helpful if you're using `.recv_bytes()`.
         """
         return cast(
-            RealtimeServerEvent, construct_type_unchecked(value=json.loads(data), type_=cast(Any, RealtimeServerEvent))
+            RealtimeServerEvent, construct_type_unchecked(value=json_loads(data), type_=cast(Any, RealtimeServerEvent))
         )
 
 
@@ -0,0 +1,9 @@
+# tests/conftest.py
+"""Gemeinsame Einstellungen der Unit‑Tests (Repo‑Wurzel im Importpfad)."""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
@@ -0,0 +1,72 @@
+# tests/test_answer_result.py
+"""Unit‑Tests für `AnswerResult` (`get_answer(..., return_result=True)`)."""
+
+import asyncio
+
+from LLMHandler import AnswerResult, LLMHandler
+from ResponseCache import ResponseCache
+
+
+class FakeOllama:
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, **kwargs):
+        self.calls += 1
+        return {
+            "response": "Antwort",
+            "done_reason": "length",
+            "model": "llama3:8b",
+            "prompt_eval_count": 20,
+            "eval_count": 10,
+            "total_duration": 3_000_000_000,
+            "eval_duration": 2_000_000_000,
+        }
+
+
+class AsyncFakeOllama(FakeOllama):
+    async def generate(self, **kwargs):
+        return FakeOllama.generate(self, **kwargs)
+
+
+def _handler(**options) -> LLMHandler:
+    handler = LLMHandler("ollama", model="llama3", host="http://127.0.0.1:1", **options)
+    handler._client = FakeOllama()
+    return handler
+
+
+def test_result_carries_usage_and_timings():
+    result = _handler().get_answer("Hallo", return_result=True)
+    assert isinstance(result, AnswerResult) and str(result) == "Antwort"
+    assert (result.model, result.finish_reason) == ("llama3:8b", "length")
+    assert (result.prompt_tokens, result.completion_tokens, result.total_tokens) == (20, 10, 30)
+    assert result.server_timings == {"total": 3.0, "eval": 2.0}
+    assert result.tokens_per_second == 5.0
+    assert not result.cached and result.latency > 0
+
+
+def test_plain_string_without_return_result():
+    assert _handler().get_answer("Hallo") == "Antwort"
+
+
+def test_async_result():
+    handler = _handler()
+    handler._async_client = AsyncFakeOllama()
+    result = asyncio.run(handler.aget_answer("Hallo", return_result=True))
+    assert result.completion_tokens == 10 and result.finish_reason == "length"
+
+
+def test_cache_hit_has_no_usage():
+    handler = _handler(cache=ResponseCache())
+    handler.get_answer("Hallo", temperature=0, return_result=True)
+    result = handler.get_answer("Hallo", temperature=0, return_result=True)
+    assert handler.client.calls == 1
+    assert result.cached and result.text == "Antwort"
+    assert result.prompt_tokens is None and result.total_tokens is None
+    assert result.tokens_per_second is None
+
+
+def test_rate_falls_back_to_latency():
+    result = AnswerResult("x", model="m", completion_tokens=8, latency=4.0)
+    assert result.tokens_per_second == 2.0
+    assert "completion_tokens=8" in repr(result)
@@ -0,0 +1,96 @@
+# tests/test_batch_api.py
+"""Unit‑Tests für JSONL‑Aufbau und Ergebnis‑Zuordnung in `BatchAPI.py` (ohne Netzwerk)."""
+
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pytest
+
+from BatchAPI import BatchJob, BatchRequestError, write_requests
+
+
+def _lines(path) -> List[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_write_requests_shards_by_count(tmp_path):
+    paths = list(write_requests(["a\n", "b", "c"], tmp_path, model="gpt-4o-mini", max_tokens=5, shard_size=2))
+    assert [p.name for p in paths] == ["input-0000.jsonl", "input-0001.jsonl"]
+    first = _lines(paths[0])
+    assert [r["custom_id"] for r in first] == ["0", "1"]
+    assert first[0]["body"] == {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": "a"}],
+        "max_tokens": 5,
+    }
+    assert first[0]["url"] == "/v1/chat/completions"
+    assert _lines(paths[1])[0]["custom_id"] == "2"
+
+
+def test_write_requests_shards_by_bytes(tmp_path):
+    paths = list(write_requests(["x" * 50] * 4, tmp_path, model="m", shard_bytes=300))
+    assert len(paths) == 4
+    assert all(p.stat().st_size <= 300 for p in paths)
+
+
+class FakeFiles:
+    def __init__(self, contents: Dict[str, List[str]]):
+        self.contents = contents
+        self.with_streaming_response = self
+
+    @contextmanager
+    def content(self, file_id: str):
+        yield SimpleNamespace(iter_lines=lambda: iter(self.contents[file_id]))
+
+
+class FakeBatches:
+    def __init__(self, statuses: List[str], batch: SimpleNamespace):
+        self.statuses = statuses
+        self.batch = batch
+        self.retrieved = 0
+
+    def retrieve(self, batch_id: str):
+        self.retrieved += 1
+        self.batch.status = self.statuses.pop(0)
+        return self.batch
+
+
+def _result(index: int, *, answer: str = "", status: int = 200, error: dict = None) -> str:
+    body = {"choices": [{"message": {"content": answer}}]} if status == 200 else {"error": error}
+    return json.dumps({"custom_id": str(index), "response": {"status_code": status, "body": body}, "error": None})
+
+
+def test_results_in_input_order_with_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr("BatchAPI.time.sleep", lambda seconds: None)
+    [path] = write_requests(["p0", "p1", "p2", "p3"], tmp_path, model="m")
+    files = FakeFiles({
+        "out": [_result(2, answer="zwei"), "", _result(0, answer="null")],
+        "err": [_result(1, status=400, error={"message": "kaputt", "code": "invalid"})],
+    })
+    batch = SimpleNamespace(status="", output_file_id="out", error_file_id="err")
+    batches = FakeBatches(["in_progress", "completed"], batch)
+    client = SimpleNamespace(files=files, batches=batches)
+
+    job = BatchJob(client, ["b1"], [path], workdir=tmp_path)
+    items = list(job.results(poll_interval=0))
+    assert batches.retrieved == 2
+    assert [(i.index, i.prompt, i.answer) for i in items] == [
+        (0, "p0", "null"), (1, "p1", None), (2, "p2", "zwei"), (3, "p3", None),
+    ]
+    assert isinstance(items[1].error, BatchRequestError)
+    assert (items[1].error.code, items[1].error.status_code) == ("invalid", 400)
+    assert "Keine Antwort" in str(items[3].error)
+
+    job.close()
+    assert not tmp_path.exists()
+
+
+def test_wait_times_out(monkeypatch):
+    monkeypatch.setattr("BatchAPI.time.sleep", lambda seconds: None)
+    batch = SimpleNamespace(status="", output_file_id=None, error_file_id=None)
+    client = SimpleNamespace(batches=FakeBatches(["in_progress"] * 10, batch))
+    job = BatchJob(client, ["b1"], [])
+    with pytest.raises(TimeoutError):
+        job.wait(poll_interval=5, timeout=1)
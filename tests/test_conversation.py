@@ -0,0 +1,125 @@
+# tests/test_conversation.py
+"""Unit‑Tests für Verlauf, Budget und Zusammenfassung in `Conversation.py`."""
+
+import asyncio
+from typing import Any, Dict, List
+
+from LLMHandler import LLMHandler
+from TokenCounter import HeuristicEstimator, TokenCounter
+
+
+def _chat(**options: Any):
+    counter = TokenCounter("openai", "gpt-4o", estimator=HeuristicEstimator(1.0), context_limit=1000)
+    handler = LLMHandler("openai", model="gpt-4o", host="http://127.0.0.1:1", token_counter=counter)
+    calls: List[Dict[str, Any]] = []
+
+    def turn(messages, **kwargs):
+        calls.append({"messages": messages, **kwargs})
+        return f"antwort {len(calls)}", None
+
+    async def turn_async(messages, **kwargs):
+        return turn(messages, **kwargs)
+
+    handler._turn = turn                # type: ignore[method-assign]
+    handler._turn_async = turn_async    # type: ignore[method-assign]
+    handler.get_answer = handler.aget_answer = None   # Zusammenfassung darf sie nicht nutzen
+    return handler.conversation(**options), calls
+
+
+def test_history_and_system_are_sent():
+    chat, calls = _chat(system="Kurz.")
+    assert chat.ask("eins") == "antwort 1"
+    chat.ask("zwei")
+    assert calls[-1]["messages"] == [
+        {"role": "system", "content": "Kurz."},
+        {"role": "user", "content": "eins"},
+        {"role": "assistant", "content": "antwort 1"},
+        {"role": "user", "content": "zwei"},
+    ]
+    assert len(chat.messages) == 4
+    chat.reset()
+    assert chat.messages == []
+
+
+def test_oldest_turns_dropped_over_budget():
+    chat, calls = _chat(max_history_tokens=60)
+    chat.ask("a" * 20)
+    chat.ask("b" * 20)
+    assert [m["content"] for m in calls[-1]["messages"]] == ["b" * 20]
+    assert [m["content"] for m in chat.messages] == ["b" * 20, "antwort 2"]
+
+
+def test_summary_runs_as_turn_without_history():
+    chat, calls = _chat(max_history_tokens=60, summarize=True)
+    chat.ask("a" * 20)
+    chat.ask("b" * 20)
+    summary_call, turn_call = calls[1], calls[2]
+    assert len(summary_call["messages"]) == 1
+    assert "Nutzer: " + "a" * 20 in summary_call["messages"][0]["content"]
+    assert summary_call["temperature"] == 0 and summary_call["images"] == []
+    assert chat.summary == "antwort 2"
+    assert turn_call["messages"][0] == {
+        "role": "system",
+        "content": "Bisheriger Gesprächsverlauf (zusammengefasst):\nantwort 2",
+    }
+
+
+def test_async_summary_runs_as_turn():
+    chat, calls = _chat(max_history_tokens=60, summarize=True)
+
+    async def main() -> None:
+        await chat.aask("a" * 20)
+        await chat.aask("b" * 20)
+
+    asyncio.run(main())
+    assert len(calls) == 3 and chat.summary == "antwort 2"
+
+
+def test_length_planned_against_whole_history():
+    chat, calls = _chat()
+    chat.ask("a" * 500, length=10_000)
+    # 500 + 8 Overhead belegt, vom Fenster (1000) bleiben 492
+    assert calls[-1]["max_tokens"] == 492
+
+
+# --------------------------------------------------------------------------- #
+# Präfix in Gesprächsrunden
+# --------------------------------------------------------------------------- #
+def _with_prefix(llm_type: str) -> LLMHandler:
+    from LLMHandler import PromptPrefix
+
+    handler = LLMHandler(llm_type, model="m", host="http://127.0.0.1:1")
+    handler.prefix = PromptPrefix(system="Regeln", texts=["Spezifikation"])
+    return handler
+
+
+TURN = [{"role": "system", "content": "Sitzung"}, {"role": "user", "content": "Frage"}]
+
+
+def test_prefix_leads_openai_turns():
+    messages = _with_prefix("openai")._openai_turn_messages(TURN, [])
+    assert messages[0] == {"role": "system", "content": "Regeln\n\nSpezifikation"}
+    assert messages[1:] == TURN
+
+
+def test_prefix_leads_gemini_turns():
+    contents = _with_prefix("gemini")._gemini_contents(TURN, [])
+    assert contents[0]["parts"][0].startswith("Regeln\n\nSpezifikation\n\nSitzung\n\nFrage")
+
+
+def test_ollama_turn_continues_from_prefix_context():
+    handler = _with_prefix("ollama")
+    first = handler._ollama_turn_args(TURN, [], None, None, None, "5m", [1, 2, 3])
+    assert first["context"] == [1, 2, 3]
+    assert first["system"] == "Sitzung" and first["prompt"] == "Frage"
+    later = handler._ollama_turn_args(TURN, [], None, None, [1, 2, 3, 4, 5], "5m", None)
+    assert later["context"] == [1, 2, 3, 4, 5] and "system" not in later
+
+
+def test_prefix_counts_towards_history_budget():
+    chat, _ = _chat()
+    without = chat._used("Frage")
+    from LLMHandler import PromptPrefix
+
+    chat.handler.prefix = PromptPrefix(system="R" * 40, texts=["S" * 60])
+    assert chat._used("Frage") == without + 40 + 60 + 2 * 4
@@ -0,0 +1,176 @@
+# tests/test_daemon.py
+"""Unit‑Tests für das NDJSON‑Protokoll von `LLMDaemon.py` (ohne Backend)."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from LLMDaemon import LLMDaemon
+
+
+class FakeHandler:
+    """Antwortet sofort mit dem Prompt in Großbuchstaben; `wait` hängt bis zum Abbruch."""
+
+    def __init__(self):
+        self.cancelled = 0
+
+    async def aget_answer(self, prompt: str, **options: Any) -> str:
+        if prompt == "wait":
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        return prompt.upper()
+
+    def astream_answer(self, prompt: str, **options: Any) -> "FakeStream":
+        return FakeStream(prompt.split())
+
+
+class FakeStream:
+    def __init__(self, parts: List[str]):
+        self.parts = parts
+        self.metrics = SimpleNamespace(time_to_first_token=0.5, tokens_per_second=2.0)
+
+    async def __aiter__(self):
+        for part in self.parts:
+            yield part
+
+
+def _daemon() -> LLMDaemon:
+    daemon = LLMDaemon("ollama")
+    fake = FakeHandler()
+    daemon.handler = lambda backend=None, model=None: fake   # type: ignore[method-assign]
+    daemon.fake = fake                                        # type: ignore[attr-defined]
+    return daemon
+
+
+class Connection:
+    """Eine simulierte Verbindung: gesammelte Antworten und eigene Task‑Tabelle."""
+
+    def __init__(self, daemon: LLMDaemon):
+        self.daemon = daemon
+        self.sent: List[Dict[str, Any]] = []
+        self.tasks: Dict[Any, asyncio.Task] = {}
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        self.sent.append(message)
+
+    async def request(self, line: Any) -> None:
+        raw = line if isinstance(line, bytes) else json.dumps(line).encode()
+        await self.daemon.dispatch(raw, self.send, self.tasks)
+
+    async def settle(self) -> None:
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+
+def _run(scenario) -> None:
+    async def main() -> None:
+        daemon = _daemon()
+        daemon._start()
+        try:
+            await scenario(daemon)
+        finally:
+            await daemon.aclose()
+
+    asyncio.run(main())
+
+
+def test_invalid_lines_get_error_replies():
+    async def scenario(daemon):
+        conn = Connection(daemon)
+        await conn.request(b"{kaputt")
+        await conn.request(b"[1, 2]")
+        await conn.request({"id": [1], "op": "ping"})
+        await conn.request({"id": True, "op": "ping"})
+        await conn.request({"op": "answer", "prompt": "x"})
+        await conn.request({"id": 1, "op": "tanzen"})
+        assert [m["type"] for m in conn.sent] == ["ValueError"] * 4 + ["KeyError", "ValueError"]
+        assert all(m["id"] is None for m in conn.sent[:5])
+
+    _run(scenario)
+
+
+def test_answer_stream_and_missing_prompt():
+    async def scenario(daemon):
+        conn = Connection(daemon)
+        await conn.request({"id": 1, "prompt": "hallo"})
+        await conn.request({"id": "s", "op": "stream", "prompt": "a b"})
+        await conn.request({"id": 2})
+        await conn.request({"id": 3, "op": "ping"})
+        await conn.settle()
+        by_id: Dict[Any, List[Dict[str, Any]]] = {}
+        for message in conn.sent:
+            by_id.setdefault(message["id"], []).append(message)
+        assert by_id[1] == [{"id": 1, "done": True, "answer": "HALLO"}]
+        assert [m.get("delta") for m in by_id["s"]] == ["a", "b", None]
+        assert by_id["s"][-1]["answer"] == "ab" and by_id["s"][-1]["ttft"] == 0.5
+        assert by_id[2][0]["type"] == "KeyError"
+        assert by_id[3] == [{"id": 3, "pong": True}]
+        assert not daemon._tasks and not conn.tasks
+
+    _run(scenario)
+
+
+def test_ids_are_scoped_per_connection():
+    async def scenario(daemon):
+        first, second = Connection(daemon), Connection(daemon)
+        await first.request({"id": 1, "prompt": "wait"})
+        await first.request({"id": 1, "prompt": "wait"})
+        await second.request({"id": 1, "prompt": "wait"})
+        await first.settle()
+        assert first.sent == [{"id": 1, "error": "Doppelte Anfrage‑ID.", "type": "ValueError"}]
+        assert second.sent == [] and len(daemon._tasks) == 2
+
+        await first.request({"id": 1, "op": "cancel"})
+        await first.settle()
+        assert first.sent[-1]["type"] == "CancelledError"
+        assert second.sent == [] and 1 in second.tasks and 1 not in first.tasks
+
+    _run(scenario)
+
+
+def test_serve_lines_survives_bad_requests():
+    async def scenario(daemon):
+        conn = Connection(daemon)
+        lines = iter([b"{kaputt\n", b"\n", b'{"id": {"a": 1}}\n', b'{"id": 2, "op": "ping"}\n', b""])
+
+        async def readline() -> bytes:
+            return next(lines)
+
+        await daemon._serve_lines(readline, conn.send, conn.tasks)
+        assert [m["id"] for m in conn.sent] == [None, None, 2]
+
+    _run(scenario)
+
+
+def test_disconnect_cancels_only_that_connection():
+    async def scenario(daemon):
+        server = await asyncio.start_server(daemon._client_connected, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            leaving = await asyncio.open_connection("127.0.0.1", port)
+            staying = await asyncio.open_connection("127.0.0.1", port)
+            for _, writer in (leaving, staying):
+                writer.write(b'{"id": 1, "prompt": "wait"}\n')
+                await writer.drain()
+            while len(daemon._tasks) < 2:
+                await asyncio.sleep(0.01)
+
+            leaving[1].close()
+            while daemon.fake.cancelled < 1:
+                await asyncio.sleep(0.01)
+            assert len(daemon._tasks) == 1
+
+            reader, writer = staying
+            writer.write(b'{"id": 2, "op": "ping"}\n')
+            await writer.drain()
+            assert json.loads(await reader.readline()) == {"id": 2, "pong": True}
+            writer.close()
+            while daemon._tasks:
+                await asyncio.sleep(0.01)
+            assert daemon.fake.cancelled == 2
+
+    _run(scenario)
@@ -0,0 +1,146 @@
+# tests/test_file_ingestor.py
+"""Unit‑Tests für Dekodierung, Byte‑Budget und Stückelung in `FileIngestor.py`."""
+
+import codecs
+
+import pytest
+
+from FileIngestor import FileIngestor, InputBudgetExceeded, chunk_text, sniff_encoding
+
+
+def _write(tmp_path, name: str, data: bytes):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+@pytest.mark.parametrize(
+    "data, text",
+    [
+        ("Grüße".encode("utf-8"), "Grüße"),
+        (codecs.BOM_UTF8 + "Grüße".encode("utf-8"), "Grüße"),
+        ("Grüße".encode("utf-16"), "Grüße"),
+        ("Grüße".encode("latin1"), "Grüße"),       # kein gültiges UTF‑8 → latin1
+        (b"", ""),
+    ],
+)
+def test_read_text_decodings(tmp_path, data, text):
+    path = _write(tmp_path, "t.txt", data)
+    assert FileIngestor().read_text(path) == (text, len(data))
+
+
+def test_sniff_encoding():
+    assert sniff_encoding(codecs.BOM_UTF16_BE + b"\x00a") == "utf-16"
+    assert sniff_encoding(b"abc") is None
+
+
+def test_truncation_keeps_utf8_characters_whole(tmp_path):
+    path = _write(tmp_path, "t.txt", "aü".encode("utf-8"))    # ü = 2 Bytes
+    assert FileIngestor().read_text(path, max_bytes=2) == ("a", 1)
+
+
+def test_iter_text_chunks_across_multibyte_boundaries(tmp_path):
+    text = "äöü€" * 100
+    path = _write(tmp_path, "t.txt", text.encode("utf-8"))
+    chunks = list(FileIngestor(chunk_bytes=7).iter_text_chunks(path))
+    assert "".join(chunks) == text and len(chunks) > 1
+
+
+def test_iter_text_chunks_switches_to_latin1(tmp_path):
+    data = b"abc" * 10 + "Grüße".encode("latin1")
+    path = _write(tmp_path, "t.txt", data)
+    assert "".join(FileIngestor(chunk_bytes=8).iter_text_chunks(path)) == data.decode("latin1")
+
+
+def test_budget_error_and_truncate(tmp_path):
+    first = _write(tmp_path, "a.txt", b"a" * 6)
+    second = _write(tmp_path, "b.txt", b"b" * 6)
+    with pytest.raises(InputBudgetExceeded):
+        FileIngestor(max_bytes=10).split([first, second])
+    images, texts = FileIngestor(max_bytes=10, overflow="truncate").split([first, second])
+    assert images == [] and texts == ["a" * 6, "b" * 4]
+
+
+def test_images_are_never_truncated(tmp_path):
+    image = _write(tmp_path, "bild.png", b"\x89PNG" + b"0" * 20)
+    with pytest.raises(InputBudgetExceeded):
+        FileIngestor(max_bytes=10, overflow="truncate").split([image])
+
+
+def test_split_keeps_order_and_mime(tmp_path):
+    paths = [
+        _write(tmp_path, "eins.txt", b"1"),
+        _write(tmp_path, "bild.png", b"\x89PNG"),
+        _write(tmp_path, "zwei.txt", b"2"),
+    ]
+    ingestor = FileIngestor()
+    images, texts = ingestor.split(paths)
+    ingestor.close()
+    assert texts == ["1", "2"]
+    [image] = images
+    assert image.mime == "image/png" and image.data == b"\x89PNG"
+    assert image.data_url == "data:image/png;base64,iVBORw=="
+    assert image.nbytes == 4 + 8
+
+
+def test_invalid_overflow():
+    with pytest.raises(ValueError):
+        FileIngestor(overflow="ignore")
+
+
+# --------------------------------------------------------------------------- #
+# Digest‑Cache
+# --------------------------------------------------------------------------- #
+def test_digest_cache_hits_until_file_changes(tmp_path):
+    path = _write(tmp_path, "t.txt", b"alt")
+    ingestor = FileIngestor()
+    first = ingestor.prepare_all([path])[0]
+    assert ingestor.prepare_all([path])[0] is first
+    assert (ingestor.cache_hits, ingestor.cache_misses) == (1, 1)
+    path.write_bytes(b"neuer")
+    assert ingestor.prepare_all([path])[0].text == "neuer"
+    assert ingestor.cache_misses == 2
+
+
+def test_digest_cache_charges_what_it_evicts(tmp_path):
+    texts = [_write(tmp_path, f"{i}.txt", b"x" * 40) for i in range(3)]
+    image = _write(tmp_path, "bild.png", b"\x89PNG" * 6)       # 24 Bytes + 32 Base64
+    ingestor = FileIngestor(cache_bytes=100)
+    ingestor.prepare_all(texts)
+    assert ingestor._cached_bytes == 80 and len(ingestor._cache) == 2
+    att = ingestor.prepare_all([image])[0]
+    att.b64                                                    # Base64 ist bereits eingerechnet
+    assert ingestor._cached_bytes == sum(size for _, size in ingestor._cache.values()) == 96
+    ingestor.close()
+    assert ingestor._cached_bytes == 0 and not ingestor._cache
+
+
+def test_truncated_content_is_not_cached(tmp_path):
+    path = _write(tmp_path, "t.txt", b"x" * 20)
+    ingestor = FileIngestor(max_bytes=10, overflow="truncate")
+    ingestor.split([path])
+    assert not ingestor._cache
+
+
+# --------------------------------------------------------------------------- #
+# chunk_text
+# --------------------------------------------------------------------------- #
+def test_chunk_text_prefers_paragraphs_then_words():
+    text = "eins zwei drei\n\nvier fünf sechs sieben"
+    chunks = list(chunk_text([text], chunk_chars=20))
+    assert chunks[0] == "eins zwei drei\n\n"
+    assert all(len(chunk) <= 20 for chunk in chunks)
+    assert "".join(chunks) == text
+
+
+def test_chunk_text_overlap_and_split_pieces():
+    text = "x" * 25
+    chunks = list(chunk_text(list(text), chunk_chars=10, overlap_chars=3))
+    assert chunks == ["x" * 10, "x" * 10, "x" * 10, "x" * 4]
+    assert list(chunk_text(["   "], chunk_chars=10)) == []
+
+
+@pytest.mark.parametrize("chunk_chars, overlap_chars", [(0, 0), (10, 10), (10, -1)])
+def test_chunk_text_rejects_invalid_sizes(chunk_chars, overlap_chars):
+    with pytest.raises(ValueError):
+        list(chunk_text(["abc"], chunk_chars=chunk_chars, overlap_chars=overlap_chars))
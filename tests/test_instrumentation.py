@@ -0,0 +1,111 @@
+# tests/test_instrumentation.py
+"""Unit‑Tests für Traces, Histogramme und Hooks aus `Instrumentation.py`."""
+
+from typing import List
+
+import pytest
+
+from Instrumentation import (
+    NULL_TRACE,
+    CallbackHooks,
+    Histogram,
+    HistogramExporter,
+    MultiHooks,
+    RequestTrace,
+)
+from LLMHandler import LLMHandler
+
+
+def _trace(**fields) -> RequestTrace:
+    trace = RequestTrace(operation="get_answer", llm_type="ollama", model="m", started=0.0, finished=2.0)
+    for name, value in fields.items():
+        setattr(trace, name, value)
+    return trace
+
+
+def test_phases_are_summed():
+    trace = _trace(spans=[("call", 0.0, 1.0), ("call", 1.5, 2.0), ("build", 0.0, 0.25)])
+    trace.add_span("ttfb", None, 1.0)
+    assert trace.phases == {"call": 1.5, "build": 0.25}
+    assert trace.duration == 2.0
+
+
+def test_usage_accumulates():
+    trace = _trace()
+    trace.add_usage(10, None)
+    trace.add_usage(5, 7, 3)
+    assert (trace.prompt_tokens, trace.completion_tokens, trace.cached_tokens) == (15, 7, 3)
+
+
+def test_null_trace_ignores_everything():
+    with NULL_TRACE.phase("call"):
+        NULL_TRACE.cache_hit = True
+    NULL_TRACE.add_usage(1, 2)
+    assert NULL_TRACE.cache_hit is False
+
+
+def test_histogram_percentiles_within_resolution():
+    histogram = Histogram()
+    for value in range(1, 101):
+        histogram.add(value / 100)
+    assert histogram.count == 100 and histogram.mean == pytest.approx(0.505)
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.2)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.2)
+    assert histogram.percentile(100) == 1.0
+    assert Histogram().percentile(50) is None
+
+
+def test_histogram_clamps_extremes():
+    histogram = Histogram()
+    histogram.add(0.0)
+    histogram.add(1e12)
+    assert histogram.percentile(1) <= 1e-4        # unterster Bucket
+    assert histogram.percentile(100) >= 1e7           # oberster Bucket
+    assert histogram.max == 1e12
+
+
+def test_exporter_collects_per_backend():
+    exporter = HistogramExporter()
+    exporter.on_end(_trace(spans=[("call", 0.0, 1.5)], prompt_tokens=12, server={"server.eval": 0.5}))
+    exporter.on_end(_trace(error=RuntimeError("x")))
+    snapshot = exporter.snapshot()
+    assert snapshot["ollama/total"].count == 2
+    assert snapshot["ollama/call"].max == 1.5
+    assert snapshot["ollama/tokens.prompt"].mean == 12
+    assert "ollama/server.eval" in snapshot
+    assert exporter.errors == {"ollama": 1}
+    assert "ollama/errors: 1" in exporter.report()
+    exporter.reset()
+    assert exporter.snapshot() == {} and exporter.errors == {}
+
+
+# --------------------------------------------------------------------------- #
+# LLMHandler mit Hooks (Ollama‑Client als Attrappe)
+# --------------------------------------------------------------------------- #
+class FakeOllama:
+    def generate(self, **kwargs):
+        return {
+            "response": "Antwort",
+            "done_reason": "stop",
+            "model": "llama3:8b",
+            "prompt_eval_count": 11,
+            "eval_count": 4,
+            "eval_duration": 2_000_000_000,
+        }
+
+
+def test_handler_reports_each_request():
+    traces: List[RequestTrace] = []
+    handler = LLMHandler(
+        "ollama", model="llama3", host="http://127.0.0.1:1",
+        instrumentation=[CallbackHooks(traces.append), HistogramExporter()],
+    )
+    assert isinstance(handler.instrumentation, MultiHooks)
+    handler._client = FakeOllama()
+    assert handler.get_answer("Hallo") == "Antwort"
+    [trace] = traces
+    assert trace.operation == "get_answer" and trace.error is None
+    assert {"read_files", "build", "call"} <= set(trace.phases)
+    assert (trace.prompt_tokens, trace.completion_tokens) == (11, 4)
+    assert trace.server["server.eval"] == 2.0
+    assert (trace.finish_reason, trace.response_model) == ("stop", "llama3:8b")
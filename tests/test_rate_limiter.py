@@ -0,0 +1,140 @@
+# tests/test_rate_limiter.py
+"""Unit‑Tests für `RateLimiter.py` und das Wiedereinreihen nach 429 im `LLMHandler`."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import RateLimiter as rate_limiter_module
+from LLMHandler import LLMHandler
+from RateLimiter import RateLimiter, TokenBucket, parse_duration
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize(
+    "value, seconds",
+    [("1.5", 1.5), ("6m0s", 360.0), ("20ms", 0.02), ("1h2m3s", 3723.0), ("", None), ("bald", None)],
+)
+def test_parse_duration(value, seconds):
+    assert parse_duration(value) == seconds
+
+
+def test_bucket_goes_negative_and_refills():
+    bucket = TokenBucket(60, period=60.0)          # 1 Einheit pro Sekunde
+    start = bucket._updated
+    assert bucket.reserve(60, now=start) == 0.0
+    assert bucket.reserve(30, now=start) == pytest.approx(30.0)
+    assert bucket.reserve(10, now=start + 10) == pytest.approx(30.0)
+    assert bucket.reserve(1000, now=start + 100) == 0.0      # auf Kapazität begrenzt
+    assert bucket.reserve(1, now=start + 100) == pytest.approx(1.0)
+
+
+def test_bucket_observe():
+    bucket = TokenBucket(100)
+    bucket.observe(limit=500, remaining=20, now=bucket._updated)
+    assert bucket.capacity == 500 and bucket.level == 20
+
+
+def test_limiter_waits_and_counts(clock):
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=600)
+    assert limiter._reserve(100) == 0.0
+    assert limiter._reserve(100) == 0.0
+    assert limiter._reserve(100) == pytest.approx(30.0)       # drittes Request‑Token
+    assert limiter._reserve(500) == pytest.approx(60.0)       # Tokens: 600 − 800 → −200 bei 10/s
+    stats = limiter.stats
+    assert (stats.requests, stats.tokens, stats.waits) == (4, 800, 2)
+
+
+def test_limits_learned_from_headers(clock):
+    limiter = RateLimiter()
+    assert limiter._reserve(1000) == 0.0
+    limiter.update_from_headers({"x-ratelimit-limit-requests": "60", "x-ratelimit-remaining-requests": "0"})
+    assert limiter._reserve(0) == pytest.approx(1.0)
+    assert RateLimiter(learn_from_headers=False).counts_tokens is False
+
+
+def test_penalize_pauses_everyone(clock):
+    limiter = RateLimiter()
+    limiter.penalize(headers={"retry-after-ms": "250", "retry-after": "9"})
+    assert limiter._reserve(0) == pytest.approx(0.25)
+    limiter.penalize(headers={"retry-after": "2"})
+    assert limiter._reserve(0) == pytest.approx(2.0)
+    assert limiter.stats.throttled == 2
+
+
+# --------------------------------------------------------------------------- #
+# LLMHandler: 429 → Limiter pausiert, Anfrage wird neu eingereiht
+# --------------------------------------------------------------------------- #
+class FakeCompletions:
+    def __init__(self, lib, failures: int, code: str = "rate_limit_exceeded"):
+        self.lib = lib
+        self.failures = failures
+        self.code = code
+        self.calls = 0
+        self.with_raw_response = self
+
+    def _attempt(self):
+        import httpx
+
+        self.calls += 1
+        if self.calls <= self.failures:
+            response = httpx.Response(
+                429, headers={"retry-after-ms": "1"}, request=httpx.Request("POST", "http://x")
+            )
+            raise self.lib.RateLimitError("429", response=response, body={"code": self.code})
+        return SimpleNamespace(headers={}, parse=lambda: "ok")
+
+    def create(self, **kwargs):
+        return self._attempt()
+
+
+class AsyncFakeCompletions(FakeCompletions):
+    async def create(self, **kwargs):
+        return self._attempt()
+
+
+def _handler():
+    pytest.importorskip("openai")
+    limiter = RateLimiter()
+    handler = LLMHandler("openai", model="gpt-4o", host="http://127.0.0.1:1", rate_limiter=limiter)
+    return handler, limiter, handler._import_backend()
+
+
+def test_openai_client_does_not_retry_itself(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "x")
+    handler, _, _ = _handler()
+    assert handler.client.max_retries == 0
+    assert LLMHandler("openai", host="http://127.0.0.1:1").client.max_retries > 0
+
+
+def test_rate_limited_call_is_requeued():
+    handler, limiter, lib = _handler()
+    completions = FakeCompletions(lib, failures=3)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    assert handler._openai_create(client, model="gpt-4o") == "ok"
+    assert completions.calls == 4
+    assert limiter.stats.throttled == 3 and limiter.stats.requests == 3
+
+
+def test_async_rate_limited_call_is_requeued():
+    handler, limiter, lib = _handler()
+    completions = AsyncFakeCompletions(lib, failures=2)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    assert asyncio.run(handler._aopenai_create(client, model="gpt-4o")) == "ok"
+    assert completions.calls == 3 and limiter.stats.throttled == 2
+
+
+def test_exhausted_quota_is_not_retried():
+    handler, limiter, lib = _handler()
+    completions = FakeCompletions(lib, failures=5, code="insufficient_quota")
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    with pytest.raises(lib.RateLimitError):
+        handler._openai_create(client, model="gpt-4o")
+    assert completions.calls == 1
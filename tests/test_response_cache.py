@@ -0,0 +1,90 @@
+# tests/test_response_cache.py
+"""Unit‑Tests für Schlüssel, LRU, TTL und Platten‑Buchhaltung in `ResponseCache.py`."""
+
+import pytest
+
+import ResponseCache as response_cache_module
+from ResponseCache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def _disk_sum(cache: ResponseCache) -> int:
+    return cache._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+
+def test_key_separates_fields():
+    key = ResponseCache.make_key
+    assert key("ollama", "m", "ab") == key("ollama", "m", "ab")
+    assert key("ollama", "m", "ab") != key("ollama", "ma", "b")
+    assert key("ollama", "m", "p", attachments=["x"]) != key("ollama", "m", "p", attachments=[b"x", ""])
+    assert key("ollama", "m", "p", temperature=0) != key("ollama", "m", "p", temperature=0.0001)
+    assert key("ollama", "m", "p", length=10) != key("ollama", "m", "p")
+
+
+def test_only_deterministic_requests_by_default():
+    assert ResponseCache().should_cache(0)
+    assert not ResponseCache().should_cache(None)
+    assert ResponseCache(cache_nonzero_temperature=True).should_cache(0.7)
+
+
+def test_memory_lru():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"          # a wird frisch
+    cache.put("c", "3")                   # verdrängt b
+    assert cache.get("b") is None and cache.get("a") == "1" and cache.get("c") == "3"
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions) == (3, 1, 1)
+    assert stats.hit_rate == 0.75
+
+
+def test_ttl_expires_both_tiers(tmp_path, clock):
+    cache = ResponseCache(path=tmp_path / "c.sqlite", ttl=10)
+    cache.put("k", "wert")
+    clock[0] += 5
+    assert cache.get("k") == "wert"
+    clock[0] += 6
+    assert cache.get("k") is None
+    assert cache._disk_bytes == 0 == _disk_sum(cache)
+
+
+def test_disk_survives_restart(tmp_path):
+    path = tmp_path / "c.sqlite"
+    cache = ResponseCache(path=path)
+    cache.put("k", "wert")
+    cache.close()
+    reopened = ResponseCache(path=path)
+    assert reopened._disk_bytes == 4
+    assert reopened.get("k") == "wert" and reopened.stats.disk_hits == 1
+    assert reopened.get("k") == "wert" and reopened.stats.memory_hits == 1
+
+
+def test_disk_size_limit_evicts_least_recently_used(tmp_path, clock):
+    cache = ResponseCache(path=tmp_path / "c.sqlite", max_entries=100, max_disk_bytes=30)
+    for key in "abc":
+        cache.put(key, "x" * 10)
+        clock[0] += 1
+    assert cache.get("a") == "x" * 10      # nur Speicher‑Treffer, trotzdem „benutzt“
+    clock[0] += 1
+    cache.put("d", "x" * 10)               # 40 > 30 → b (ältester Zugriff) fliegt
+    keys = {row[0] for row in cache._db.execute("SELECT key FROM responses")}
+    assert keys == {"a", "c", "d"}
+    assert cache._disk_bytes == 30 == _disk_sum(cache)
+
+
+def test_running_total_tracks_replace_and_clear(tmp_path):
+    cache = ResponseCache(path=tmp_path / "c.sqlite")
+    cache.put("k", "kurz")
+    cache.put("k", "deutlich länger")
+    cache.put("ü", "ä")
+    assert cache._disk_bytes == _disk_sum(cache) == len("deutlich länger".encode()) + 2
+    cache.clear()
+    assert cache._disk_bytes == 0 == _disk_sum(cache)
+    assert cache.get("k") is None
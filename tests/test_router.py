@@ -0,0 +1,132 @@
+# tests/test_router.py
+"""Unit‑Tests für Auswahl, Failover und Pausen in `LLMRouter.py`."""
+
+import asyncio
+from typing import List
+
+import pytest
+
+import LLMRouter
+from FileIngestor import InputBudgetExceeded
+from LLMRouter import Endpoint, LLMRouter as Router, NoHealthyEndpoint
+
+
+class FakeHandler:
+    llm_type = "ollama"
+    model = "llama3"
+
+    def __init__(self, host: str, fail: bool = False):
+        self.host = host
+        self.fail = fail
+        self.calls = 0
+
+    def get_answer(self, prompt: str, **options) -> str:
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError(self.host)
+        return f"{self.host}:{prompt}"
+
+    async def aget_answer(self, prompt: str, **options) -> str:
+        return self.get_answer(prompt, **options)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(LLMRouter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _router(*handlers: FakeHandler, **options) -> Router:
+    return Router(list(handlers), **options)
+
+
+def test_cold_start_is_spread_round_robin():
+    handlers = [FakeHandler(f"h{i}") for i in range(3)]
+    router = _router(*handlers)
+    picked: List[Endpoint] = []
+    with router._cond:
+        for _ in range(6):
+            picked.append(router._pick([]))
+    assert [e.name for e in picked] == ["ollama:h0", "ollama:h1", "ollama:h2"] * 2
+    assert [e.in_flight for e in router.endpoints] == [2, 2, 2]
+
+
+def test_unknown_latency_ties_go_to_fewer_in_flight():
+    router = _router(FakeHandler("a"), FakeHandler("b"))
+    router.endpoints[0].in_flight = 1
+    with router._cond:
+        assert router._pick([]).name == "ollama:b"
+        router.endpoints[1].in_flight = 3
+        assert router._pick([]).name == "ollama:a"
+
+
+def test_lowest_expected_wait_and_priority_win():
+    router = _router(
+        Endpoint(FakeHandler("slow")),
+        Endpoint(FakeHandler("fast")),
+        Endpoint(FakeHandler("spare"), priority=1),
+    )
+    router.endpoints[0].ewma_latency = 2.0
+    router.endpoints[1].ewma_latency = 0.5
+    router.endpoints[2].ewma_latency = 0.01
+    assert router.get_answer("x") == "fast:x"
+    router.endpoints[1].in_flight = router.endpoints[1].max_concurrency
+    assert router.get_answer("x") == "slow:x"
+
+
+def test_ewma_update():
+    router = _router(FakeHandler("a"), alpha=0.5)
+    endpoint = router.endpoints[0]
+    endpoint.in_flight = 2
+    router._release(endpoint, 1.0)
+    router._release(endpoint, 3.0)
+    assert endpoint.ewma_latency == 2.0 and endpoint.in_flight == 0
+
+
+def test_failover_and_cooldown(clock):
+    bad, good = FakeHandler("bad", fail=True), FakeHandler("good")
+    router = _router(bad, good, failure_threshold=2, cooldown=30)
+    router.endpoints[1].ewma_latency = 1.0          # `bad` wird zuerst probiert
+    assert router.get_answer("1") == "good:1"
+    assert router.get_answer("2") == "good:2"
+    assert bad.calls == 2 and not router.stats()[0].healthy
+    assert router.get_answer("3") == "good:3"
+    assert bad.calls == 2
+
+    clock[0] += 30
+    assert router.stats()[0].healthy
+    router.get_answer("4")
+    assert bad.calls == 3
+
+
+def test_all_failing_raises_last_error(clock):
+    router = _router(FakeHandler("a", fail=True), FakeHandler("b", fail=True), failure_threshold=1)
+    with pytest.raises(ConnectionError):
+        router.get_answer("x")
+    with pytest.raises(NoHealthyEndpoint):
+        router.get_answer("x")
+
+
+def test_request_errors_are_not_retried():
+    def too_big(handler):
+        handler.calls += 1
+        raise InputBudgetExceeded("zu groß")
+
+    handlers = [FakeHandler("a"), FakeHandler("b")]
+    router = _router(*handlers)
+    with pytest.raises(InputBudgetExceeded):
+        router.call(too_big)
+    assert sum(h.calls for h in handlers) == 1
+    assert all(s.errors == 0 and s.in_flight == 0 for s in router.stats())
+
+
+def test_async_timeout_fails_over():
+    class Slow(FakeHandler):
+        async def aget_answer(self, prompt, **options):
+            await asyncio.sleep(10)
+
+    router = _router(Slow("slow"), FakeHandler("ok"), timeout=0.05)
+    router.endpoints[1].ewma_latency = 1.0
+    assert asyncio.run(router.aget_answer("x")) == "ok:x"
+    assert router.stats()[0].errors == 1
@@ -0,0 +1,99 @@
+# tests/test_token_counter.py
+"""Unit‑Tests für `TokenCounter.py` und die Längen‑Planung im `LLMHandler`."""
+
+import pytest
+
+from LLMHandler import LLMHandler
+from TokenCounter import (
+    ContextLimitExceeded,
+    HeuristicEstimator,
+    TokenCounter,
+    register_estimator,
+    _ESTIMATORS,
+)
+
+
+@pytest.fixture
+def restore_estimators():
+    saved = list(_ESTIMATORS)
+    yield
+    _ESTIMATORS[:] = saved
+
+
+def test_heuristic_rounds_up():
+    assert HeuristicEstimator(4.0)("") == 0
+    assert HeuristicEstimator(4.0)("abcde") == 2
+
+
+def test_longest_model_prefix_wins():
+    assert TokenCounter("gemini", "gpt-4o-mini-2024").max_output_tokens == 16_384
+    assert TokenCounter("gemini", "gpt-4-0613").context_limit == 8_192
+    assert TokenCounter("gemini", "unbekannt").context_limit == 8_192
+
+
+def test_ollama_context_from_environment(monkeypatch):
+    monkeypatch.delenv("OLLAMA_CONTEXT_LENGTH", raising=False)
+    assert TokenCounter("ollama", "llama3").context_limit == 4096
+    monkeypatch.setenv("OLLAMA_CONTEXT_LENGTH", "32768")
+    counter = TokenCounter("ollama", "llama3")
+    assert counter.context_limit == 32768
+    assert counter.max_output_tokens == 32768
+    assert not counter.context_limit_given
+    assert TokenCounter("ollama", "llama3", context_limit=100).context_limit_given
+
+
+def test_registered_estimator(restore_estimators):
+    register_estimator("gemini", "gem", lambda model: lambda text: 1)
+    register_estimator("gemini", "gemini-1.5", lambda model: lambda text: 2)
+    assert TokenCounter("gemini", "gemini-1.5-pro").count("beliebig") == 2
+    assert TokenCounter("gemini", "gemma").count("beliebig") == 1
+
+
+def test_count_request_adds_images_and_overhead():
+    counter = TokenCounter("gemini", "gemini-1.5-pro", estimator=HeuristicEstimator(1.0))
+    assert counter.count_request("abcd", ["xy"], images=2) == 4 + 2 + 2 * 258 + 8
+
+
+def test_estimate_clamps_completion():
+    counter = TokenCounter("gemini", "gemini-1.5-pro", estimator=HeuristicEstimator(1.0), context_limit=100)
+    estimate = counter.estimate("a" * 52, max_tokens=1000)
+    assert estimate.prompt_tokens == 60
+    assert estimate.max_completion_tokens == 40
+    assert estimate.fits
+    assert not counter.estimate("a" * 92).fits
+
+
+def test_cost():
+    assert TokenCounter("ollama", "llama3").cost(10, 10) == 0.0
+    assert TokenCounter("openai", "unbekannt", estimator=len).cost(10, 10) is None
+    assert TokenCounter("openai", "gpt-4o", estimator=len).cost(1_000_000, 0) == pytest.approx(2.5)
+
+
+# --------------------------------------------------------------------------- #
+# LLMHandler._plan_length
+# --------------------------------------------------------------------------- #
+def _handler(**options) -> LLMHandler:
+    return LLMHandler("ollama", model="llama3", host="http://127.0.0.1:1", **options)
+
+
+def test_length_passes_through_with_guessed_window(monkeypatch):
+    monkeypatch.delenv("OLLAMA_CONTEXT_LENGTH", raising=False)
+    handler = _handler()
+    assert handler._plan_length("Hallo", [], [], 100_000_000) == 100_000_000
+    assert handler._plan_length("Hallo", [], [], None) is None
+    assert handler._plan_length("Hallo", [], [], 0) is None
+
+
+def test_length_clamped_with_given_window():
+    counter = TokenCounter("ollama", "llama3", estimator=HeuristicEstimator(1.0), context_limit=100)
+    handler = _handler(token_counter=counter)
+    assert handler._plan_length("a" * 42, [], [], 1000) == 50
+
+
+def test_check_context_clamps_and_raises(monkeypatch):
+    monkeypatch.delenv("OLLAMA_CONTEXT_LENGTH", raising=False)
+    counter = TokenCounter("ollama", "llama3", estimator=HeuristicEstimator(1.0))
+    handler = _handler(token_counter=counter, check_context=True)
+    assert handler._plan_length("a" * 88, [], [], 100_000) == 4000
+    with pytest.raises(ContextLimitExceeded):
+        handler._plan_length("a" * 5000, [], [], None)